@@ -0,0 +1,150 @@
+"""Compare the legacy sequential information_schema fetch with the parallel catalog fetch.
+
+Builds a synthetic catalog (``--tables`` tables of ``--columns`` columns, each with a
+foreign key to the previous table) in a scratch schema, then times both paths.
+
+    python -m backend.benchmarks.bench_metadata_fetch --url postgresql://user:pw@host/db
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import text
+
+from ..src.adapters.base import DatabaseAdapter
+from ..src.adapters.mariadb_adapter import MariaDbAdapter
+from ..src.adapters.pool_manager import get_pool_manager
+from ..src.adapters.postgres_adapter import PostgresAdapter
+
+SCHEMA = "bench_catalog"
+DROP_BATCH = 200
+
+_LEGACY_POSTGRES_QUERIES = [
+    "SELECT schema_name FROM information_schema.schemata",
+    "SELECT table_schema, table_name FROM information_schema.tables "
+    "WHERE table_type = 'BASE TABLE'",
+    "SELECT table_schema, table_name FROM information_schema.views",
+    """
+    SELECT table_schema, table_name, column_name, data_type, is_nullable, column_default
+    FROM information_schema.columns
+    """,
+    """
+    SELECT tc.constraint_name, tc.table_schema, tc.table_name, kcu.column_name,
+           ccu.table_schema, ccu.table_name, ccu.column_name
+    FROM information_schema.table_constraints AS tc
+    JOIN information_schema.key_column_usage AS kcu ON tc.constraint_name = kcu.constraint_name
+    JOIN information_schema.constraint_column_usage AS ccu
+      ON ccu.constraint_name = tc.constraint_name
+    WHERE tc.constraint_type = 'FOREIGN KEY'
+    """,
+]
+
+_LEGACY_MARIADB_QUERIES = [
+    "SELECT schema_name FROM information_schema.schemata",
+    "SELECT table_schema, table_name FROM information_schema.tables "
+    "WHERE table_type = 'BASE TABLE'",
+    "SELECT table_schema, table_name FROM information_schema.views",
+    """
+    SELECT table_schema, table_name, column_name, data_type, is_nullable, column_default
+    FROM information_schema.columns
+    """,
+    """
+    SELECT tc.constraint_name, tc.table_schema, tc.table_name, kcu.column_name,
+           kcu.referenced_table_schema, kcu.referenced_table_name, kcu.referenced_column_name
+    FROM information_schema.table_constraints AS tc
+    JOIN information_schema.key_column_usage AS kcu ON tc.constraint_name = kcu.constraint_name
+    WHERE tc.constraint_type = 'FOREIGN KEY'
+    """,
+]
+
+
+def _adapter_for(url: str) -> tuple[DatabaseAdapter, list[str]]:
+    if url.startswith(("mysql", "mariadb")):
+        return MariaDbAdapter(), _LEGACY_MARIADB_QUERIES
+    return PostgresAdapter(), _LEGACY_POSTGRES_QUERIES
+
+
+def _drop_sql(adapter: DatabaseAdapter) -> str:
+    # MySQL/MariaDB schemas are databases and DROP SCHEMA takes no CASCADE.
+    cascade = "" if isinstance(adapter, MariaDbAdapter) else " CASCADE"
+    return f"DROP SCHEMA IF EXISTS {SCHEMA}{cascade}"
+
+
+async def _build_catalog(adapter: DatabaseAdapter, url: str, tables: int, columns: int) -> None:
+    engine = adapter._get_engine(url)  # noqa: SLF001
+    async with engine.begin() as conn:
+        await conn.execute(text(_drop_sql(adapter)))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        for index in range(tables):
+            cols = ", ".join(f"c{col} integer" for col in range(columns))
+            fk = f", parent_id integer REFERENCES {SCHEMA}.t{index - 1}(id)" if index else ""
+            await conn.execute(
+                text(f"CREATE TABLE {SCHEMA}.t{index} (id integer PRIMARY KEY, {cols}{fk})")
+            )
+
+
+async def _drop_catalog(adapter: DatabaseAdapter, url: str, tables: int) -> None:
+    # Drop tables newest-first in small transactions; a single DROP SCHEMA over thousands
+    # of tables can exhaust the server lock table.
+    engine = adapter._get_engine(url)  # noqa: SLF001
+    for high in range(tables - 1, -1, -DROP_BATCH):
+        async with engine.begin() as conn:
+            for index in range(high, max(high - DROP_BATCH, -1), -1):
+                await conn.execute(text(f"DROP TABLE IF EXISTS {SCHEMA}.t{index}"))
+    async with engine.begin() as conn:
+        await conn.execute(text(_drop_sql(adapter)))
+
+
+async def _legacy_fetch(adapter: DatabaseAdapter, url: str, queries: list[str]) -> None:
+    engine = adapter._get_engine(url)  # noqa: SLF001
+    async with engine.connect() as conn:
+        for sql in queries:
+            result = await conn.execute(text(sql))
+            result.fetchall()
+
+
+async def _time(label: str, runs: int, fn) -> float:  # type: ignore[no-untyped-def]
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    median = statistics.median(samples)
+    print(f"{label:<28} median {median * 1000:9.1f} ms  (min {min(samples) * 1000:.1f} ms)")
+    return median
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--tables", type=int, default=2000)
+    parser.add_argument("--columns", type=int, default=25)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic schema")
+    args = parser.parse_args()
+
+    adapter, legacy_queries = _adapter_for(args.url)
+    print(f"building {args.tables} tables x {args.columns} columns in {SCHEMA} ...")
+    await _build_catalog(adapter, args.url, args.tables, args.columns)
+    try:
+        await adapter.fetch_metadata(args.url)  # warm the pool and catalog caches
+        legacy = await _time(
+            "sequential information_schema", args.runs,
+            lambda: _legacy_fetch(adapter, args.url, legacy_queries),
+        )
+        current = await _time(
+            "parallel catalog fetch", args.runs, lambda: adapter.fetch_metadata(args.url)
+        )
+        print(f"speedup: {legacy / current:.2f}x")
+    finally:
+        if not args.keep:
+            await _drop_catalog(adapter, args.url, args.tables)
+        await get_pool_manager().dispose_all()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,115 @@
+"""Compare result materialization through SQLAlchemy with the driver-native fast path.
+
+Creates a ``--rows`` row table with mixed column types, then times ``execute_query`` and a
+full ``stream_query`` drain with ``native_fetch`` off and on.
+
+    python -m backend.benchmarks.bench_native_fetch --url postgresql://user:pw@host/db
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable
+
+from sqlalchemy import text
+
+from ..src.adapters.base import DatabaseAdapter
+from ..src.adapters.mariadb_adapter import MariaDbAdapter
+from ..src.adapters.pool_manager import get_pool_manager
+from ..src.adapters.postgres_adapter import PostgresAdapter
+
+TABLE = "bench_native_fetch"
+
+_POSTGRES_FILL = f"""
+    INSERT INTO {TABLE}
+    SELECT g, 'name-' || g, g * 1.5, now() - g * interval '1 second', g % 2 = 0
+    FROM generate_series(1, :rows) AS g
+"""
+
+# MariaDB has no generate_series; a recursive CTE needs cte_max_recursion_depth raised.
+_MARIADB_FILL = f"""
+    INSERT INTO {TABLE}
+    WITH RECURSIVE seq(g) AS (SELECT 1 UNION ALL SELECT g + 1 FROM seq WHERE g < :rows)
+    SELECT g, CONCAT('name-', g), g * 1.5, NOW() - INTERVAL g SECOND, g % 2 = 0 FROM seq
+"""
+
+
+def _adapter_for(url: str, native_fetch: bool) -> DatabaseAdapter:
+    if url.startswith(("mysql", "mariadb")):
+        return MariaDbAdapter(native_fetch=native_fetch)
+    return PostgresAdapter(native_fetch=native_fetch)
+
+
+async def _build_table(adapter: DatabaseAdapter, url: str, rows: int) -> None:
+    engine = adapter._get_engine(url)  # noqa: SLF001
+    fill = _MARIADB_FILL if isinstance(adapter, MariaDbAdapter) else _POSTGRES_FILL
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+        await conn.execute(
+            text(
+                f"CREATE TABLE {TABLE} (id integer PRIMARY KEY, name varchar(64), "
+                "amount numeric(12, 2), created_at timestamp, flag boolean)"
+            )
+        )
+        if isinstance(adapter, MariaDbAdapter):
+            await conn.execute(text(f"SET SESSION cte_max_recursion_depth = {rows + 1}"))
+        await conn.execute(text(fill), {"rows": rows})
+
+
+async def _drop_table(adapter: DatabaseAdapter, url: str) -> None:
+    engine = adapter._get_engine(url)  # noqa: SLF001
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+
+
+async def _time(label: str, runs: int, rows: int, fn: Callable[[], Awaitable[int]]) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fetched = await fn()
+        samples.append(time.perf_counter() - start)
+        assert fetched == rows, f"{label}: fetched {fetched} of {rows} rows"
+    median = statistics.median(samples)
+    print(f"{label:<24} median {median * 1000:8.1f} ms  {rows / median:12,.0f} rows/s")
+    return median
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    sql = f"SELECT id, name, amount, created_at, flag FROM {TABLE}"
+    adapters = {
+        "sqlalchemy": _adapter_for(args.url, native_fetch=False),
+        "native": _adapter_for(args.url, native_fetch=True),
+    }
+    await _build_table(adapters["sqlalchemy"], args.url, args.rows)
+    try:
+        for mode, adapter in adapters.items():
+
+            async def buffered(adapter: DatabaseAdapter = adapter) -> int:
+                result = await adapter.execute_query(args.url, sql, 300, args.rows)
+                return len(result["rows"])
+
+            async def streamed(adapter: DatabaseAdapter = adapter) -> int:
+                count = 0
+                async for batch in adapter.stream_query(args.url, sql, 300, args.rows):
+                    count += len(batch["rows"])
+                return count
+
+            await buffered()  # warm the pool and statement caches
+            await _time(f"{mode} execute", args.runs, args.rows, buffered)
+            await _time(f"{mode} stream", args.runs, args.rows, streamed)
+    finally:
+        await _drop_table(adapters["sqlalchemy"], args.url)
+        await get_pool_manager().dispose_all()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
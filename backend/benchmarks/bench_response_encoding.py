@@ -0,0 +1,98 @@
+"""Compare /query response serialization through a validated model with the trusted path.
+
+Builds a ``--rows`` x ``--columns`` result cycling through int, float, numeric, timestamptz,
+date and text columns, then times building and encoding the JSON body both ways:
+
+- ``validated``: ``QueryResponse(...)`` plus FastAPI's response-model validation and dump.
+- ``trusted``: ``QueryResponse.model_construct(...)`` encoded by ``query_json``.
+
+    python -m backend.benchmarks.bench_response_encoding
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Callable
+
+from pydantic import TypeAdapter
+
+from ..src.api.result_encoding import query_json
+from ..src.models.query import QueryColumn, QueryResponse
+
+_GENERATORS: list[tuple[str, Callable[[random.Random], Any]]] = [
+    ("int4", lambda rng: rng.randint(0, 10**6)),
+    ("float8", lambda rng: rng.random()),
+    ("numeric", lambda rng: Decimal(rng.randint(0, 10**8)) / 100),
+    ("timestamptz", lambda rng: datetime.fromtimestamp(rng.randint(0, 2 * 10**9), timezone.utc)),
+    ("date", lambda rng: date(2024, 1, rng.randint(1, 28))),
+    ("text", lambda rng: f"name-{rng.randint(0, 10**6)}"),
+]
+
+
+def _result(rows: int, columns: int) -> tuple[list[dict[str, str]], list[list[Any]]]:
+    rng = random.Random(0)
+    kinds = [_GENERATORS[index % len(_GENERATORS)] for index in range(columns)]
+    described = [{"name": f"c{index}", "type": kind} for index, (kind, _) in enumerate(kinds)]
+    data = [[generate(rng) for _, generate in kinds] for _ in range(rows)]
+    return described, data
+
+
+def _validated(columns: list[dict[str, str]], rows: list[list[Any]]) -> bytes:
+    response = QueryResponse(
+        columns=[QueryColumn(name=col["name"], type=col["type"]) for col in columns],
+        rows=rows,
+        duration_ms=0,
+        limit_applied=len(rows),
+        request_id="bench",
+    )
+    # What FastAPI does with a returned model: validate against response_model, then dump.
+    adapter = TypeAdapter(QueryResponse)
+    return adapter.dump_json(adapter.validate_python(response), by_alias=True)
+
+
+def _trusted(columns: list[dict[str, str]], rows: list[list[Any]]) -> bytes:
+    response = QueryResponse.model_construct(
+        columns=[QueryColumn.model_construct(**col) for col in columns],
+        rows=rows,
+        duration_ms=0,
+        limit_applied=len(rows),
+        request_id="bench",
+        warnings=[],
+        cached=False,
+    )
+    return query_json(response)
+
+
+def _time(label: str, runs: int, fn: Callable[[], bytes]) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        body = fn()
+        samples.append(time.perf_counter() - start)
+    median = statistics.median(samples)
+    print(f"{label:<12} median {median * 1000:8.1f} ms  {len(body):>12,} bytes")
+    return median
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--columns", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=9)
+    args = parser.parse_args()
+
+    columns, rows = _result(args.rows, args.columns)
+    assert json.loads(_validated(columns, rows)) == json.loads(_trusted(columns, rows))
+    validated = _time("validated", args.runs, lambda: _validated(columns, rows))
+    trusted = _time("trusted", args.runs, lambda: _trusted(columns, rows))
+    print(f"speedup      {validated / trusted:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
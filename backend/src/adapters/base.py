@@ -2,7 +2,17 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, AsyncIterator, Collection, Sequence
+
+from .schema_filter import SchemaFilter
+
+
+class QueryTimeoutError(TimeoutError):
+    """Raised by adapters when a statement exceeds its deadline."""
+
+
+class QueryCancelledError(Exception):
+    """Raised by adapters when a statement was cancelled on request."""
 
 
 @dataclass(frozen=True)
@@ -11,9 +21,22 @@ class AdapterCapabilities:
     supports_metadata: bool
     supports_view_definition: bool
     supports_estimated_row_count: bool
+    supports_explain: bool = False
+
+
+@dataclass(frozen=True)
+class QueryPlanEstimate:
+    """Planner estimates for a statement, as reported by EXPLAIN."""
+
+    total_cost: float | None
+    estimated_rows: float | None
+    summary: dict[str, Any]
 
 
 class DatabaseAdapter(ABC):
+    # Schema globs hidden from metadata unless a connection includes them by name.
+    system_schemas: tuple[str, ...] = ()
+
     @property
     @abstractmethod
     def dialect(self) -> str:
@@ -29,15 +52,75 @@ class DatabaseAdapter(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def fetch_metadata(self, connection_url: str) -> dict[str, Any]:
+    async def fetch_metadata(
+        self,
+        connection_url: str,
+        schema_filter: SchemaFilter | None = None,
+        relations: Collection[str] | None = None,
+    ) -> dict[str, Any]:
+        """Fetch the catalog, or only the ``schema.name`` relations listed in ``relations``.
+
+        A partial fetch still returns every schema, and returns the relationships that start
+        or end at one of the listed relations.
+        """
         raise NotImplementedError
 
+    async def fetch_table_fingerprints(
+        self, connection_url: str, schema_filter: SchemaFilter | None = None
+    ) -> dict[str, str] | None:
+        # Adapters without a cheap change marker get a full refresh every time.
+        return None
+
+    async def fetch_table_estimates(
+        self, connection_url: str, schema_filter: SchemaFilter | None = None
+    ) -> dict[str, tuple[int | None, int | None]] | None:
+        """Return ``(estimated_row_count, total_bytes)`` per ``schema.name`` table.
+
+        Estimates drift without any DDL, so they are kept out of the fingerprints and read
+        separately on incremental refreshes.
+        """
+        return None
+
+    async def fetch_table_change_counters(
+        self, connection_url: str, tables: Collection[str]
+    ) -> dict[str, str]:
+        """Return an opaque marker per table that changes whenever its rows are written.
+
+        ``tables`` holds ``schema.name`` or bare ``name`` entries and the result is keyed the
+        same way. Tables the database keeps no counter for, such as views, are left out.
+        """
+        return {}
+
     @abstractmethod
     async def execute_query(
-        self, connection_url: str, sql: str, timeout_seconds: int, max_rows: int
+        self,
+        connection_url: str,
+        sql: str,
+        timeout_seconds: int,
+        max_rows: int,
+        params: Sequence[Any] = (),
     ) -> dict[str, Any]:
+        """Run ``sql``, binding ``params`` to its driver placeholders in order."""
         raise NotImplementedError
 
+    async def stream_query(
+        self,
+        connection_url: str,
+        sql: str,
+        timeout_seconds: int,
+        max_rows: int,
+        params: Sequence[Any] = (),
+    ) -> AsyncIterator[dict[str, Any]]:
+        # Adapters without server-side cursors fall back to a single buffered batch.
+        result = await self.execute_query(connection_url, sql, timeout_seconds, max_rows, params)
+        yield {"columns": result["columns"], "rows": result["rows"]}
+
+    async def explain_query(
+        self, connection_url: str, sql: str, timeout_seconds: int, params: Sequence[Any] = ()
+    ) -> QueryPlanEstimate | None:
+        # Adapters that cannot plan without executing skip the pre-flight cost check.
+        return None
+
     @abstractmethod
     async def cancel_query(self, query_id: str) -> bool:
         raise NotImplementedError
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import AbstractAsyncContextManager
+from typing import Any, Callable, Collection, Mapping, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+Connect = Callable[[], AbstractAsyncContextManager[AsyncConnection]]
+
+
+async def _fetch_rows(connect: Connect, sql: str, params: Mapping[str, Any]) -> Sequence[Any]:
+    async with connect() as conn:
+        result = await conn.execute(text(sql), dict(params))
+        return result.fetchall()
+
+
+async def fetch_catalog(
+    connect: Connect, queries: dict[str, str], params: Mapping[str, Any] | None = None
+) -> dict[str, Sequence[Any]]:
+    """Run independent catalog queries concurrently, each on a connection from ``connect``."""
+    names = list(queries)
+    results = await asyncio.gather(
+        *(_fetch_rows(connect, queries[name], params or {}) for name in names)
+    )
+    return dict(zip(names, results, strict=True))
+
+
+def counters_by_table(tables: Collection[str], rows: Sequence[Any]) -> dict[str, str]:
+    """Map requested table names to change markers.
+
+    ``rows`` are ``(schema, name, marker, resolves_bare_names)``. A bare name may match
+    relations in several schemas, whose markers are combined; a NULL marker means the
+    relation has no counter and leaves the requested name out.
+    """
+    counters = {}
+    for table in tables:
+        schema, _, name = table.rpartition(".")
+        matches = [
+            row[2] for row in rows if row[1] == name and (row[0] == schema if schema else row[3])
+        ]
+        if matches and None not in matches:
+            counters[table] = ",".join(sorted(matches))
+    return counters
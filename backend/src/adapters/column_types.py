@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+from pymysql.constants import FIELD_TYPE
+from sqlalchemy import Connection, event
+from sqlalchemy.engine import CursorResult
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+UNKNOWN_TYPE = "unknown"
+
+# Where the last statement's cursor description is kept in a connection's info.
+_DESCRIPTION_KEY = "cursor_description"
+
+# pg_type names of the builtin types queries usually return; other OIDs are looked up in
+# pg_type by the adapter.
+_POSTGRES_TYPE_NAMES = {
+    16: "bool",
+    17: "bytea",
+    18: "char",
+    19: "name",
+    20: "int8",
+    21: "int2",
+    23: "int4",
+    25: "text",
+    26: "oid",
+    114: "json",
+    142: "xml",
+    650: "cidr",
+    700: "float4",
+    701: "float8",
+    790: "money",
+    829: "macaddr",
+    869: "inet",
+    1042: "bpchar",
+    1043: "varchar",
+    1082: "date",
+    1083: "time",
+    1114: "timestamp",
+    1184: "timestamptz",
+    1186: "interval",
+    1266: "timetz",
+    1560: "bit",
+    1562: "varbit",
+    1700: "numeric",
+    2950: "uuid",
+    3614: "tsvector",
+    3802: "jsonb",
+}
+
+# MariaDB reports wire-protocol types: TEXT columns arrive as BLOB and ENUM/SET as CHAR.
+_MYSQL_TYPE_NAMES = {
+    FIELD_TYPE.DECIMAL: "decimal",
+    FIELD_TYPE.NEWDECIMAL: "decimal",
+    FIELD_TYPE.TINY: "tinyint",
+    FIELD_TYPE.SHORT: "smallint",
+    FIELD_TYPE.INT24: "mediumint",
+    FIELD_TYPE.LONG: "int",
+    FIELD_TYPE.LONGLONG: "bigint",
+    FIELD_TYPE.FLOAT: "float",
+    FIELD_TYPE.DOUBLE: "double",
+    FIELD_TYPE.NULL: "null",
+    FIELD_TYPE.TIMESTAMP: "timestamp",
+    FIELD_TYPE.DATE: "date",
+    FIELD_TYPE.NEWDATE: "date",
+    FIELD_TYPE.TIME: "time",
+    FIELD_TYPE.DATETIME: "datetime",
+    FIELD_TYPE.YEAR: "year",
+    FIELD_TYPE.VARCHAR: "varchar",
+    FIELD_TYPE.VAR_STRING: "varchar",
+    FIELD_TYPE.STRING: "char",
+    FIELD_TYPE.BIT: "bit",
+    FIELD_TYPE.JSON: "json",
+    FIELD_TYPE.ENUM: "enum",
+    FIELD_TYPE.SET: "set",
+    FIELD_TYPE.TINY_BLOB: "blob",
+    FIELD_TYPE.MEDIUM_BLOB: "blob",
+    FIELD_TYPE.LONG_BLOB: "blob",
+    FIELD_TYPE.BLOB: "blob",
+    FIELD_TYPE.GEOMETRY: "geometry",
+}
+
+
+def cursor_description(result: CursorResult[Any]) -> Sequence[Any]:
+    return result.cursor.description or ()
+
+
+def track_cursor_descriptions(engine: AsyncEngine) -> None:
+    """Keep each statement's cursor description in its connection's ``info``.
+
+    The AsyncResult that AsyncConnection.stream returns does not expose its cursor, so
+    streamed statements read the description back with ``streamed_description``.
+    """
+    if not event.contains(engine.sync_engine, "after_cursor_execute", _remember_description):
+        event.listen(engine.sync_engine, "after_cursor_execute", _remember_description)
+
+
+def _remember_description(conn: Connection, cursor: Any, *_: Any) -> None:
+    conn.info[_DESCRIPTION_KEY] = cursor.description
+
+
+def streamed_description(conn: AsyncConnection) -> Sequence[Any]:
+    return conn.info.get(_DESCRIPTION_KEY) or ()
+
+
+def postgres_builtin_type(oid: int) -> str | None:
+    return _POSTGRES_TYPE_NAMES.get(oid)
+
+
+def mysql_columns(description: Sequence[Any]) -> list[dict[str, str]]:
+    return [
+        {"name": column[0], "type": _MYSQL_TYPE_NAMES.get(column[1], UNKNOWN_TYPE)}
+        for column in description
+    ]
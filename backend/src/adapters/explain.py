@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Iterator
+
+from .base import QueryPlanEstimate
+
+# Scans listed in a plan summary, largest first.
+MAX_SUMMARY_SCANS = 10
+
+
+def _load(document: Any) -> Any:
+    if isinstance(document, (bytes, bytearray)):
+        document = document.decode()
+    if isinstance(document, str):
+        return json.loads(document)
+    return document
+
+
+def _as_float(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _top_scans(scans: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return sorted(scans, key=lambda scan: scan.get("rows") or 0, reverse=True)[:MAX_SUMMARY_SCANS]
+
+
+def _walk_postgres(node: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk_postgres(child)
+
+
+def summarize_postgres_plan(document: Any) -> QueryPlanEstimate:
+    """Summarize ``EXPLAIN (FORMAT JSON)`` output.
+
+    The cost is the root node's total cost. The row estimate is the largest row count of
+    any node, so a join that is cut short by LIMIT still reports the rows it may produce.
+    """
+    root = _load(document)[0]["Plan"]
+    nodes = list(_walk_postgres(root))
+    scans = [
+        {
+            "relation": ".".join(
+                part for part in (node.get("Schema"), node["Relation Name"]) if part
+            ),
+            "nodeType": node.get("Node Type"),
+            "rows": _as_float(node.get("Plan Rows")),
+        }
+        for node in nodes
+        if "Relation Name" in node
+    ]
+    rows = [value for value in (_as_float(node.get("Plan Rows")) for node in nodes) if value]
+    total_cost = _as_float(root.get("Total Cost"))
+    estimated_rows = max(rows) if rows else None
+    return QueryPlanEstimate(
+        total_cost=total_cost,
+        estimated_rows=estimated_rows,
+        summary={
+            "nodeType": root.get("Node Type"),
+            "totalCost": total_cost,
+            "estimatedRows": estimated_rows,
+            "scans": _top_scans(scans),
+        },
+    )
+
+
+def _walk_mysql(value: Any) -> Iterator[dict[str, Any]]:
+    if isinstance(value, dict):
+        yield value
+        for child in value.values():
+            yield from _walk_mysql(child)
+    elif isinstance(value, list):
+        for child in value:
+            yield from _walk_mysql(child)
+
+
+def _mysql_table_rows(table: dict[str, Any]) -> float | None:
+    return _as_float(table.get("rows", table.get("rows_examined_per_scan")))
+
+
+def summarize_mysql_plan(document: Any) -> QueryPlanEstimate:
+    """Summarize ``EXPLAIN FORMAT=JSON`` output from MariaDB or MySQL.
+
+    Tables joined in one nested loop multiply, so the row estimate is the largest product
+    over any nested loop, or the largest single-table scan.
+    """
+    block = _load(document)["query_block"]
+    nodes = list(_walk_mysql(block))
+    tables = [
+        node["table"]
+        for node in nodes
+        if isinstance(node.get("table"), dict) and "table_name" in node["table"]
+    ]
+    scans = [
+        {
+            "relation": table["table_name"],
+            "accessType": table.get("access_type"),
+            "rows": _mysql_table_rows(table),
+        }
+        for table in tables
+    ]
+    rows = [scan["rows"] for scan in scans if scan["rows"]]
+    for node in nodes:
+        loop = node.get("nested_loop")
+        if not isinstance(loop, list):
+            continue
+        product = 1.0
+        for step in loop:
+            table = step.get("table") if isinstance(step, dict) else None
+            product *= (_mysql_table_rows(table) or 1.0) if isinstance(table, dict) else 1.0
+        rows.append(product)
+
+    # MySQL reports cost_info.query_cost; MariaDB 11+ reports a bare cost.
+    cost_info = block.get("cost_info") or {}
+    total_cost = _as_float(cost_info.get("query_cost", block.get("cost")))
+    estimated_rows = max(rows) if rows else None
+    return QueryPlanEstimate(
+        total_cost=total_cost,
+        estimated_rows=estimated_rows,
+        summary={
+            "totalCost": total_cost,
+            "estimatedRows": estimated_rows,
+            "scans": _top_scans(scans),
+        },
+    )
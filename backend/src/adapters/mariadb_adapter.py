@@ -1,17 +1,47 @@
 from __future__ import annotations
 
-import asyncio
 import time
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Collection, Sequence
 
+import pymysql
+from aiomysql import Cursor, SSCursor
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
 
-from .base import AdapterCapabilities, DatabaseAdapter
+from ..utils.settings import get_settings
+from ..utils.timing import record_phase, timed
+from .base import AdapterCapabilities, DatabaseAdapter, QueryPlanEstimate
+from .catalog import counters_by_table, fetch_catalog
+from .column_types import (
+    cursor_description,
+    mysql_columns,
+    streamed_description,
+    track_cursor_descriptions,
+)
+from .explain import summarize_mysql_plan
+from .pool_manager import get_pool_manager
+from .query_registry import (
+    CLIENT_DEADLINE_SLACK_SECONDS,
+    InflightQuery,
+    get_query_registry,
+    raise_if_interrupted,
+    run_cancellable,
+)
+from .schema_filter import SchemaFilter
+from .streaming import iter_fetch_batches, iter_row_batches
 
 
 class MariaDbAdapter(DatabaseAdapter):
-    def __init__(self) -> None:
-        self._engine_cache: dict[str, AsyncEngine] = {}
+    system_schemas = ("mysql", "information_schema", "performance_schema", "sys")
+
+    def __init__(self, native_fetch: bool | None = None) -> None:
+        # Opt-in: run result-returning statements on the raw aiomysql connection and skip
+        # SQLAlchemy's Row processing.
+        self._native_fetch = (
+            get_settings().db_native_fetch if native_fetch is None else native_fetch
+        )
 
     @property
     def dialect(self) -> str:
@@ -20,10 +50,11 @@ class MariaDbAdapter(DatabaseAdapter):
     @property
     def capabilities(self) -> AdapterCapabilities:
         return AdapterCapabilities(
-            supports_cancel=False,
+            supports_cancel=True,
             supports_metadata=True,
             supports_view_definition=True,
-            supports_estimated_row_count=False,
+            supports_estimated_row_count=True,
+            supports_explain=True,
         )
 
     def _to_async_url(self, connection_url: str) -> str:
@@ -36,102 +67,405 @@ class MariaDbAdapter(DatabaseAdapter):
         return connection_url
 
     def _get_engine(self, connection_url: str) -> AsyncEngine:
-        async_url = self._to_async_url(connection_url)
-        if async_url not in self._engine_cache:
-            self._engine_cache[async_url] = create_async_engine(async_url, pool_pre_ping=True)
-        return self._engine_cache[async_url]
+        engine = get_pool_manager().get_engine(connection_url, self._to_async_url(connection_url))
+        track_cursor_descriptions(engine)
+        return engine
+
+    def _connect(self, connection_url: str) -> AbstractAsyncContextManager[AsyncConnection]:
+        return get_pool_manager().connect(connection_url, self._get_engine(connection_url))
 
     async def test_connection(self, connection_url: str) -> None:
-        engine = self._get_engine(connection_url)
-        async with engine.connect() as conn:
+        async with self._connect(connection_url) as conn:
             await conn.execute(text("SELECT 1"))
 
-    async def fetch_metadata(self, connection_url: str) -> dict[str, object]:
-        engine = self._get_engine(connection_url)
-        async with engine.connect() as conn:
-            schemas_result = await conn.execute(text("SELECT schema_name FROM information_schema.schemata"))
-            tables_result = await conn.execute(
-                text(
-                    "SELECT table_schema, table_name FROM information_schema.tables WHERE table_type = 'BASE TABLE'"
-                )
-            )
-            views_result = await conn.execute(
-                text("SELECT table_schema, table_name FROM information_schema.views")
-            )
-            columns_result = await conn.execute(
-                text(
-                    """
-                    SELECT table_schema, table_name, column_name, data_type, is_nullable, column_default
-                    FROM information_schema.columns
-                    """
-                )
-            )
-            relationships_result = await conn.execute(
-                text(
-                    """
-                    SELECT tc.constraint_name,
-                           tc.table_schema,
-                           tc.table_name,
-                           kcu.column_name,
-                           kcu.referenced_table_schema,
-                           kcu.referenced_table_name,
-                           kcu.referenced_column_name
-                    FROM information_schema.table_constraints AS tc
-                    JOIN information_schema.key_column_usage AS kcu
-                      ON tc.constraint_name = kcu.constraint_name
-                    WHERE tc.constraint_type = 'FOREIGN KEY'
-                    """
-                )
+    def _catalog_queries(
+        self, schemata_predicate: str, table_predicate: str, relation_list: str | None = None
+    ) -> dict[str, str]:
+        owner_predicate = table_predicate
+        link_predicate = table_predicate
+        if relation_list is not None:
+            owner_predicate += f" AND CONCAT(table_schema, '.', table_name) IN ({relation_list})"
+            # Relationships pointing at a refetched relation are refetched too.
+            link_predicate += (
+                f" AND (CONCAT(table_schema, '.', table_name) IN ({relation_list})"
+                " OR CONCAT(referenced_table_schema, '.', referenced_table_name)"
+                f" IN ({relation_list}))"
             )
+        return {
+            "schemas": f"""
+                SELECT schema_name FROM information_schema.schemata
+                WHERE {schemata_predicate}
+            """,
+            "tables": f"""
+                SELECT table_schema, table_name, table_comment, table_rows,
+                       data_length + COALESCE(index_length, 0)
+                FROM information_schema.tables
+                WHERE table_type = 'BASE TABLE' AND {owner_predicate}
+            """,
+            "views": f"""
+                SELECT table_schema, table_name, view_definition
+                FROM information_schema.views
+                WHERE {owner_predicate}
+            """,
+            "columns": f"""
+                SELECT table_schema, table_name, column_name, data_type, is_nullable,
+                       column_default, column_comment
+                FROM information_schema.columns
+                WHERE {owner_predicate}
+                ORDER BY table_schema, table_name, ordinal_position
+            """,
+            "relationships": f"""
+                SELECT constraint_name, table_schema, table_name, column_name,
+                       referenced_table_schema, referenced_table_name, referenced_column_name
+                FROM information_schema.key_column_usage
+                WHERE referenced_table_name IS NOT NULL AND {link_predicate}
+                ORDER BY constraint_schema, table_name, constraint_name, ordinal_position
+            """,
+        }
+
+    async def fetch_metadata(
+        self,
+        connection_url: str,
+        schema_filter: SchemaFilter | None = None,
+        relations: Collection[str] | None = None,
+    ) -> dict[str, object]:
+        schema_filter = schema_filter or SchemaFilter()
+        # Both predicates bind the same patterns under the same names.
+        schemata_predicate, params = self._schema_predicate(schema_filter, "schema_name")
+        table_predicate, _ = self._schema_predicate(schema_filter, "table_schema")
+        relation_list = None
+        if relations is not None:
+            names = sorted(relations) or [""]
+            params.update({f"relation_{index}": name for index, name in enumerate(names)})
+            relation_list = ", ".join(f":relation_{index}" for index in range(len(names)))
+        rows = await fetch_catalog(
+            lambda: self._connect(connection_url),
+            self._catalog_queries(schemata_predicate, table_predicate, relation_list),
+            params,
+        )
 
-        schemas = [{"name": row[0]} for row in schemas_result.fetchall()]
-        tables = [{"schema": row[0], "name": row[1]} for row in tables_result.fetchall()]
-        views = [{"schema": row[0], "name": row[1]} for row in views_result.fetchall()]
+        schemas = [{"name": row[0]} for row in rows["schemas"]]
+        # TABLE_ROWS is an estimate for InnoDB, like pg_class.reltuples.
+        tables = [
+            {
+                "schema": row[0],
+                "name": row[1],
+                "comment": row[2] or None,
+                "estimated_row_count": row[3],
+                "total_bytes": row[4],
+            }
+            for row in rows["tables"]
+        ]
+        views = [
+            {"schema": row[0], "name": row[1], "definition": row[2]} for row in rows["views"]
+        ]
+        view_keys = {(view["schema"], view["name"]) for view in views}
         columns = [
             {
                 "schema": row[0],
                 "owner": row[1],
-                "owner_type": "table",
+                "owner_type": "view" if (row[0], row[1]) in view_keys else "table",
                 "name": row[2],
                 "data_type": row[3],
                 "is_nullable": row[4] == "YES",
                 "default_value": row[5],
+                "comment": row[6] or None,
             }
-            for row in columns_result.fetchall()
-        ]
-        relationships = [
-            {
-                "name": row[0],
-                "sourceTable": f"{row[1]}.{row[2]}",
-                "sourceColumns": [row[3]],
-                "targetTable": f"{row[4]}.{row[5]}",
-                "targetColumns": [row[6]],
-            }
-            for row in relationships_result.fetchall()
+            for row in rows["columns"]
         ]
+        # key_column_usage has one row per column; group them back into multi-column keys.
+        relationships: dict[tuple[str, str, str], dict[str, Any]] = {}
+        for row in rows["relationships"]:
+            key = (row[1], row[2], row[0])
+            relationship = relationships.get(key)
+            if relationship is None:
+                relationship = {
+                    "name": row[0],
+                    "sourceTable": f"{row[1]}.{row[2]}",
+                    "sourceColumns": [],
+                    "targetTable": f"{row[4]}.{row[5]}",
+                    "targetColumns": [],
+                }
+                relationships[key] = relationship
+            relationship["sourceColumns"].append(row[3])
+            relationship["targetColumns"].append(row[6])
 
         return {
             "schemas": schemas,
             "tables": tables,
             "views": views,
             "columns": columns,
-            "relationships": relationships,
+            "relationships": list(relationships.values()),
         }
 
+    def _schema_predicate(
+        self, schema_filter: SchemaFilter, column: str
+    ) -> tuple[str, dict[str, Any]]:
+        # LIKE follows the case-insensitive column collation; BINARY compares the bytes, so
+        # the filter matches schema names case-sensitively as SchemaFilter.matches does.
+        return schema_filter.sql_predicate(column, self.system_schemas, like="LIKE BINARY")
+
+    async def fetch_table_fingerprints(
+        self, connection_url: str, schema_filter: SchemaFilter | None = None
+    ) -> dict[str, str] | None:
+        # DDL bumps CREATE_TIME (or UPDATE_TIME for some engines); the column digest catches
+        # in-place column changes that leave both untouched.
+        schema_filter = schema_filter or SchemaFilter()
+        table_predicate, params = self._schema_predicate(schema_filter, "table_schema")
+        outer_predicate, _ = self._schema_predicate(schema_filter, "t.table_schema")
+        sql = f"""
+            SELECT t.table_schema, t.table_name,
+                   CONCAT_WS('|', t.table_type, t.create_time, t.update_time, t.table_comment,
+                             c.column_count, c.column_digest)
+            FROM information_schema.tables AS t
+            LEFT JOIN (
+                SELECT table_schema, table_name, COUNT(*) AS column_count,
+                       SUM(CRC32(CONCAT_WS(':', ordinal_position, column_name, column_type,
+                                           is_nullable, column_default, column_comment)))
+                           AS column_digest
+                FROM information_schema.columns
+                WHERE {table_predicate}
+                GROUP BY table_schema, table_name
+            ) AS c ON c.table_schema = t.table_schema AND c.table_name = t.table_name
+            WHERE {outer_predicate}
+        """
+        async with self._connect(connection_url) as conn:
+            result = await conn.execute(text(sql), params)
+            return {f"{row[0]}.{row[1]}": str(row[2]) for row in result}
+
+    async def fetch_table_estimates(
+        self, connection_url: str, schema_filter: SchemaFilter | None = None
+    ) -> dict[str, tuple[int | None, int | None]] | None:
+        predicate, params = self._schema_predicate(schema_filter or SchemaFilter(), "table_schema")
+        sql = f"""
+            SELECT table_schema, table_name, table_rows,
+                   data_length + COALESCE(index_length, 0)
+            FROM information_schema.tables
+            WHERE table_type = 'BASE TABLE' AND {predicate}
+        """
+        async with self._connect(connection_url) as conn:
+            result = await conn.execute(text(sql), params)
+            return {f"{row[0]}.{row[1]}": (row[2], row[3]) for row in result}
+
+    async def fetch_table_change_counters(
+        self, connection_url: str, tables: Collection[str]
+    ) -> dict[str, str]:
+        # UPDATE_TIME has one-second resolution, so a table written within the last second
+        # reports no marker rather than one a second write could leave unchanged.
+        names = sorted({table.rpartition(".")[2] for table in tables})
+        if not names:
+            return {}
+        placeholders = ", ".join(f":name_{index}" for index in range(len(names)))
+        sql = f"""
+            SELECT table_schema, table_name,
+                   CASE WHEN table_type = 'BASE TABLE'
+                             AND (update_time IS NULL OR update_time < NOW() - INTERVAL 1 SECOND)
+                        THEN CONCAT_WS('|', create_time, update_time) END,
+                   table_schema = DATABASE()
+            FROM information_schema.tables
+            WHERE table_name IN ({placeholders})
+        """
+        params = {f"name_{index}": name for index, name in enumerate(names)}
+        async with self._connect(connection_url) as conn:
+            result = await conn.execute(text(sql), params)
+            rows = result.all()
+        return counters_by_table(tables, rows)
+
+    async def _backend_id(self, conn: AsyncConnection) -> int:
+        raw = await conn.get_raw_connection()
+        return int(raw.driver_connection.thread_id())
+
+    async def _cancel_backend(self, connection_url: str, backend_id: int) -> bool:
+        async with self._connect(connection_url) as conn:
+            await conn.execute(text(f"KILL QUERY {int(backend_id)}"))
+            return True
+
+    @asynccontextmanager
+    async def _read_only(
+        self, conn: AsyncConnection, sql: str, timeout_seconds: int
+    ) -> AsyncIterator[str]:
+        # A short read-only transaction with a server-side deadline. MariaDB scopes the
+        # deadline to the statement itself; MySQL only has the session variable, which is
+        # restored before the connection goes back to the pool. A failed statement may leave
+        # the session unusable, so its connection is dropped instead and the error kept.
+        async with conn.begin():
+            await conn.execute(text("SET TRANSACTION READ ONLY"))
+            if getattr(conn.dialect, "is_mariadb", False):
+                yield f"SET STATEMENT max_statement_time={float(timeout_seconds)} FOR {sql}"
+                return
+            await conn.execute(
+                text(f"SET SESSION max_execution_time = {int(timeout_seconds * 1000)}")
+            )
+            try:
+                yield sql
+            except BaseException:
+                await conn.invalidate()
+                raise
+            await conn.execute(text("SET SESSION max_execution_time = DEFAULT"))
+
     async def execute_query(
-        self, connection_url: str, sql: str, timeout_seconds: int, max_rows: int
+        self,
+        connection_url: str,
+        sql: str,
+        timeout_seconds: int,
+        max_rows: int,
+        params: Sequence[Any] = (),
     ) -> dict[str, object]:
-        engine = self._get_engine(connection_url)
-        async with engine.connect() as conn:
-            start = time.perf_counter()
-            result = await asyncio.wait_for(conn.execute(text(sql)), timeout=timeout_seconds)
-            rows = result.fetchmany(max_rows)
-            duration_ms = int((time.perf_counter() - start) * 1000)
-
-        columns = [{"name": name, "type": "unknown"} for name in result.keys()]
-        data_rows = [list(row) for row in rows]
+        checkout = time.perf_counter()
+        async with self._connect(connection_url) as conn:
+            backend_id = await self._backend_id(conn)
+            with get_query_registry().attach(connection_url, backend_id) as query:
+                try:
+                    async with self._read_only(conn, sql, timeout_seconds) as statement:
+                        # Checkout plus the session setup the statement needs.
+                        record_phase("pool", checkout)
+                        start = time.perf_counter()
+                        columns, data_rows = await run_cancellable(
+                            self._fetch_all(conn, statement, max_rows, params),
+                            timeout_seconds + CLIENT_DEADLINE_SLACK_SECONDS,
+                            lambda: self._cancel_backend(connection_url, backend_id),
+                            query,
+                        )
+                except (DBAPIError, pymysql.MySQLError) as exc:
+                    raise_if_interrupted(query, exc, _is_statement_timeout(exc))
+                    raise
+                duration_ms = int((time.perf_counter() - start) * 1000)
+
         return {"columns": columns, "rows": data_rows, "duration_ms": duration_ms}
 
+    async def _fetch_all(
+        self, conn: AsyncConnection, statement: str, max_rows: int, params: Sequence[Any]
+    ) -> tuple[list[dict[str, str]], list[list[Any]]]:
+        # cursor.execute reads the whole result; fetching only copies the rows out.
+        if self._native_fetch:
+            driver = (await conn.get_raw_connection()).driver_connection
+            async with driver.cursor(Cursor) as cursor:
+                with timed("execute"):
+                    await _cursor_execute(cursor, statement, params)
+                with timed("fetch"):
+                    rows = await cursor.fetchmany(max_rows)
+                    columns = mysql_columns(cursor.description or ())
+                    return columns, list(map(list, rows))
+        with timed("execute"):
+            result = await _execute(conn, statement, params)
+        with timed("fetch"):
+            columns = mysql_columns(cursor_description(result))
+            return columns, [list(row) for row in result.fetchmany(max_rows)]
+
+    async def stream_query(
+        self,
+        connection_url: str,
+        sql: str,
+        timeout_seconds: int,
+        max_rows: int,
+        params: Sequence[Any] = (),
+    ) -> AsyncIterator[dict[str, Any]]:
+        async with self._connect(connection_url) as conn:
+            backend_id = await self._backend_id(conn)
+            with get_query_registry().attach(connection_url, backend_id) as query:
+                try:
+                    async with self._read_only(conn, sql, timeout_seconds) as statement:
+                        # SQLAlchemy only streams its own statements, not driver SQL with
+                        # values, so bound statements always use the driver's cursor.
+                        native = self._native_fetch or bool(params)
+                        fetch = self._native_batches if native else self._row_batches
+                        async for batch in fetch(
+                            conn,
+                            statement,
+                            params,
+                            max_rows,
+                            timeout_seconds,
+                            query,
+                            lambda: self._cancel_backend(connection_url, backend_id),
+                        ):
+                            yield batch
+                except (DBAPIError, pymysql.MySQLError) as exc:
+                    raise_if_interrupted(query, exc, _is_statement_timeout(exc))
+                    raise
+
+    async def _row_batches(
+        self,
+        conn: AsyncConnection,
+        statement: str,
+        params: Sequence[Any],
+        max_rows: int,
+        timeout_seconds: int,
+        query: InflightQuery | None,
+        cancel: Callable[[], Awaitable[bool]],
+    ) -> AsyncIterator[dict[str, Any]]:
+        # Only statements without parameters come here; see stream_query.
+        result = await run_cancellable(
+            conn.stream(text(statement)),
+            timeout_seconds + CLIENT_DEADLINE_SLACK_SECONDS,
+            cancel,
+            query,
+        )
+        columns = mysql_columns(streamed_description(conn))
+        async for rows in iter_row_batches(result, max_rows):
+            yield {"columns": columns, "rows": rows}
+
+    async def _native_batches(
+        self,
+        conn: AsyncConnection,
+        statement: str,
+        params: Sequence[Any],
+        max_rows: int,
+        timeout_seconds: int,
+        query: InflightQuery | None,
+        cancel: Callable[[], Awaitable[bool]],
+    ) -> AsyncIterator[dict[str, Any]]:
+        driver = (await conn.get_raw_connection()).driver_connection
+        cursor = await driver.cursor(SSCursor)
+        try:
+            await run_cancellable(
+                _cursor_execute(cursor, statement, params),
+                timeout_seconds + CLIENT_DEADLINE_SLACK_SECONDS,
+                cancel,
+                query,
+            )
+            columns = mysql_columns(cursor.description or ())
+            async for rows in iter_fetch_batches(cursor.fetchmany, max_rows):
+                yield {"columns": columns, "rows": rows}
+        finally:
+            await cursor.close()
+
+    async def explain_query(
+        self, connection_url: str, sql: str, timeout_seconds: int, params: Sequence[Any] = ()
+    ) -> QueryPlanEstimate | None:
+        async with self._connect(connection_url) as conn:
+            explain = f"EXPLAIN FORMAT=JSON {sql}"
+            async with self._read_only(conn, explain, timeout_seconds) as statement:
+                result = await _execute(conn, statement, params)
+                document = result.scalar()
+        return summarize_mysql_plan(document)
+
     async def cancel_query(self, query_id: str) -> bool:
-        _ = query_id
-        return False
+        query = get_query_registry().get(query_id)
+        if query is None or query.backend_id is None or query.connection_url is None:
+            return False
+        query.cancel_requested = True
+        return await self._cancel_backend(query.connection_url, query.backend_id)
+
+
+async def _execute(conn: AsyncConnection, statement: str, params: Sequence[Any]) -> Any:
+    # Bound statements go to the driver as they are: aiomysql escapes the values into the
+    # %s placeholders on the client, which is why their literal % signs are doubled.
+    if params:
+        return await conn.exec_driver_sql(statement, tuple(params))
+    return await conn.execute(text(statement))
+
+
+async def _cursor_execute(cursor: Cursor, statement: str, params: Sequence[Any]) -> None:
+    # Without args the statement is sent verbatim, without %-interpolation.
+    await cursor.execute(statement, tuple(params) if params else None)
+
+
+# ER_STATEMENT_TIMEOUT (MariaDB max_statement_time), ER_QUERY_TIMEOUT (MySQL max_execution_time)
+_STATEMENT_TIMEOUT_ERRNOS = {1969, 3024}
+
+
+def _is_statement_timeout(exc: Exception) -> bool:
+    # Errors from the native fetch path are raw pymysql exceptions, not DBAPIErrors.
+    driver_error = exc.orig if isinstance(exc, DBAPIError) else exc
+    args: tuple[Any, ...] = getattr(driver_error, "args", ())
+    return bool(args) and args[0] in _STATEMENT_TIMEOUT_ERRNOS
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import json
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Any, Sequence
+from uuid import UUID
+
+from pydantic import TypeAdapter, ValidationError
+
+from ..utils.app_errors import AppError
+
+# Request values arrive as JSON types, while asyncpg encodes each parameter strictly by the
+# type the server inferred for it: a date parameter rejects "2024-01-01". Values are
+# converted by that type's name first; types not listed here are passed through.
+_POSTGRES_PARAMETER_TYPES: dict[str, TypeAdapter[Any]] = {
+    "date": TypeAdapter(date),
+    "timestamp": TypeAdapter(datetime),
+    "timestamptz": TypeAdapter(datetime),
+    "time": TypeAdapter(time),
+    "timetz": TypeAdapter(time),
+    "interval": TypeAdapter(timedelta),
+    "numeric": TypeAdapter(Decimal),
+    "int2": TypeAdapter(int),
+    "int4": TypeAdapter(int),
+    "int8": TypeAdapter(int),
+    "oid": TypeAdapter(int),
+    "float4": TypeAdapter(float),
+    "float8": TypeAdapter(float),
+    "bool": TypeAdapter(bool),
+    "uuid": TypeAdapter(UUID),
+}
+_POSTGRES_TEXT_TYPES = frozenset({"text", "varchar", "bpchar", "name", "json", "jsonb"})
+
+
+def coerce_postgres_params(types: Sequence[Any], values: Sequence[Any]) -> list[Any]:
+    """Convert JSON request values to what asyncpg expects for each parameter type.
+
+    ``types`` are the ``asyncpg.types.Type`` entries of ``PreparedStatement.get_parameters()``.
+    Raises ``INVALID_PARAMETERS`` naming the parameter when a value does not fit its type.
+    """
+    coerced: list[Any] = []
+    for index, (parameter_type, value) in enumerate(zip(types, values, strict=True), start=1):
+        name = parameter_type.name
+        if value is None:
+            coerced.append(None)
+        elif name in _POSTGRES_TEXT_TYPES:
+            # Numbers, booleans and objects are sent in their JSON spelling.
+            coerced.append(value if isinstance(value, str) else json.dumps(value))
+        elif name in _POSTGRES_PARAMETER_TYPES:
+            try:
+                coerced.append(_POSTGRES_PARAMETER_TYPES[name].validate_python(value))
+            except ValidationError as exc:
+                raise AppError(
+                    code="INVALID_PARAMETERS",
+                    message=f"Parameter ${index} expects {name}.",
+                    status_code=400,
+                    details={"parameter": f"${index}", "error": exc.errors()[0]["msg"]},
+                ) from exc
+        else:
+            coerced.append(value)
+    return coerced
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+
+from ..utils.settings import get_settings
+
+
+@dataclass(frozen=True)
+class PoolOptions:
+    pool_size: int
+    max_overflow: int
+    pool_recycle_seconds: int
+    pool_timeout_seconds: int
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    pool_size: int
+    max_overflow: int
+    pool_recycle_seconds: int
+    checked_out: int
+    idle: int
+    overflow: int
+    waiting: int
+    seconds_since_use: float
+
+
+@dataclass
+class _ManagedEngine:
+    engine: AsyncEngine
+    options: PoolOptions
+    last_used_at: float
+
+
+def default_pool_options() -> PoolOptions:
+    settings = get_settings()
+    return PoolOptions(
+        pool_size=settings.pool_size,
+        max_overflow=settings.pool_max_overflow,
+        pool_recycle_seconds=settings.pool_recycle_seconds,
+        pool_timeout_seconds=settings.pool_timeout_seconds,
+    )
+
+
+class EnginePoolManager:
+    """Engines shared by all adapters, keyed by connection URL.
+
+    The number of live engines is bounded: the least recently used idle engine is disposed
+    when the limit is reached, and engines unused for ``idle_seconds`` are disposed on the
+    next sweep. Engines with checked-out connections are never evicted.
+    """
+
+    def __init__(self, max_engines: int | None = None, idle_seconds: int | None = None) -> None:
+        settings = get_settings()
+        self._max_engines = max_engines or settings.pool_max_engines
+        self._idle_seconds = idle_seconds or settings.pool_engine_idle_seconds
+        self._engines: OrderedDict[str, _ManagedEngine] = OrderedDict()
+        self._options: dict[str, PoolOptions] = {}
+        self._disposals: set[asyncio.Task[None]] = set()
+        self._waiting: dict[str, int] = {}
+        self._last_sweep = time.monotonic()
+
+    def configure(self, connection_url: str, options: PoolOptions | None) -> bool:
+        """Set pool options for a URL; returns True when a live engine must be replaced."""
+        if options is None:
+            self._options.pop(connection_url, None)
+        else:
+            self._options[connection_url] = options
+        managed = self._engines.get(connection_url)
+        return managed is not None and managed.options != self.options_for(connection_url)
+
+    def options_for(self, connection_url: str) -> PoolOptions:
+        return self._options.get(connection_url) or default_pool_options()
+
+    def get_engine(self, connection_url: str, async_url: str) -> AsyncEngine:
+        now = time.monotonic()
+        managed = self._engines.get(connection_url)
+        if managed is None:
+            options = self.options_for(connection_url)
+            engine = create_async_engine(
+                async_url,
+                pool_pre_ping=True,
+                pool_size=options.pool_size,
+                max_overflow=options.max_overflow,
+                pool_recycle=options.pool_recycle_seconds,
+                pool_timeout=options.pool_timeout_seconds,
+            )
+            managed = _ManagedEngine(engine=engine, options=options, last_used_at=now)
+            self._engines[connection_url] = managed
+            self._evict_over_capacity(keep=connection_url)
+        else:
+            managed.last_used_at = now
+            self._engines.move_to_end(connection_url)
+        if now - self._last_sweep >= min(self._idle_seconds, 60):
+            self._sweep_idle(now)
+        return managed.engine
+
+    @asynccontextmanager
+    async def connect(
+        self, connection_url: str, engine: AsyncEngine
+    ) -> AsyncIterator[AsyncConnection]:
+        """Check out a connection from ``engine``, counted as waiting until the pool hands
+        one over, and return it when the block exits."""
+        conn = engine.connect()
+        self._waiting[connection_url] = self._waiting.get(connection_url, 0) + 1
+        try:
+            await conn.start()
+        finally:
+            remaining = self._waiting.pop(connection_url) - 1
+            if remaining:
+                self._waiting[connection_url] = remaining
+        try:
+            yield conn
+        finally:
+            await asyncio.shield(conn.close())
+
+    async def dispose(self, connection_url: str) -> None:
+        managed = self._engines.pop(connection_url, None)
+        if managed is not None:
+            await managed.engine.dispose()
+
+    async def dispose_all(self) -> None:
+        engines = list(self._engines.values())
+        self._engines.clear()
+        for managed in engines:
+            await managed.engine.dispose()
+        if self._disposals:
+            await asyncio.gather(*self._disposals, return_exceptions=True)
+
+    def stats(self, connection_url: str) -> PoolStats | None:
+        managed = self._engines.get(connection_url)
+        if managed is None:
+            return None
+        pool = managed.engine.pool
+        checked_out = int(getattr(pool, "checkedout", lambda: 0)())
+        idle = int(getattr(pool, "checkedin", lambda: 0)())
+        overflow = max(0, int(getattr(pool, "overflow", lambda: 0)()))
+        return PoolStats(
+            pool_size=managed.options.pool_size,
+            max_overflow=managed.options.max_overflow,
+            pool_recycle_seconds=managed.options.pool_recycle_seconds,
+            checked_out=checked_out,
+            idle=idle,
+            overflow=overflow,
+            waiting=self._waiting.get(connection_url, 0),
+            seconds_since_use=round(time.monotonic() - managed.last_used_at, 3),
+        )
+
+    def engine_count(self) -> int:
+        return len(self._engines)
+
+    def _is_idle(self, managed: _ManagedEngine) -> bool:
+        return int(getattr(managed.engine.pool, "checkedout", lambda: 0)()) == 0
+
+    def _evict_over_capacity(self, keep: str) -> None:
+        while len(self._engines) > self._max_engines:
+            victim = next(
+                (
+                    url
+                    for url, managed in self._engines.items()
+                    if url != keep and self._is_idle(managed)
+                ),
+                None,
+            )
+            if victim is None:
+                return
+            self._schedule_dispose(self._engines.pop(victim))
+
+    def _sweep_idle(self, now: float) -> None:
+        self._last_sweep = now
+        expired = [
+            url
+            for url, managed in self._engines.items()
+            if now - managed.last_used_at >= self._idle_seconds and self._is_idle(managed)
+        ]
+        for url in expired:
+            self._schedule_dispose(self._engines.pop(url))
+
+    def _schedule_dispose(self, managed: _ManagedEngine) -> None:
+        task = asyncio.get_running_loop().create_task(managed.engine.dispose())
+        self._disposals.add(task)
+        task.add_done_callback(self._disposals.discard)
+
+
+_manager = EnginePoolManager()
+
+
+def get_pool_manager() -> EnginePoolManager:
+    return _manager
@@ -1,17 +1,80 @@
 from __future__ import annotations
 
-import asyncio
 import time
+from collections import OrderedDict
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Collection, Sequence, cast
 
+import asyncpg
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
 
-from .base import AdapterCapabilities, DatabaseAdapter
+from ..utils.settings import get_settings
+from ..utils.timing import record_phase, timed
+from .base import AdapterCapabilities, DatabaseAdapter, QueryPlanEstimate
+from .catalog import counters_by_table, fetch_catalog
+from .column_types import (
+    UNKNOWN_TYPE,
+    cursor_description,
+    postgres_builtin_type,
+    streamed_description,
+    track_cursor_descriptions,
+)
+from .explain import summarize_postgres_plan
+from .parameter_types import coerce_postgres_params
+from .pool_manager import get_pool_manager
+from .query_registry import (
+    CLIENT_DEADLINE_SLACK_SECONDS,
+    InflightQuery,
+    get_query_registry,
+    raise_if_interrupted,
+    run_cancellable,
+)
+from .schema_filter import SchemaFilter
+from .streaming import iter_fetch_batches, iter_row_batches
+
+# Column name, type OID and, when the driver already resolved it, the type name.
+ColumnDescription = tuple[str, int, str | None]
+
+# Prepared statements kept per connection on the native path; SQLAlchemy keeps as many on its
+# own path by default.
+PREPARED_STATEMENT_CACHE_SIZE = 100
+
+
+# information_schema only lists objects the current role owns or holds some privilege on; the
+# catalog queries read pg_catalog directly, so they apply the same checks.
+_SCHEMA_VISIBLE = (
+    "(pg_has_role(n.nspowner, 'USAGE') OR has_schema_privilege(n.oid, 'CREATE, USAGE'))"
+)
+
+
+def _relation_visible(alias: str) -> str:
+    return (
+        f"(pg_has_role({alias}.relowner, 'USAGE')"
+        f" OR has_table_privilege({alias}.oid,"
+        " 'SELECT, INSERT, UPDATE, DELETE, TRUNCATE, REFERENCES, TRIGGER')"
+        f" OR has_any_column_privilege({alias}.oid, 'SELECT, INSERT, UPDATE, REFERENCES'))"
+    )
 
 
 class PostgresAdapter(DatabaseAdapter):
-    def __init__(self) -> None:
-        self._engine_cache: dict[str, AsyncEngine] = {}
+    system_schemas = (
+        "pg_catalog",
+        "information_schema",
+        "pg_toast",
+        "pg_temp_*",
+        "pg_toast_temp_*",
+    )
+
+    def __init__(self, native_fetch: bool | None = None) -> None:
+        # Opt-in: run result-returning statements on the raw asyncpg connection and skip
+        # SQLAlchemy's Row processing.
+        self._native_fetch = (
+            get_settings().db_native_fetch if native_fetch is None else native_fetch
+        )
+        # Names of non-builtin result types (arrays, enums, domains) by URL and type OID.
+        self._type_names: dict[tuple[str, int], str] = {}
 
     @property
     def dialect(self) -> str:
@@ -20,10 +83,11 @@ class PostgresAdapter(DatabaseAdapter):
     @property
     def capabilities(self) -> AdapterCapabilities:
         return AdapterCapabilities(
-            supports_cancel=False,
+            supports_cancel=True,
             supports_metadata=True,
             supports_view_definition=True,
-            supports_estimated_row_count=False,
+            supports_estimated_row_count=True,
+            supports_explain=True,
         )
 
     def _to_async_url(self, connection_url: str) -> str:
@@ -34,84 +98,163 @@ class PostgresAdapter(DatabaseAdapter):
         return connection_url
 
     def _get_engine(self, connection_url: str) -> AsyncEngine:
-        async_url = self._to_async_url(connection_url)
-        if async_url not in self._engine_cache:
-            self._engine_cache[async_url] = create_async_engine(async_url, pool_pre_ping=True)
-        return self._engine_cache[async_url]
+        engine = get_pool_manager().get_engine(connection_url, self._to_async_url(connection_url))
+        track_cursor_descriptions(engine)
+        return engine
+
+    def _connect(self, connection_url: str) -> AbstractAsyncContextManager[AsyncConnection]:
+        return get_pool_manager().connect(connection_url, self._get_engine(connection_url))
 
     async def test_connection(self, connection_url: str) -> None:
-        engine = self._get_engine(connection_url)
-        async with engine.connect() as conn:
+        async with self._connect(connection_url) as conn:
             await conn.execute(text("SELECT 1"))
 
-    async def fetch_metadata(self, connection_url: str) -> dict[str, object]:
-        engine = self._get_engine(connection_url)
-        async with engine.connect() as conn:
-            schemas_result = await conn.execute(
-                text("SELECT schema_name FROM information_schema.schemata")
-            )
-            tables_result = await conn.execute(
-                text(
-                    "SELECT table_schema, table_name FROM information_schema.tables WHERE table_type = 'BASE TABLE'"
-                )
-            )
-            views_result = await conn.execute(
-                text(
-                    "SELECT table_schema, table_name FROM information_schema.views"
-                )
-            )
-            columns_result = await conn.execute(
-                text(
-                    """
-                    SELECT table_schema, table_name, column_name, data_type, is_nullable, column_default
-                    FROM information_schema.columns
-                    """
-                )
-            )
-            relationships_result = await conn.execute(
-                text(
-                    """
-                    SELECT tc.constraint_name,
-                           tc.table_schema,
-                           tc.table_name,
-                           kcu.column_name,
-                           ccu.table_schema AS foreign_table_schema,
-                           ccu.table_name AS foreign_table_name,
-                           ccu.column_name AS foreign_column_name
-                    FROM information_schema.table_constraints AS tc
-                    JOIN information_schema.key_column_usage AS kcu
-                      ON tc.constraint_name = kcu.constraint_name
-                    JOIN information_schema.constraint_column_usage AS ccu
-                      ON ccu.constraint_name = tc.constraint_name
-                    WHERE tc.constraint_type = 'FOREIGN KEY'
-                    """
-                )
-            )
+    def _catalog_queries(self, schema_predicate: str, relations: bool = False) -> dict[str, str]:
+        relation_predicate = "(n.nspname || '.' || c.relname) = ANY(:relations)"
+        owner_predicate = (
+            f"{schema_predicate} AND {relation_predicate}" if relations else schema_predicate
+        )
+        # Relationships pointing at a refetched relation are refetched too.
+        link_predicate = (
+            f"{schema_predicate} AND ({relation_predicate}"
+            " OR (tn.nspname || '.' || tc.relname) = ANY(:relations))"
+            if relations
+            else schema_predicate
+        )
+        return {
+            "schemas": f"""
+                SELECT n.nspname FROM pg_catalog.pg_namespace AS n
+                WHERE {schema_predicate} AND {_SCHEMA_VISIBLE}
+            """,
+            "tables": f"""
+                SELECT n.nspname, c.relname, obj_description(c.oid, 'pg_class'),
+                       CASE WHEN c.reltuples >= 0 THEN c.reltuples::bigint END,
+                       pg_total_relation_size(c.oid)
+                FROM pg_catalog.pg_class AS c
+                JOIN pg_catalog.pg_namespace AS n ON n.oid = c.relnamespace
+                WHERE c.relkind IN ('r', 'p', 'f') AND {owner_predicate}
+                  AND {_relation_visible("c")}
+            """,
+            "views": f"""
+                SELECT n.nspname, c.relname, obj_description(c.oid, 'pg_class'),
+                       pg_get_viewdef(c.oid)
+                FROM pg_catalog.pg_class AS c
+                JOIN pg_catalog.pg_namespace AS n ON n.oid = c.relnamespace
+                WHERE c.relkind IN ('v', 'm') AND {owner_predicate}
+                  AND {_relation_visible("c")}
+            """,
+            # data_type is spelled the way information_schema.columns spells it: no type
+            # modifiers, ARRAY for arrays, USER-DEFINED outside pg_catalog, domains as their base.
+            "columns": f"""
+                SELECT n.nspname, c.relname, c.relkind IN ('v', 'm'), a.attname,
+                       CASE WHEN t.typtype = 'd' THEN
+                           CASE WHEN bt.typelem <> 0 AND bt.typlen = -1 THEN 'ARRAY'
+                                WHEN nbt.nspname = 'pg_catalog'
+                                    THEN format_type(t.typbasetype, NULL)
+                                ELSE 'USER-DEFINED' END
+                       ELSE
+                           CASE WHEN t.typelem <> 0 AND t.typlen = -1 THEN 'ARRAY'
+                                WHEN nt.nspname = 'pg_catalog' THEN format_type(a.atttypid, NULL)
+                                ELSE 'USER-DEFINED' END
+                       END,
+                       NOT a.attnotnull,
+                       pg_get_expr(d.adbin, d.adrelid), col_description(c.oid, a.attnum)
+                FROM pg_catalog.pg_attribute AS a
+                JOIN pg_catalog.pg_class AS c ON c.oid = a.attrelid
+                JOIN pg_catalog.pg_namespace AS n ON n.oid = c.relnamespace
+                JOIN pg_catalog.pg_type AS t ON t.oid = a.atttypid
+                JOIN pg_catalog.pg_namespace AS nt ON nt.oid = t.typnamespace
+                LEFT JOIN pg_catalog.pg_type AS bt ON t.typtype = 'd' AND bt.oid = t.typbasetype
+                LEFT JOIN pg_catalog.pg_namespace AS nbt ON nbt.oid = bt.typnamespace
+                LEFT JOIN pg_catalog.pg_attrdef AS d
+                  ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+                WHERE c.relkind IN ('r', 'p', 'f', 'v', 'm')
+                  AND a.attnum > 0
+                  AND NOT a.attisdropped
+                  AND {owner_predicate}
+                  AND (pg_has_role(c.relowner, 'USAGE')
+                       OR has_column_privilege(c.oid, a.attnum,
+                                               'SELECT, INSERT, UPDATE, REFERENCES'))
+                ORDER BY n.nspname, c.relname, a.attnum
+            """,
+            # conkey/confkey are unnested together so multi-column keys keep their pairing.
+            "relationships": f"""
+                SELECT con.conname,
+                       n.nspname, c.relname,
+                       array_agg(sa.attname ORDER BY k.ord),
+                       tn.nspname, tc.relname,
+                       array_agg(ta.attname ORDER BY k.ord)
+                FROM pg_catalog.pg_constraint AS con
+                JOIN pg_catalog.pg_class AS c ON c.oid = con.conrelid
+                JOIN pg_catalog.pg_namespace AS n ON n.oid = c.relnamespace
+                JOIN pg_catalog.pg_class AS tc ON tc.oid = con.confrelid
+                JOIN pg_catalog.pg_namespace AS tn ON tn.oid = tc.relnamespace
+                CROSS JOIN LATERAL unnest(con.conkey, con.confkey)
+                     WITH ORDINALITY AS k(source_attnum, target_attnum, ord)
+                JOIN pg_catalog.pg_attribute AS sa
+                  ON sa.attrelid = con.conrelid AND sa.attnum = k.source_attnum
+                JOIN pg_catalog.pg_attribute AS ta
+                  ON ta.attrelid = con.confrelid AND ta.attnum = k.target_attnum
+                WHERE con.contype = 'f' AND {link_predicate}
+                  AND {_relation_visible("c")} AND {_relation_visible("tc")}
+                GROUP BY con.oid, con.conname, n.nspname, c.relname, tn.nspname, tc.relname
+            """,
+        }
+
+    async def fetch_metadata(
+        self,
+        connection_url: str,
+        schema_filter: SchemaFilter | None = None,
+        relations: Collection[str] | None = None,
+    ) -> dict[str, object]:
+        predicate, params = (schema_filter or SchemaFilter()).sql_predicate(
+            "n.nspname", self.system_schemas
+        )
+        if relations is not None:
+            params["relations"] = sorted(relations)
+        rows = await fetch_catalog(
+            lambda: self._connect(connection_url),
+            self._catalog_queries(predicate, relations is not None),
+            params,
+        )
 
-        schemas = [{"name": row[0]} for row in schemas_result.fetchall()]
-        tables = [{"schema": row[0], "name": row[1]} for row in tables_result.fetchall()]
-        views = [{"schema": row[0], "name": row[1]} for row in views_result.fetchall()]
+        schemas = [{"name": row[0]} for row in rows["schemas"]]
+        tables = [
+            {
+                "schema": row[0],
+                "name": row[1],
+                "comment": row[2],
+                "estimated_row_count": row[3],
+                "total_bytes": row[4],
+            }
+            for row in rows["tables"]
+        ]
+        views = [
+            {"schema": row[0], "name": row[1], "comment": row[2], "definition": row[3]}
+            for row in rows["views"]
+        ]
         columns = [
             {
                 "schema": row[0],
                 "owner": row[1],
-                "owner_type": "table",
-                "name": row[2],
-                "data_type": row[3],
-                "is_nullable": row[4] == "YES",
-                "default_value": row[5],
+                "owner_type": "view" if row[2] else "table",
+                "name": row[3],
+                "data_type": row[4],
+                "is_nullable": bool(row[5]),
+                "default_value": row[6],
+                "comment": row[7],
             }
-            for row in columns_result.fetchall()
+            for row in rows["columns"]
         ]
         relationships = [
             {
                 "name": row[0],
                 "sourceTable": f"{row[1]}.{row[2]}",
-                "sourceColumns": [row[3]],
+                "sourceColumns": list(row[3]),
                 "targetTable": f"{row[4]}.{row[5]}",
-                "targetColumns": [row[6]],
+                "targetColumns": list(row[6]),
             }
-            for row in relationships_result.fetchall()
+            for row in rows["relationships"]
         ]
 
         return {
@@ -122,20 +265,348 @@ class PostgresAdapter(DatabaseAdapter):
             "relationships": relationships,
         }
 
+    async def fetch_table_fingerprints(
+        self, connection_url: str, schema_filter: SchemaFilter | None = None
+    ) -> dict[str, str] | None:
+        # Any DDL on a relation rewrites its pg_class, pg_attribute, pg_constraint,
+        # pg_description or pg_rewrite rows, which changes their xmin. VACUUM and ANALYZE
+        # update reltuples in place without touching xmin, so estimates are not hashed.
+        predicate, params = (schema_filter or SchemaFilter()).sql_predicate(
+            "n.nspname", self.system_schemas
+        )
+        sql = f"""
+            SELECT n.nspname, c.relname,
+                   md5(concat_ws('|', c.oid, c.relfilenode, c.xmin::text,
+                       (SELECT string_agg(a.attnum || ':' || a.xmin::text, ',' ORDER BY a.attnum)
+                        FROM pg_catalog.pg_attribute AS a
+                        WHERE a.attrelid = c.oid AND a.attnum > 0),
+                       (SELECT string_agg(con.xmin::text, ',' ORDER BY con.oid)
+                        FROM pg_catalog.pg_constraint AS con
+                        WHERE con.conrelid = c.oid),
+                       (SELECT string_agg(d.objsubid || ':' || d.xmin::text, ','
+                                          ORDER BY d.objsubid)
+                        FROM pg_catalog.pg_description AS d
+                        WHERE d.objoid = c.oid
+                          AND d.classoid = 'pg_catalog.pg_class'::regclass),
+                       (SELECT string_agg(r.xmin::text, ',' ORDER BY r.oid)
+                        FROM pg_catalog.pg_rewrite AS r
+                        WHERE r.ev_class = c.oid)))
+            FROM pg_catalog.pg_class AS c
+            JOIN pg_catalog.pg_namespace AS n ON n.oid = c.relnamespace
+            WHERE c.relkind IN ('r', 'p', 'f', 'v', 'm') AND {predicate}
+              AND {_relation_visible("c")}
+        """
+        async with self._connect(connection_url) as conn:
+            result = await conn.execute(text(sql), params)
+            return {f"{row[0]}.{row[1]}": row[2] for row in result}
+
+    async def fetch_table_estimates(
+        self, connection_url: str, schema_filter: SchemaFilter | None = None
+    ) -> dict[str, tuple[int | None, int | None]] | None:
+        predicate, params = (schema_filter or SchemaFilter()).sql_predicate(
+            "n.nspname", self.system_schemas
+        )
+        sql = f"""
+            SELECT n.nspname, c.relname,
+                   CASE WHEN c.reltuples >= 0 THEN c.reltuples::bigint END,
+                   pg_total_relation_size(c.oid)
+            FROM pg_catalog.pg_class AS c
+            JOIN pg_catalog.pg_namespace AS n ON n.oid = c.relnamespace
+            WHERE c.relkind IN ('r', 'p', 'f') AND {predicate}
+              AND {_relation_visible("c")}
+        """
+        async with self._connect(connection_url) as conn:
+            result = await conn.execute(text(sql), params)
+            return {f"{row[0]}.{row[1]}": (row[2], row[3]) for row in result}
+
+    async def fetch_table_change_counters(
+        self, connection_url: str, tables: Collection[str]
+    ) -> dict[str, str]:
+        # Tuple counters trail a commit by up to a second and only count writes made on this
+        # server, so on a replica only TRUNCATE and rewrites (relfilenode) are noticed.
+        sql = """
+            SELECT n.nspname, c.relname,
+                   CASE WHEN c.relkind IN ('r', 'p', 'm') THEN
+                       concat_ws('|', c.relfilenode, s.n_tup_ins, s.n_tup_upd, s.n_tup_del)
+                   END,
+                   n.nspname = ANY(current_schemas(false))
+            FROM pg_catalog.pg_class AS c
+            JOIN pg_catalog.pg_namespace AS n ON n.oid = c.relnamespace
+            LEFT JOIN pg_catalog.pg_stat_all_tables AS s ON s.relid = c.oid
+            WHERE c.relname = ANY(:names)
+              AND (n.nspname = ANY(current_schemas(false)) OR n.nspname || '.' || c.relname
+                   = ANY(:tables))
+        """
+        params = {
+            "names": sorted({table.rpartition(".")[2] for table in tables}),
+            "tables": sorted(tables),
+        }
+        async with self._connect(connection_url) as conn:
+            result = await conn.execute(text(sql), params)
+            rows = result.all()
+        return counters_by_table(tables, rows)
+
+    async def _backend_id(self, conn: AsyncConnection) -> int:
+        raw = await conn.get_raw_connection()
+        return int(raw.driver_connection.get_server_pid())
+
+    async def _cancel_backend(self, connection_url: str, backend_id: int) -> bool:
+        async with self._connect(connection_url) as conn:
+            result = await conn.execute(
+                text("SELECT pg_cancel_backend(:pid)"), {"pid": backend_id}
+            )
+            return bool(result.scalar())
+
+    @asynccontextmanager
+    async def _read_only(
+        self, conn: AsyncConnection, sql: str, timeout_seconds: int
+    ) -> AsyncIterator[str]:
+        # A short read-only transaction with a server-side deadline; SET LOCAL semantics
+        # (is_local=true) so nothing leaks onto the pooled connection.
+        async with conn.begin():
+            await conn.execute(
+                text(
+                    "SELECT set_config('transaction_read_only', 'on', true), "
+                    "set_config('statement_timeout', :timeout_ms, true)"
+                ),
+                {"timeout_ms": str(int(timeout_seconds * 1000))},
+            )
+            yield sql
+
     async def execute_query(
-        self, connection_url: str, sql: str, timeout_seconds: int, max_rows: int
+        self,
+        connection_url: str,
+        sql: str,
+        timeout_seconds: int,
+        max_rows: int,
+        params: Sequence[Any] = (),
     ) -> dict[str, object]:
-        engine = self._get_engine(connection_url)
-        async with engine.connect() as conn:
-            start = time.perf_counter()
-            result = await asyncio.wait_for(conn.execute(text(sql)), timeout=timeout_seconds)
-            rows = result.fetchmany(max_rows)
-            duration_ms = int((time.perf_counter() - start) * 1000)
-
-        columns = [{"name": name, "type": "unknown"} for name in result.keys()]
-        data_rows = [list(row) for row in rows]
+        checkout = time.perf_counter()
+        async with self._connect(connection_url) as conn:
+            backend_id = await self._backend_id(conn)
+            with get_query_registry().attach(connection_url, backend_id) as query:
+                try:
+                    async with self._read_only(conn, sql, timeout_seconds) as statement:
+                        # Checkout plus the session setup the statement needs.
+                        record_phase("pool", checkout)
+                        start = time.perf_counter()
+                        description, data_rows = await run_cancellable(
+                            self._fetch_all(conn, statement, max_rows, params),
+                            timeout_seconds + CLIENT_DEADLINE_SLACK_SECONDS,
+                            lambda: self._cancel_backend(connection_url, backend_id),
+                            query,
+                        )
+                except (DBAPIError, asyncpg.PostgresError) as exc:
+                    raise_if_interrupted(query, exc, _is_statement_timeout(exc))
+                    raise
+                duration_ms = int((time.perf_counter() - start) * 1000)
+
+        with timed("fetch"):
+            columns = await self._columns(connection_url, description)
         return {"columns": columns, "rows": data_rows, "duration_ms": duration_ms}
 
+    async def _fetch_all(
+        self, conn: AsyncConnection, statement: str, max_rows: int, params: Sequence[Any]
+    ) -> tuple[list[ColumnDescription], list[list[Any]]]:
+        # Drivers buffer the whole result, so "execute" lasts until every row has arrived and
+        # "fetch" is turning them into lists. The native path reads through a cursor instead,
+        # so rows past max_rows are never sent; it runs in the transaction _read_only opened.
+        # Bound statements always take it, since their values are converted to the parameter
+        # types of the prepared statement.
+        if self._native_fetch or params:
+            with timed("execute"):
+                prepared = await _prepare(conn, statement)
+                cursor = await prepared.cursor(*_bind(prepared, params))
+                records = await cursor.fetch(max_rows)
+                await _keep(conn, statement, prepared)
+            with timed("fetch"):
+                description = _attribute_description(prepared.get_attributes())
+                return description, list(map(list, records))
+        with timed("execute"):
+            result = await conn.execute(text(statement))
+        with timed("fetch"):
+            description = [(column[0], column[1], None) for column in cursor_description(result)]
+            return description, [list(row) for row in result.fetchmany(max_rows)]
+
+    async def _columns(
+        self, connection_url: str, description: list[ColumnDescription]
+    ) -> list[dict[str, str]]:
+        # SQLAlchemy only reports type OIDs; builtin ones are named locally and the rest are
+        # looked up once per database on a separate connection.
+        missing = {
+            oid
+            for _, oid, type_name in description
+            if type_name is None
+            and postgres_builtin_type(oid) is None
+            and (connection_url, oid) not in self._type_names
+        }
+        if missing:
+            async with self._connect(connection_url) as conn:
+                # Arrays are named like asyncpg names them on the native path: int4[].
+                result = await conn.execute(
+                    text(
+                        "SELECT t.oid::int, COALESCE(e.typname || '[]', t.typname) "
+                        "FROM pg_catalog.pg_type AS t "
+                        "LEFT JOIN pg_catalog.pg_type AS e "
+                        "ON e.oid = t.typelem AND t.typcategory = 'A' "
+                        "WHERE t.oid = ANY(:oids)"
+                    ),
+                    {"oids": sorted(missing)},
+                )
+                for oid, type_name in result:
+                    self._type_names[(connection_url, oid)] = type_name
+        return [
+            {
+                "name": name,
+                "type": type_name
+                or postgres_builtin_type(oid)
+                or self._type_names.get((connection_url, oid), UNKNOWN_TYPE),
+            }
+            for name, oid, type_name in description
+        ]
+
+    async def stream_query(
+        self,
+        connection_url: str,
+        sql: str,
+        timeout_seconds: int,
+        max_rows: int,
+        params: Sequence[Any] = (),
+    ) -> AsyncIterator[dict[str, Any]]:
+        async with self._connect(connection_url) as conn:
+            backend_id = await self._backend_id(conn)
+            with get_query_registry().attach(connection_url, backend_id) as query:
+                try:
+                    async with self._read_only(conn, sql, timeout_seconds) as statement:
+                        # Bound statements always use the driver's cursor; see _fetch_all.
+                        native = self._native_fetch or bool(params)
+                        fetch = self._native_batches if native else self._row_batches
+                        columns = None
+                        async for description, rows in fetch(
+                            conn,
+                            statement,
+                            params,
+                            max_rows,
+                            timeout_seconds,
+                            query,
+                            lambda: self._cancel_backend(connection_url, backend_id),
+                        ):
+                            if columns is None:
+                                columns = await self._columns(connection_url, description)
+                            yield {"columns": columns, "rows": rows}
+                except (DBAPIError, asyncpg.PostgresError) as exc:
+                    raise_if_interrupted(query, exc, _is_statement_timeout(exc))
+                    raise
+
+    async def _row_batches(
+        self,
+        conn: AsyncConnection,
+        statement: str,
+        params: Sequence[Any],
+        max_rows: int,
+        timeout_seconds: int,
+        query: InflightQuery | None,
+        cancel: Callable[[], Awaitable[bool]],
+    ) -> AsyncIterator[tuple[list[ColumnDescription], list[list[Any]]]]:
+        # Only statements without parameters come here; see stream_query.
+        result = await run_cancellable(
+            conn.stream(text(statement)),
+            timeout_seconds + CLIENT_DEADLINE_SLACK_SECONDS,
+            cancel,
+            query,
+        )
+        description: list[ColumnDescription] = [
+            (column[0], column[1], None) for column in streamed_description(conn)
+        ]
+        async for rows in iter_row_batches(result, max_rows):
+            yield description, rows
+
+    async def _native_batches(
+        self,
+        conn: AsyncConnection,
+        statement: str,
+        params: Sequence[Any],
+        max_rows: int,
+        timeout_seconds: int,
+        query: InflightQuery | None,
+        cancel: Callable[[], Awaitable[bool]],
+    ) -> AsyncIterator[tuple[list[ColumnDescription], list[list[Any]]]]:
+        # asyncpg cursors need the open transaction that _read_only started.
+        prepared = await run_cancellable(
+            _prepare(conn, statement),
+            timeout_seconds + CLIENT_DEADLINE_SLACK_SECONDS,
+            cancel,
+            query,
+        )
+        cursor = await prepared.cursor(*_bind(prepared, params))
+        description = _attribute_description(prepared.get_attributes())
+        async for rows in iter_fetch_batches(cursor.fetch, max_rows):
+            yield description, rows
+        await _keep(conn, statement, prepared)
+
+    async def explain_query(
+        self, connection_url: str, sql: str, timeout_seconds: int, params: Sequence[Any] = ()
+    ) -> QueryPlanEstimate | None:
+        async with self._connect(connection_url) as conn:
+            explain = f"EXPLAIN (FORMAT JSON) {sql}"
+            async with self._read_only(conn, explain, timeout_seconds) as statement:
+                if params:
+                    prepared = await _prepare(conn, statement)
+                    document = await prepared.fetchval(*_bind(prepared, params))
+                    await _keep(conn, statement, prepared)
+                else:
+                    document = (await conn.execute(text(statement))).scalar()
+        return summarize_postgres_plan(document)
+
     async def cancel_query(self, query_id: str) -> bool:
-        _ = query_id
-        return False
+        query = get_query_registry().get(query_id)
+        if query is None or query.backend_id is None or query.connection_url is None:
+            return False
+        query.cancel_requested = True
+        return await self._cancel_backend(query.connection_url, query.backend_id)
+
+
+def _bind(prepared: Any, params: Sequence[Any]) -> list[Any]:
+    # Bound statements go to the driver as they are, $1 placeholders included.
+    return coerce_postgres_params(prepared.get_parameters(), params)
+
+
+async def _prepare(conn: AsyncConnection, statement: str) -> Any:
+    # asyncpg's prepare() is not cached, so the native path keeps its own LRU per connection:
+    # a template run again with other values is not planned again. The entry is taken out
+    # while it runs and only put back by _keep, so a statement that failed, e.g. after a
+    # schema change, is prepared afresh next time.
+    cache = await _statement_cache(conn)
+    prepared = cache.pop(statement, None)
+    if prepared is None:
+        driver = (await conn.get_raw_connection()).driver_connection
+        assert driver is not None
+        prepared = await driver.prepare(statement)
+    return prepared
+
+
+async def _keep(conn: AsyncConnection, statement: str, prepared: Any) -> None:
+    cache = await _statement_cache(conn)
+    cache[statement] = prepared
+    if len(cache) > PREPARED_STATEMENT_CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+async def _statement_cache(conn: AsyncConnection) -> OrderedDict[str, Any]:
+    # Kept in the pooled connection's info, so it goes away with the connection itself.
+    raw = await conn.get_raw_connection()
+    return cast(
+        "OrderedDict[str, Any]", raw.info.setdefault("prepared_statements", OrderedDict())
+    )
+
+
+def _attribute_description(attributes: Sequence[Any]) -> list[ColumnDescription]:
+    return [(attribute.name, attribute.type.oid, attribute.type.name) for attribute in attributes]
+
+
+def _is_statement_timeout(exc: Exception) -> bool:
+    # 57014 is query_canceled, raised both for statement_timeout and pg_cancel_backend;
+    # explicit cancellations are told apart through the query registry first. Errors from
+    # the native fetch path are raw asyncpg exceptions rather than wrapped DBAPIErrors.
+    driver_error = exc.orig if isinstance(exc, DBAPIError) else exc
+    return getattr(driver_error, "sqlstate", None) == "57014"
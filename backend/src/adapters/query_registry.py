@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Iterator
+
+from .base import QueryCancelledError, QueryTimeoutError
+
+# How long to wait for the driver to surface a server-side cancellation before giving up.
+CANCEL_GRACE_SECONDS = 5.0
+# Statement deadlines are enforced by the server; the client-side deadline is only a
+# backstop for servers that ignore them, so it fires slightly later.
+CLIENT_DEADLINE_SLACK_SECONDS = 2.0
+
+_CURRENT_QUERY_CTX: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "current_query_id", default=None
+)
+
+
+@dataclass
+class InflightQuery:
+    query_id: str
+    connection_id: str
+    started_at: float = field(default_factory=time.time)
+    connection_url: str | None = None
+    backend_id: int | None = None
+    cancel_requested: bool = False
+
+
+class QueryRegistry:
+    """In-flight queries keyed by request id, with the server session running each one."""
+
+    def __init__(self) -> None:
+        self._queries: dict[str, InflightQuery] = {}
+
+    @contextmanager
+    def track(self, query_id: str, connection_id: str) -> Iterator[InflightQuery]:
+        query = InflightQuery(query_id=query_id, connection_id=connection_id)
+        self._queries[query_id] = query
+        previous = _CURRENT_QUERY_CTX.get()
+        _CURRENT_QUERY_CTX.set(query_id)
+        try:
+            yield query
+        finally:
+            _CURRENT_QUERY_CTX.set(previous)
+            self._queries.pop(query_id, None)
+
+    @contextmanager
+    def attach(self, connection_url: str, backend_id: int | None) -> Iterator[InflightQuery | None]:
+        # Called by adapters once a pooled connection is checked out for the current query.
+        # The backend id is cleared before the connection goes back to the pool so a late
+        # cancel cannot hit an unrelated statement.
+        query = self.current()
+        if query is not None:
+            query.connection_url = connection_url
+            query.backend_id = backend_id
+        try:
+            yield query
+        finally:
+            if query is not None:
+                query.backend_id = None
+
+    def current(self) -> InflightQuery | None:
+        query_id = _CURRENT_QUERY_CTX.get()
+        if query_id is None:
+            return None
+        return self._queries.get(query_id)
+
+    def get(self, query_id: str) -> InflightQuery | None:
+        return self._queries.get(query_id)
+
+    def reset(self) -> None:
+        self._queries = {}
+
+
+async def run_cancellable[T](
+    awaitable: Awaitable[T],
+    timeout_seconds: float,
+    cancel: Callable[[], Awaitable[bool]],
+    query: InflightQuery | None = None,
+) -> T:
+    """Await a statement, cancelling it on the server when the deadline passes.
+
+    Unlike ``asyncio.wait_for`` the statement is stopped on the server first, so the driver
+    unwinds normally and the pooled connection stays usable.
+    """
+    task: asyncio.Future[T] = asyncio.ensure_future(awaitable)
+    try:
+        done, _ = await asyncio.wait({task}, timeout=timeout_seconds)
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+
+    if task not in done:
+        try:
+            await cancel()
+            await asyncio.wait_for(task, timeout=CANCEL_GRACE_SECONDS)
+        except Exception:  # noqa: BLE001
+            task.cancel()
+        raise QueryTimeoutError(f"Query exceeded {timeout_seconds}s timeout.")
+
+    try:
+        return task.result()
+    except Exception as exc:
+        raise_if_cancelled(query, exc)
+        raise
+
+
+def raise_if_cancelled(query: InflightQuery | None, exc: BaseException) -> None:
+    if query is not None and query.cancel_requested:
+        raise QueryCancelledError("Query was cancelled.") from exc
+
+
+def raise_if_interrupted(
+    query: InflightQuery | None, exc: BaseException, statement_timeout: bool
+) -> None:
+    raise_if_cancelled(query, exc)
+    if statement_timeout:
+        raise QueryTimeoutError("Query exceeded the server statement timeout.") from exc
+
+
+_registry = QueryRegistry()
+
+
+def get_query_registry() -> QueryRegistry:
+    return _registry
+
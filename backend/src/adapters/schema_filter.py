@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import fnmatch
+import json
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+
+def glob_to_like(pattern: str) -> str:
+    """Translate a ``*``/``?`` glob into a LIKE pattern using the default ``\\`` escape."""
+    escaped = pattern.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped.replace("*", "%").replace("?", "_")
+
+
+@dataclass(frozen=True)
+class SchemaFilter:
+    """Include/exclude globs applied to schema names when metadata is fetched.
+
+    An empty ``include`` means every schema. System schemas are always left out unless one
+    is named literally in ``include``.
+    """
+
+    include: tuple[str, ...] = ()
+    exclude: tuple[str, ...] = ()
+
+    @classmethod
+    def from_lists(
+        cls, include: Iterable[str] | None, exclude: Iterable[str] | None
+    ) -> SchemaFilter:
+        return cls(include=tuple(include or ()), exclude=tuple(exclude or ()))
+
+    def cache_key(self) -> str:
+        """Stable text form stored with metadata snapshots built under this filter."""
+        return json.dumps([list(self.include), list(self.exclude)])
+
+    def _hidden(self, system_schemas: Iterable[str]) -> list[str]:
+        return [pattern for pattern in system_schemas if pattern not in self.include]
+
+    def matches(self, schema: str, system_schemas: Iterable[str] = ()) -> bool:
+        excluded = (*self._hidden(system_schemas), *self.exclude)
+        if any(fnmatch.fnmatchcase(schema, pattern) for pattern in excluded):
+            return False
+        return not self.include or any(
+            fnmatch.fnmatchcase(schema, pattern) for pattern in self.include
+        )
+
+    def sql_predicate(
+        self,
+        column: str,
+        system_schemas: Iterable[str] = (),
+        prefix: str = "schema",
+        like: str = "LIKE",
+    ) -> tuple[str, dict[str, Any]]:
+        """Build a WHERE fragment over ``column`` with bind parameters named ``prefix_N``.
+
+        Patterns match case-sensitively, like ``matches``. Databases whose ``LIKE`` follows a
+        case-insensitive collation pass a case-sensitive operator as ``like``.
+        """
+        params: dict[str, Any] = {}
+
+        def bind(value: str) -> str:
+            name = f"{prefix}_{len(params)}"
+            params[name] = glob_to_like(value)
+            return f":{name}"
+
+        clauses: list[str] = []
+        for pattern in (*self._hidden(system_schemas), *self.exclude):
+            clauses.append(f"{column} NOT {like} {bind(pattern)}")
+        if self.include:
+            options = " OR ".join(f"{column} {like} {bind(pattern)}" for pattern in self.include)
+            clauses.append(f"({options})")
+        return (" AND ".join(clauses) or "1 = 1"), params
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncResult
+
+DEFAULT_INITIAL_BATCH_SIZE = 100
+DEFAULT_MAX_BATCH_SIZE = 10_000
+DEFAULT_TARGET_BATCH_SECONDS = 0.05
+
+
+class AdaptiveBatchSize:
+    """Grows the fetch size while batches come back fast and shrinks it when they do not.
+
+    Small first batches keep time-to-first-row low; larger later batches amortise the
+    per-round-trip cost on long scans.
+    """
+
+    def __init__(
+        self,
+        initial: int = DEFAULT_INITIAL_BATCH_SIZE,
+        maximum: int = DEFAULT_MAX_BATCH_SIZE,
+        target_seconds: float = DEFAULT_TARGET_BATCH_SECONDS,
+    ) -> None:
+        self._minimum = max(1, initial)
+        self._maximum = max(self._minimum, maximum)
+        self._target_seconds = target_seconds
+        self.size = self._minimum
+
+    def observe(self, row_count: int, elapsed_seconds: float) -> None:
+        if row_count < self.size:
+            return
+        if elapsed_seconds < self._target_seconds / 2:
+            self.size = min(self.size * 2, self._maximum)
+        elif elapsed_seconds > self._target_seconds * 2:
+            self.size = max(self.size // 2, self._minimum)
+
+
+async def iter_fetch_batches(
+    fetchmany: Callable[[int], Awaitable[Sequence[Sequence[Any]]]],
+    max_rows: int,
+    batch_size: AdaptiveBatchSize | None = None,
+) -> AsyncIterator[list[list[Any]]]:
+    """Yield row batches from any ``fetchmany(size)`` coroutine, at most ``max_rows`` in total.
+
+    At least one (possibly empty) batch is always yielded so callers can emit a header.
+    """
+    sizer = batch_size or AdaptiveBatchSize()
+    remaining = max_rows
+    emitted = False
+    while remaining > 0:
+        size = min(sizer.size, remaining)
+        start = time.perf_counter()
+        rows = await fetchmany(size)
+        sizer.observe(len(rows), time.perf_counter() - start)
+        if not rows:
+            break
+        remaining -= len(rows)
+        emitted = True
+        yield list(map(list, rows))
+        if len(rows) < size:
+            break
+    if not emitted:
+        yield []
+
+
+async def iter_row_batches(
+    result: AsyncResult[Any], max_rows: int, batch_size: AdaptiveBatchSize | None = None
+) -> AsyncIterator[list[list[Any]]]:
+    """Yield row batches from a SQLAlchemy server-side cursor, closing it afterwards."""
+    try:
+        async for rows in iter_fetch_batches(result.fetchmany, max_rows, batch_size):
+            yield rows
+    finally:
+        await result.close()
@@ -1,16 +1,33 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from ..adapters.mariadb_adapter import MariaDbAdapter
+from ..adapters.pool_manager import get_pool_manager
 from ..adapters.postgres_adapter import PostgresAdapter
 from ..services.adapter_registry import get_registry
+from ..services.query_log import get_query_log
+from ..services.query_stats import get_query_stats
 from ..utils.logging import configure_logging
 from ..utils.request_id import RequestIdMiddleware
+from ..utils.settings import get_settings
+from . import metrics
+from .compression import CompressionMiddleware
 from .router import api_router
 
 
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    yield
+    await get_query_log().close()
+    await get_query_stats().close()
+    await get_pool_manager().dispose_all()
+
+
 def create_app() -> FastAPI:
     configure_logging()
     registry = get_registry()
@@ -18,7 +35,11 @@ def create_app() -> FastAPI:
         registry.set_adapter("postgres", PostgresAdapter())
     if not registry.has_adapter("mariadb"):
         registry.set_adapter("mariadb", MariaDbAdapter())
-    app = FastAPI(title="DB Query Tool API")
+    app = FastAPI(title="DB Query Tool API", lifespan=_lifespan)
+    # Innermost, so it sees bodies before RequestIdMiddleware re-chunks them.
+    app.add_middleware(
+        CompressionMiddleware, minimum_size=get_settings().http_compression_min_bytes
+    )
     app.add_middleware(RequestIdMiddleware)
     app.add_middleware(
         CORSMiddleware,
@@ -27,7 +48,10 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    # Outermost, so latency covers every other middleware and bytes are counted as sent.
+    app.add_middleware(metrics.MetricsMiddleware)
     app.include_router(api_router, prefix="/api/v1")
+    app.include_router(metrics.router)
     return app
 
 
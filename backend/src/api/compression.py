@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import zlib
+from dataclasses import dataclass
+from importlib.util import find_spec
+from types import ModuleType
+from typing import Any, Callable, Protocol, TypeVar
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .negotiation import weighted_values
+
+
+def _optional_module(name: str) -> ModuleType | None:
+    # zstandard and brotli come with the optional "compression" extra.
+    return importlib.import_module(name) if find_spec(name) is not None else None
+
+
+zstandard = _optional_module("zstandard")
+brotli = _optional_module("brotli")
+
+# Bodies or chunks at least this large are compressed in a worker thread.
+THREAD_OFFLOAD_BYTES = 64 * 1024
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class _Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class _ZstdStream(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self, mode: int) -> bytes: ...
+
+
+class _BrotliStream(Protocol):
+    def process(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class _Gzip:
+    def __init__(self) -> None:
+        self._stream = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._stream.compress(data)
+
+    def flush(self) -> bytes:
+        return self._stream.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._stream.flush(zlib.Z_FINISH)
+
+
+class _Zstd:
+    def __init__(self) -> None:
+        assert zstandard is not None
+        self._stream: _ZstdStream = zstandard.ZstdCompressor(level=3).compressobj()
+        self._flush_block: int = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        self._flush_finish: int = zstandard.COMPRESSOBJ_FLUSH_FINISH
+
+    def compress(self, data: bytes) -> bytes:
+        return self._stream.compress(data)
+
+    def flush(self) -> bytes:
+        return self._stream.flush(self._flush_block)
+
+    def finish(self) -> bytes:
+        return self._stream.flush(self._flush_finish)
+
+
+class _Brotli:
+    def __init__(self) -> None:
+        assert brotli is not None
+        # Quality 4 keeps most of brotli's ratio at a speed suited to dynamic responses.
+        self._stream: _BrotliStream = brotli.Compressor(quality=4)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._stream.process(data)
+
+    def flush(self) -> bytes:
+        return self._stream.flush()
+
+    def finish(self) -> bytes:
+        return self._stream.finish()
+
+
+# Available content codings, in server preference order for equal q-values.
+ENCODINGS: dict[str, Callable[[], _Compressor]] = {}
+if zstandard is not None:
+    ENCODINGS["zstd"] = _Zstd
+if brotli is not None:
+    ENCODINGS["br"] = _Brotli
+ENCODINGS["gzip"] = _Gzip
+
+
+def negotiate_content_encoding(accept_encoding: str | None) -> str | None:
+    """The coding to use for ``accept_encoding``, or None to send the body as is."""
+    accepted = dict(weighted_values(accept_encoding))
+    best: str | None = None
+    best_q = 0.0
+    for name in ENCODINGS:
+        q = accepted.get(name, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+@dataclass(frozen=True)
+class CompressionPolicy:
+    # Bodies below this size are sent as is; None uses the middleware default.
+    minimum_size: int | None = None
+
+
+def compressed(minimum_size: int | None = None) -> Callable[[F], F]:
+    """Opt a route's responses into compression by ``CompressionMiddleware``."""
+
+    def mark(endpoint: F) -> F:
+        endpoint.compression_policy = CompressionPolicy(minimum_size)  # type: ignore[attr-defined]
+        return endpoint
+
+    return mark
+
+
+class CompressionMiddleware:
+    """Compresses responses of routes marked with ``compressed`` as Accept-Encoding allows.
+
+    Streamed bodies are compressed chunk by chunk and flushed after each one, so nothing is
+    buffered and clients can decode every chunk as it arrives.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_content_encoding(Headers(scope=scope).get("accept-encoding"))
+        await self.app(scope, receive, _CompressingSend(scope, send, encoding, self.minimum_size))
+
+
+class _CompressingSend:
+    def __init__(self, scope: Scope, send: Send, encoding: str | None, minimum_size: int) -> None:
+        self._scope = scope
+        self._send = send
+        self._encoding = encoding
+        self._minimum_size = minimum_size
+        self._start: Message | None = None
+        self._compressor: _Compressor | None = None
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            await self._on_start(message)
+        elif message["type"] == "http.response.body" and self._compressor is not None:
+            await self._on_body(message)
+        else:
+            await self._flush_start()
+            await self._send(message)
+
+    async def _on_start(self, message: Message) -> None:
+        # The router has matched by now, so the scope names the endpoint.
+        policy = getattr(self._scope.get("endpoint"), "compression_policy", None)
+        if policy is None:
+            await self._send(message)
+            return
+        headers = MutableHeaders(scope=message)
+        headers.add_vary_header("Accept-Encoding")
+        minimum_size = self._minimum_size if policy.minimum_size is None else policy.minimum_size
+        length = headers.get("content-length")
+        if (
+            self._encoding is None
+            or "content-encoding" in headers
+            or message["status"] in (204, 304)
+            or (length is not None and int(length) < minimum_size)
+        ):
+            await self._send(message)
+            return
+        self._compressor = ENCODINGS[self._encoding]()
+        headers["Content-Encoding"] = self._encoding
+        if length is None:
+            # Streamed: send the headers right away rather than after the first chunk.
+            await self._send(message)
+        else:
+            # Held back until the body arrives so the compressed length can be set.
+            del headers["Content-Length"]
+            self._start = message
+
+    async def _on_body(self, message: Message) -> None:
+        assert self._compressor is not None
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self._start is not None and not more_body:
+            data = await _compress(self._compressor, body, final=True)
+            MutableHeaders(scope=self._start)["Content-Length"] = str(len(data))
+        else:
+            data = await _compress(self._compressor, body, final=not more_body)
+        await self._flush_start()
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    async def _flush_start(self) -> None:
+        if self._start is not None:
+            start, self._start = self._start, None
+            await self._send(start)
+
+
+async def _compress(compressor: _Compressor, body: bytes, final: bool) -> bytes:
+    def run() -> bytes:
+        data = compressor.compress(body)
+        return data + (compressor.finish() if final else compressor.flush())
+
+    if len(body) >= THREAD_OFFLOAD_BYTES:
+        return await asyncio.to_thread(run)
+    return run()
@@ -7,6 +7,8 @@ from ..models.connections import (
     ConnectionListResponse,
     ConnectionResponse,
     ConnectionUpdate,
+    PoolStatsListResponse,
+    PoolStatsResponse,
 )
 from ..models.connections import ConnectionTestResponse
 from ..services.adapter_registry import get_registry
@@ -26,26 +28,31 @@ def list_connections() -> ConnectionListResponse:
     return ConnectionListResponse(items=items, total=len(items), page=1, page_size=len(items))
 
 
+@router.get("/pools", response_model=PoolStatsListResponse)
+def list_pool_stats() -> PoolStatsListResponse:
+    return _service.list_pool_stats()
+
+
 @router.post("", response_model=ConnectionResponse)
-def create_connection(request: ConnectionCreate) -> ConnectionResponse:
+async def create_connection(request: ConnectionCreate) -> ConnectionResponse:
     try:
-        return _service.create_connection(request)
+        return await _service.create_connection(request)
     except AppError as exc:
         return error_response(exc.status_code, exc.code, exc.message, exc.details)
 
 
 @router.delete("/{connection_id}", status_code=204)
-def delete_connection(connection_id: str) -> None:
+async def delete_connection(connection_id: str) -> None:
     try:
-        _service.delete_connection(connection_id)
+        await _service.delete_connection(connection_id)
     except AppError as exc:
         return error_response(exc.status_code, exc.code, exc.message, exc.details)
 
 
 @router.put("/{connection_id}", response_model=ConnectionResponse)
-def update_connection(connection_id: str, request: ConnectionUpdate) -> ConnectionResponse:
+async def update_connection(connection_id: str, request: ConnectionUpdate) -> ConnectionResponse:
     try:
-        return _service.update_connection(connection_id, request)
+        return await _service.update_connection(connection_id, request)
     except AppError as exc:
         return error_response(exc.status_code, exc.code, exc.message, exc.details)
 
@@ -56,3 +63,11 @@ async def test_connection(connection_id: str) -> ConnectionTestResponse:
         return await _service.test_connection(connection_id)
     except AppError as exc:
         return error_response(exc.status_code, exc.code, exc.message, exc.details)
+
+
+@router.get("/{connection_id}/pool", response_model=PoolStatsResponse)
+def get_pool_stats(connection_id: str) -> PoolStatsResponse:
+    try:
+        return _service.pool_stats(connection_id)
+    except AppError as exc:
+        return error_response(exc.status_code, exc.code, exc.message, exc.details)
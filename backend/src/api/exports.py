@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from fastapi import APIRouter
 
-from ..models.exports import ExportRequest, ExportResponse
+from ..models.exports import ExportRequest, ExportResponse, ExportStoreStatsResponse
 from ..services.export_service import get_export_service
 from ..utils.app_errors import AppError
 from .errors import error_response
@@ -23,3 +23,17 @@ def export_query(request: ExportRequest) -> ExportResponse:
         return error_response(exc.status_code, exc.code, exc.message, exc.details)
 
     return ExportResponse(export_id=export_id, download_url=file_path.as_posix())
+
+
+@router.get("/stats", response_model=ExportStoreStatsResponse)
+def get_store_stats() -> ExportStoreStatsResponse:
+    stats = _export_service.stats()
+    return ExportStoreStatsResponse(
+        entries=stats.entries,
+        size_bytes=stats.size_bytes,
+        max_bytes=stats.max_bytes,
+        ttl_seconds=stats.ttl_seconds,
+        evicted=stats.evicted,
+        expired=stats.expired,
+        rejected=stats.rejected,
+    )
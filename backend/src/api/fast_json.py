@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from fastapi import Response
+from pydantic_core import to_json, to_jsonable_python
+
+from ..models.base import AppBaseModel
+
+# UTC datetimes end in Z, as pydantic writes them.
+_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(payload: Any) -> bytes:
+    """Encode trusted data without validation; output matches pydantic's JSON mode."""
+    try:
+        return orjson.dumps(payload, default=to_jsonable_python, option=_OPTIONS)
+    except orjson.JSONEncodeError:
+        # e.g. integers wider than 64 bits, which orjson rejects.
+        return to_json(payload)
+
+
+def json_response(payload: Any, headers: dict[str, str] | None = None) -> Response:
+    return Response(content=dumps(payload), media_type="application/json", headers=headers)
+
+
+def model_response(model: AppBaseModel) -> Response:
+    """Serve an already validated model, skipping FastAPI's response-model round trip."""
+    return json_response(model.to_dict())
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 
-from ..models.history import HistoryCreateRequest, HistoryListResponse
+from ..models.history import (
+    HistoryCreateRequest,
+    HistoryListResponse,
+    QueryFingerprintStatsResponse,
+    QueryLatencyStatsResponse,
+    SlowQueryListResponse,
+)
 from ..services.history_service import add_history, clear_history, list_history
+from ..services.query_log import get_query_log
+from ..services.query_stats import get_query_stats
 
 router = APIRouter()
 
@@ -27,3 +35,38 @@ async def delete_history(connection_id: str) -> dict:
     """清空指定连接的查询历史"""
     clear_history(connection_id)
     return {"message": "History cleared"}
+
+
+@router.get("/{connection_id}/history/slow", response_model=SlowQueryListResponse)
+async def get_slow_queries(
+    connection_id: str, limit: int = Query(50, ge=1, le=500)
+) -> SlowQueryListResponse:
+    """列出超过慢查询阈值的执行记录"""
+    return await get_query_log().slow_queries(connection_id, limit)
+
+
+@router.get("/{connection_id}/history/stats", response_model=QueryLatencyStatsResponse)
+async def get_latency_stats(
+    connection_id: str,
+    hours: int = Query(24, ge=1, le=24 * 30),
+    top: int = Query(20, ge=1, le=200),
+) -> QueryLatencyStatsResponse:
+    """按连接、查询指纹和小时统计 p50/p95/p99 延迟"""
+    return await get_query_log().latency_stats(connection_id, hours, top)
+
+
+@router.get(
+    "/{connection_id}/history/fingerprints", response_model=QueryFingerprintStatsResponse
+)
+async def get_fingerprint_stats(
+    connection_id: str, limit: int = Query(20, ge=1, le=500)
+) -> QueryFingerprintStatsResponse:
+    """按总耗时列出查询指纹的累计调用次数、耗时、行数和错误数"""
+    return await get_query_stats().top(connection_id, limit)
+
+
+@router.delete("/{connection_id}/history/fingerprints")
+async def reset_fingerprint_stats(connection_id: str) -> dict:
+    """清空指定连接的查询指纹统计"""
+    await get_query_stats().reset(connection_id)
+    return {"message": "Fingerprint statistics cleared"}
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Query, Response
+
+from ..models.jobs import JobListResponse, JobResponse, JobResultPage, JobSubmitRequest
+from ..services.adapter_registry import get_registry
+from ..services.connection_service import get_connection_service
+from ..services.export_service import get_export_service
+from ..services.job_service import JobService
+from ..services.query_service import QueryService
+from ..utils.app_errors import AppError
+from .compression import compressed
+from .errors import error_response
+from .fast_json import model_response
+
+router = APIRouter()
+
+_service = JobService(QueryService(get_registry(), get_connection_service(), get_export_service()))
+
+
+# Job routes send no Server-Timing: the query runs after the submit response, and a job
+# reports its execution time as elapsedMs instead.
+@router.post("/{connection_id}/jobs", response_model=JobResponse, status_code=202)
+async def submit_job(connection_id: str, request: JobSubmitRequest) -> JobResponse:
+    try:
+        return await _service.submit(connection_id, request)
+    except AppError as exc:
+        return error_response(exc.status_code, exc.code, exc.message, exc.details)
+
+
+@router.get("/{connection_id}/jobs", response_model=JobListResponse)
+async def list_jobs(
+    connection_id: str, limit: int = Query(50, ge=1, le=500)
+) -> JobListResponse:
+    return await _service.list_jobs(connection_id, limit)
+
+
+@router.get("/{connection_id}/jobs/{job_id}", response_model=JobResponse)
+async def get_job(connection_id: str, job_id: str) -> JobResponse:
+    try:
+        return await _service.get(connection_id, job_id)
+    except AppError as exc:
+        return error_response(exc.status_code, exc.code, exc.message, exc.details)
+
+
+@router.get("/{connection_id}/jobs/{job_id}/results", response_model=JobResultPage)
+@compressed()
+async def get_job_results(
+    connection_id: str,
+    job_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=5000),
+) -> Response:
+    try:
+        page = await _service.results(connection_id, job_id, offset, limit)
+    except AppError as exc:
+        return error_response(exc.status_code, exc.code, exc.message, exc.details)
+    return model_response(page)
+
+
+@router.delete("/{connection_id}/jobs/{job_id}", response_model=JobResponse)
+async def cancel_job(connection_id: str, job_id: str) -> JobResponse:
+    try:
+        return await _service.cancel(connection_id, job_id)
+    except AppError as exc:
+        return error_response(exc.status_code, exc.code, exc.message, exc.details)
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 
 from ..models.metadata import MetadataRefreshResponse, MetadataResponse
 from ..services.adapter_registry import get_registry
 from ..services.connection_service import get_connection_service
 from ..services.metadata_service import MetadataService
 from ..utils.app_errors import AppError
+from .compression import compressed
 from .errors import error_response
+from .fast_json import model_response
 
 router = APIRouter()
 
@@ -17,17 +19,22 @@ _service = MetadataService(_registry, _connections)
 
 
 @router.get("/{connection_id}/metadata", response_model=MetadataResponse)
-async def get_metadata(connection_id: str) -> MetadataResponse:
+@compressed()
+async def get_metadata(connection_id: str) -> Response:
     try:
-        return await _service.get_snapshot(connection_id)
+        snapshot = await _service.get_snapshot(connection_id)
     except AppError as exc:
         return error_response(exc.status_code, exc.code, exc.message, exc.details)
+    # Snapshots are validated once when loaded and then served from the memory cache.
+    return model_response(snapshot)
 
 
-@router.post("/{connection_id}/metadata/refresh", response_model=MetadataRefreshResponse, status_code=202)
-async def refresh_metadata(connection_id: str) -> MetadataRefreshResponse:
+@router.post(
+    "/{connection_id}/metadata/refresh", response_model=MetadataRefreshResponse, status_code=202
+)
+async def refresh_metadata(connection_id: str, full: bool = False) -> MetadataRefreshResponse:
     try:
-        await _service.refresh_snapshot(connection_id)
+        await _service.refresh_snapshot(connection_id, full=full)
         return MetadataRefreshResponse(status="refreshing", message="Refresh complete")
     except AppError as exc:
         return error_response(exc.status_code, exc.code, exc.message, exc.details)
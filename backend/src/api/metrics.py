@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import time
+from typing import Iterator
+
+from fastapi import APIRouter, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..adapters.pool_manager import get_pool_manager
+from ..services.connection_service import get_connection_service
+from ..services.export_service import get_export_service
+from ..services.query_scheduler import get_query_scheduler
+from ..services.result_cache import get_result_cache
+from ..utils.metrics import MetricFamily, get_metrics
+from .compression import compressed
+
+PROMETHEUS_TEXT = "text/plain; version=0.0.4; charset=utf-8"
+
+_HTTP_SECONDS = get_metrics().histogram(
+    "dbquery_http_request_duration_seconds",
+    "Time from request start to the last response byte.",
+    ("route", "method", "status"),
+)
+_HTTP_BYTES = get_metrics().counter(
+    "dbquery_http_response_bytes_total",
+    "Response body bytes sent, after compression.",
+    ("route", "method"),
+)
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+@compressed()
+async def metrics() -> Response:
+    # Rendered on the event loop thread, where the metrics are updated, not in a worker.
+    return Response(content=get_metrics().render(), media_type=PROMETHEUS_TEXT)
+
+
+class MetricsMiddleware:
+    """Records latency and body size per route template, so ids in paths add no series."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def counting_send(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, counting_send)
+        finally:
+            route = _route_template(scope)
+            _HTTP_SECONDS.observe(time.perf_counter() - start, route, scope["method"], str(status))
+            _HTTP_BYTES.inc(route, scope["method"], amount=size)
+
+
+def _route_template(scope: Scope) -> str:
+    """Template of the matched route, such as ``/api/v1/connections/{connection_id}/pool``.
+
+    A route from an included router only knows its template relative to the router prefix,
+    so the prefix is recovered as the part of the request path before the segments that route
+    matched. Requests that matched no route share the ``unmatched`` series.
+    """
+    route = scope.get("route")
+    path_format: str | None = getattr(route, "path_format", None)
+    path_regex = getattr(route, "path_regex", None)
+    if path_format is None or path_regex is None:
+        return "unmatched"
+    path: str = scope["path"]
+    # Longest prefix first: with the default converters a path parameter never spans a "/".
+    ends = [len(path)] + [index for index, char in enumerate(path) if char == "/"][::-1]
+    for end in ends:
+        if path_regex.match(path[end:]):
+            return path[:end] + path_format
+    return path_format
+
+
+def _pool_families() -> Iterator[MetricFamily]:
+    checked_out = MetricFamily(
+        "dbquery_pool_checked_out_connections", "Connections checked out of the pool.", "gauge"
+    )
+    idle = MetricFamily("dbquery_pool_idle_connections", "Idle pooled connections.", "gauge")
+    waiting = MetricFamily(
+        "dbquery_pool_waiting_requests", "Callers waiting for a pooled connection.", "gauge"
+    )
+    active = MetricFamily(
+        "dbquery_scheduler_active_queries", "Queries holding a scheduler slot.", "gauge"
+    )
+    queued = MetricFamily(
+        "dbquery_scheduler_queued_queries", "Queries waiting for a scheduler slot.", "gauge"
+    )
+    pools = get_pool_manager()
+    scheduler = get_query_scheduler()
+    for record in get_connection_service().list_records():
+        stats = pools.stats(record.connection_url)
+        if stats is not None:
+            checked_out.add(stats.checked_out, connection_id=record.id)
+            idle.add(stats.idle, connection_id=record.id)
+            waiting.add(stats.waiting, connection_id=record.id)
+        gate = scheduler.stats(record.id, record.scheduler_limits())
+        active.add(gate.active, connection_id=record.id)
+        queued.add(gate.queued, connection_id=record.id)
+    yield from (checked_out, idle, waiting, active, queued)
+
+
+def _store_families() -> Iterator[MetricFamily]:
+    stats = get_export_service().stats()
+    yield MetricFamily(
+        "dbquery_result_store_entries", "Results held for export.", "gauge", [({}, stats.entries)]
+    )
+    yield MetricFamily(
+        "dbquery_result_store_bytes",
+        "Bytes of results held for export.",
+        "gauge",
+        [({}, stats.size_bytes)],
+    )
+    yield MetricFamily(
+        "dbquery_result_store_max_bytes",
+        "Byte budget of the export result store.",
+        "gauge",
+        [({}, stats.max_bytes)],
+    )
+    dropped = MetricFamily(
+        "dbquery_result_store_dropped_total", "Results dropped from the store.", "counter"
+    )
+    dropped.add(stats.evicted, reason="evicted")
+    dropped.add(stats.expired, reason="expired")
+    dropped.add(stats.rejected, reason="rejected")
+    yield dropped
+    cache = get_result_cache()
+    lookups = MetricFamily("dbquery_result_cache_lookups_total", "Result cache lookups.", "counter")
+    lookups.add(cache.hits, result="hit")
+    lookups.add(cache.misses, result="miss")
+    yield lookups
+    yield MetricFamily(
+        "dbquery_result_cache_evictions_total",
+        "Entries evicted from the result cache.",
+        "counter",
+        [({}, cache.evictions)],
+    )
+
+
+get_metrics().register_collector(_pool_families)
+get_metrics().register_collector(_store_families)
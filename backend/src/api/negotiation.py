@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+
+def weighted_values(header: str | None) -> list[tuple[str, float]]:
+    """Split an Accept-style header into lowercased values and q-values, in header order."""
+    if not header:
+        return []
+    values = []
+    for item in header.split(","):
+        value, _, params = item.strip().partition(";")
+        value = value.strip().lower()
+        if value:
+            values.append((value, _quality(params)))
+    return values
+
+
+def _quality(params: str) -> float:
+    for param in params.split(";"):
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return min(max(float(value), 0.0), 1.0)
+            except ValueError:
+                return 0.0
+    return 1.0
@@ -1,14 +1,40 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
+import time
+from typing import Any, AsyncIterator
 
-from ..models.query import QueryRequest, QueryResponse
+from fastapi import APIRouter, Header, Response
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from ..models.errors import ErrorDetail
+from ..models.query import (
+    QueryBatchRequest,
+    QueryBatchResponse,
+    QueryCancelResponse,
+    QueryQueueStatsResponse,
+    QueryRequest,
+    QueryResponse,
+)
 from ..services.adapter_registry import get_registry
 from ..services.connection_service import get_connection_service
 from ..services.export_service import get_export_service
-from ..services.query_service import QueryService
+from ..services.query_service import QueryService, QueryStream
 from ..utils.app_errors import AppError
+from ..utils.request_id import get_request_id
+from ..utils.timing import collect_timings, record_phase, server_timing, timed
+from .compression import compressed
 from .errors import error_response
+from .fast_json import dumps, json_response
+from .result_encoding import (
+    ARROW_STREAM,
+    COLUMNAR_JSON,
+    MSGPACK,
+    encode_result,
+    json_batch_rows,
+    negotiate_result_encoding,
+    query_payload,
+)
 
 router = APIRouter()
 
@@ -17,9 +43,155 @@ _connections = get_connection_service()
 _service = QueryService(_registry, _connections, get_export_service())
 
 
-@router.post("/{connection_id}/query", response_model=QueryResponse)
-async def execute_query(connection_id: str, request: QueryRequest) -> QueryResponse:
+@router.post(
+    "/{connection_id}/query",
+    response_model=QueryResponse,
+    responses={200: {"content": {COLUMNAR_JSON: {}, MSGPACK: {}, ARROW_STREAM: {}}}},
+)
+@compressed()
+async def execute_query(
+    connection_id: str, request: QueryRequest, accept: str | None = Header(None)
+) -> Response:
+    start = time.perf_counter()
+    with collect_timings() as timings:
+        try:
+            media_type = negotiate_result_encoding(accept)
+            # Clients that send X-Request-Id can cancel the query under that id while it runs.
+            result = await _service.execute_query(connection_id, request, get_request_id())
+        except AppError as exc:
+            return error_response(exc.status_code, exc.code, exc.message, exc.details)
+        if request.include_timings:
+            # The body cannot time its own serialization; the header has that too.
+            result.timings = {name: round(duration, 3) for name, duration in timings.items()}
+        with timed("serialize"):
+            # Rows come straight from the adapter, so the response model is not validated again.
+            response = encode_result(result, media_type)
+        record_phase("total", start)
+    response.headers["Server-Timing"] = server_timing(timings)
+    response.headers["Vary"] = "Accept"
+    response.headers["X-Cache"] = "hit" if result.cached else "miss"
+    return response
+
+
+@router.post("/{connection_id}/query/batch", response_model=QueryBatchResponse)
+@compressed()
+async def execute_batch(connection_id: str, request: QueryBatchRequest) -> Response:
+    start = time.perf_counter()
+    # Statements run concurrently, so each phase is their summed time and may exceed total.
+    with collect_timings() as timings:
+        try:
+            results = await _service.execute_batch(connection_id, request.queries)
+        except AppError as exc:
+            return error_response(exc.status_code, exc.code, exc.message, exc.details)
+        with timed("serialize"):
+            items = []
+            for result in results:
+                if isinstance(result, AppError):
+                    error = ErrorDetail(
+                        code=result.code, message=result.message, details=result.details or {}
+                    )
+                    items.append(
+                        {"status": result.status_code, "result": None, "error": error.to_dict()}
+                    )
+                else:
+                    items.append({"status": 200, "result": query_payload(result), "error": None})
+            duration_ms = int((time.perf_counter() - start) * 1000)
+            response = json_response({"items": items, "durationMs": duration_ms})
+        record_phase("total", start)
+    response.headers["Server-Timing"] = server_timing(timings)
+    return response
+
+
+@router.post("/{connection_id}/query/stream")
+@compressed()
+async def stream_query(connection_id: str, request: QueryRequest) -> StreamingResponse:
+    start = time.perf_counter()
+    # Headers go out before the first row, so the timing stops where streaming starts:
+    # the execution and fetch phases are not part of it.
+    with collect_timings() as timings:
+        try:
+            stream = await _service.stream_query(connection_id, request, get_request_id())
+        except AppError as exc:
+            return error_response(exc.status_code, exc.code, exc.message, exc.details)
+        record_phase("total", start)
+    response = _QueryStreamResponse(stream)
+    response.headers["Server-Timing"] = server_timing(timings)
+    return response
+
+
+@router.get("/{connection_id}/query/queue", response_model=QueryQueueStatsResponse)
+def get_queue_stats(connection_id: str) -> QueryQueueStatsResponse:
+    try:
+        return _service.queue_stats(connection_id)
+    except AppError as exc:
+        return error_response(exc.status_code, exc.code, exc.message, exc.details)
+
+
+@router.delete("/{connection_id}/query/{query_id}", response_model=QueryCancelResponse)
+async def cancel_query(connection_id: str, query_id: str) -> QueryCancelResponse:
     try:
-        return await _service.execute_query(connection_id, request)
+        return await _service.cancel_query(connection_id, query_id)
     except AppError as exc:
         return error_response(exc.status_code, exc.code, exc.message, exc.details)
+
+
+class _QueryStreamResponse(StreamingResponse):
+    """NDJSON response that closes its query stream however the response ends.
+
+    The body may never be iterated, e.g. when the client disconnects first, and the stream
+    holds a scheduler slot until it is closed.
+    """
+
+    def __init__(self, stream: QueryStream) -> None:
+        super().__init__(_ndjson_lines(stream), media_type="application/x-ndjson")
+        self._stream = stream
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self._stream.close()
+
+
+def _ndjson(payload: dict[str, Any]) -> bytes:
+    return dumps(payload) + b"\n"
+
+
+async def _ndjson_lines(stream: QueryStream) -> AsyncIterator[bytes]:
+    start = time.perf_counter()
+    row_count = 0
+    header_sent = False
+    try:
+        async for batch in stream.batches:
+            if not header_sent:
+                header_sent = True
+                yield _ndjson(
+                    {
+                        "type": "header",
+                        "requestId": stream.request_id,
+                        "limitApplied": stream.limit_applied,
+                        "columns": batch["columns"],
+                        "warnings": stream.warnings,
+                    }
+                )
+            if batch["rows"]:
+                row_count += len(batch["rows"])
+                rows = json_batch_rows(batch["columns"], batch["rows"])
+                yield _ndjson({"type": "rows", "rows": rows})
+    except AppError as exc:
+        detail = ErrorDetail(code=exc.code, message=exc.message, details=exc.details or {})
+        yield _ndjson({"type": "error", "error": detail.to_dict()})
+        return
+    except Exception as exc:  # noqa: BLE001
+        detail = ErrorDetail(
+            code="QUERY_FAILED", message="Query execution failed.", details={"error": str(exc)}
+        )
+        yield _ndjson({"type": "error", "error": detail.to_dict()})
+        return
+    yield _ndjson(
+        {
+            "type": "end",
+            "rowCount": row_count,
+            "durationMs": int((time.perf_counter() - start) * 1000),
+        }
+    )
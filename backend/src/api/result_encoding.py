@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Callable
+
+import msgpack
+from fastapi import Response
+from pydantic_core import to_jsonable_python
+
+from ..models.query import QueryResponse
+from ..services.arrow_results import arrow_stream_bytes
+from ..utils.app_errors import AppError
+from .fast_json import dumps
+from .negotiation import weighted_values
+
+JSON = "application/json"
+COLUMNAR_JSON = "application/vnd.dbquery.columnar+json"
+MSGPACK = "application/x-msgpack"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+# Media types recognised in Accept; among equal q-values the first one listed wins.
+_MEDIA_TYPES = {
+    JSON: JSON,
+    COLUMNAR_JSON: COLUMNAR_JSON,
+    MSGPACK: MSGPACK,
+    "application/msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+    ARROW_STREAM: ARROW_STREAM,
+}
+_WILDCARDS = {"*/*", "application/*"}
+
+
+def negotiate_result_encoding(accept: str | None) -> str:
+    """Pick the response media type for ``accept``; plain JSON when it is absent or ``*/*``."""
+    if not accept or not accept.strip():
+        return JSON
+    best: str | None = None
+    best_q = 0.0
+    for media_type, q in weighted_values(accept):
+        candidate = JSON if media_type in _WILDCARDS else _MEDIA_TYPES.get(media_type)
+        if candidate is not None and q > best_q:
+            best, best_q = candidate, q
+    if best is None:
+        raise AppError(
+            code="NOT_ACCEPTABLE",
+            message="None of the requested media types can be produced.",
+            status_code=406,
+            details={"supported": list(_MEDIA_TYPES)},
+        )
+    return best
+
+
+# Column types whose values orjson cannot encode natively, by their JSON form in pydantic.
+# Values of other columns that orjson does not know still reach its per-value fallback.
+_JSON_CONVERTERS: dict[str, Callable[[Any], Any]] = {
+    "numeric": str,
+    "decimal": str,
+    "interval": to_jsonable_python,
+}
+
+
+def _json_converters(column_types: list[str]) -> list[tuple[int, Callable[[Any], Any]]]:
+    return [
+        (index, _JSON_CONVERTERS[column_type])
+        for index, column_type in enumerate(column_types)
+        if column_type in _JSON_CONVERTERS
+    ]
+
+
+def _converted_rows(
+    rows: list[list[Any]], converters: list[tuple[int, Callable[[Any], Any]]]
+) -> list[list[Any]]:
+    if not converters:
+        return rows
+    # Rows are shared with the result cache, so converted values go into copies.
+    converted = []
+    for row in rows:
+        row = list(row)
+        for index, convert in converters:
+            if row[index] is not None:
+                row[index] = convert(row[index])
+        converted.append(row)
+    return converted
+
+
+def _json_rows(result: QueryResponse) -> list[list[Any]]:
+    column_types = [column.type for column in result.columns]
+    return _converted_rows(result.rows, _json_converters(column_types))
+
+
+def json_batch_rows(columns: list[dict[str, str]], rows: list[list[Any]]) -> list[list[Any]]:
+    """Rows of a streamed batch with values in the form the JSON /query response gives them."""
+    return _converted_rows(rows, _json_converters([column["type"] for column in columns]))
+
+
+def query_payload(result: QueryResponse) -> dict[str, Any]:
+    """``result`` as the JSON response dict, built without validating or walking the rows."""
+    payload = result.model_dump(by_alias=True, exclude={"rows"})
+    payload["rows"] = _json_rows(result)
+    return payload
+
+
+def query_json(result: QueryResponse) -> bytes:
+    """Encode ``result`` as the default JSON body without validating or walking the model."""
+    return dumps(query_payload(result))
+
+
+def columnar_payload(result: QueryResponse) -> dict[str, Any]:
+    """The response envelope with ``data`` holding one value array per column instead of rows."""
+    columns = [column.to_dict() for column in result.columns]
+    if result.rows:
+        data = [list(values) for values in zip(*result.rows, strict=True)]
+    else:
+        data = [[] for _ in columns]
+    return {
+        "columns": columns,
+        "data": data,
+        "rowCount": len(result.rows),
+        "durationMs": result.duration_ms,
+        "limitApplied": result.limit_applied,
+        "requestId": result.request_id,
+        "warnings": result.warnings,
+        "cached": result.cached,
+        "timings": result.timings,
+    }
+
+
+def encode_result(result: QueryResponse, media_type: str) -> Response:
+    """Render ``result`` as ``media_type`` without revalidating it.
+
+    Values without a native form in the target encoding (dates, decimals, ...) take the same
+    form as in the JSON response.
+    """
+    if media_type == JSON:
+        content = query_json(result)
+    elif media_type == ARROW_STREAM:
+        content = arrow_stream_bytes(
+            [column.to_dict() for column in result.columns],
+            result.rows,
+            {
+                "requestId": result.request_id,
+                "durationMs": str(result.duration_ms),
+                "limitApplied": str(result.limit_applied),
+                "warnings": json.dumps(result.warnings),
+                "cached": json.dumps(result.cached),
+                "timings": json.dumps(result.timings),
+            },
+        )
+    elif media_type == MSGPACK:
+        # Numbers, strings and bytes stay native; dates and decimals use their JSON form.
+        content = msgpack.packb(columnar_payload(result), default=to_jsonable_python)
+    else:
+        payload = columnar_payload(result)
+        column_types = [column.type for column in result.columns]
+        for index, convert in _json_converters(column_types):
+            payload["data"][index] = [
+                None if value is None else convert(value) for value in payload["data"][index]
+            ]
+        content = dumps(payload)
+    return Response(content=content, media_type=media_type)
@@ -8,6 +8,7 @@ from pydantic import Field
 from .base import AppBaseModel
 
 DbType = Literal["postgres", "mariadb"]
+CostGuardMode = Literal["off", "warn", "reject"]
 TestStatus = Literal["success", "failed", "unknown"]
 
 
@@ -15,12 +16,38 @@ class ConnectionCreate(AppBaseModel):
     name: str = Field(..., min_length=1, max_length=100)
     db_type: DbType
     connection_url: str = Field(..., min_length=1)
+    pool_size: int | None = Field(default=None, ge=1)
+    max_overflow: int | None = Field(default=None, ge=0)
+    pool_recycle_seconds: int | None = Field(default=None, ge=-1)
+    max_concurrent_queries: int | None = Field(default=None, ge=1)
+    max_queued_queries: int | None = Field(default=None, ge=0)
+    queue_timeout_seconds: int | None = Field(default=None, ge=1)
+    include_schemas: list[str] | None = None
+    exclude_schemas: list[str] | None = None
+    cost_guard: CostGuardMode | None = None
+    max_query_cost: float | None = Field(default=None, gt=0)
+    max_estimated_rows: int | None = Field(default=None, ge=1)
+    result_cache_ttl_seconds: int | None = Field(default=None, ge=0)
+    result_cache_invalidate: bool | None = None
 
 
 class ConnectionUpdate(AppBaseModel):
     name: str | None = Field(default=None, min_length=1, max_length=100)
     db_type: DbType | None = None
     connection_url: str | None = Field(default=None, min_length=1)
+    pool_size: int | None = Field(default=None, ge=1)
+    max_overflow: int | None = Field(default=None, ge=0)
+    pool_recycle_seconds: int | None = Field(default=None, ge=-1)
+    max_concurrent_queries: int | None = Field(default=None, ge=1)
+    max_queued_queries: int | None = Field(default=None, ge=0)
+    queue_timeout_seconds: int | None = Field(default=None, ge=1)
+    include_schemas: list[str] | None = None
+    exclude_schemas: list[str] | None = None
+    cost_guard: CostGuardMode | None = None
+    max_query_cost: float | None = Field(default=None, gt=0)
+    max_estimated_rows: int | None = Field(default=None, ge=1)
+    result_cache_ttl_seconds: int | None = Field(default=None, ge=0)
+    result_cache_invalidate: bool | None = None
 
 
 class ConnectionResponse(AppBaseModel):
@@ -30,6 +57,19 @@ class ConnectionResponse(AppBaseModel):
     created_at: datetime
     last_used_at: datetime | None = None
     last_test_status: TestStatus
+    pool_size: int | None = None
+    max_overflow: int | None = None
+    pool_recycle_seconds: int | None = None
+    max_concurrent_queries: int | None = None
+    max_queued_queries: int | None = None
+    queue_timeout_seconds: int | None = None
+    include_schemas: list[str] | None = None
+    exclude_schemas: list[str] | None = None
+    cost_guard: CostGuardMode | None = None
+    max_query_cost: float | None = Field(default=None, gt=0)
+    max_estimated_rows: int | None = Field(default=None, ge=1)
+    result_cache_ttl_seconds: int | None = Field(default=None, ge=0)
+    result_cache_invalidate: bool | None = None
 
 
 class ConnectionListResponse(AppBaseModel):
@@ -42,3 +82,21 @@ class ConnectionListResponse(AppBaseModel):
 class ConnectionTestResponse(AppBaseModel):
     status: Literal["success", "failed"]
     message: str | None = None
+
+
+class PoolStatsResponse(AppBaseModel):
+    connection_id: str
+    active: bool
+    pool_size: int
+    max_overflow: int
+    pool_recycle_seconds: int
+    checked_out: int = 0
+    idle: int = 0
+    overflow: int = 0
+    waiting: int = 0
+    seconds_since_use: float | None = None
+
+
+class PoolStatsListResponse(AppBaseModel):
+    items: list[PoolStatsResponse]
+    engine_count: int
@@ -13,3 +13,13 @@ class ExportRequest(AppBaseModel):
 class ExportResponse(AppBaseModel):
     export_id: str
     download_url: str
+
+
+class ExportStoreStatsResponse(AppBaseModel):
+    entries: int
+    size_bytes: int
+    max_bytes: int
+    ttl_seconds: int
+    evicted: int
+    expired: int
+    rejected: int
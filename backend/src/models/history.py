@@ -4,6 +4,8 @@ from datetime import datetime
 
 from pydantic import BaseModel, Field
 
+from .base import AppBaseModel
+
 
 class HistoryItem(BaseModel):
     id: str
@@ -21,3 +23,66 @@ class HistoryCreateRequest(BaseModel):
     connection_id: str
     connection_name: str
     sql_text: str
+
+
+class LatencySummary(AppBaseModel):
+    count: int
+    slow_count: int
+    error_count: int
+    p50_ms: int
+    p95_ms: int
+    p99_ms: int
+    max_ms: int
+
+
+class FingerprintLatency(LatencySummary):
+    fingerprint: str
+    # The most recent statement with this fingerprint.
+    sql_text: str
+    total_ms: int
+
+
+class HourlyLatency(LatencySummary):
+    hour: datetime
+
+
+class QueryLatencyStatsResponse(AppBaseModel):
+    connection_id: str
+    since: datetime
+    slow_threshold_ms: int
+    overall: LatencySummary
+    fingerprints: list[FingerprintLatency]
+    hours: list[HourlyLatency]
+
+
+class SlowQueryItem(AppBaseModel):
+    id: str
+    sql_text: str
+    fingerprint: str | None
+    started_at: datetime
+    duration_ms: int
+    row_count: int
+    status: str
+    error_message: str | None = None
+
+
+class SlowQueryListResponse(AppBaseModel):
+    items: list[SlowQueryItem] = Field(default_factory=list)
+
+
+class QueryFingerprintStats(AppBaseModel):
+    fingerprint: str
+    normalized_sql: str
+    calls: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    row_count: int
+    error_count: int
+    first_seen: datetime
+    last_seen: datetime
+
+
+class QueryFingerprintStatsResponse(AppBaseModel):
+    connection_id: str
+    items: list[QueryFingerprintStats] = Field(default_factory=list)
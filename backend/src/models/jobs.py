@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Literal
+
+from .base import AppBaseModel
+from .errors import ErrorDetail
+from .query import QueryColumn, QueryRequest
+
+JobPriority = Literal["interactive", "batch"]
+JobStatus = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+
+
+class JobSubmitRequest(QueryRequest):
+    priority: JobPriority = "interactive"
+
+
+class JobResponse(AppBaseModel):
+    id: str
+    connection_id: str
+    sql_text: str
+    priority: JobPriority
+    status: JobStatus
+    submitted_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    # Milliseconds spent running so far, or in total once finished.
+    elapsed_ms: int = 0
+    # Jobs of the same priority ahead of this one; only set while queued.
+    queue_position: int | None = None
+    row_count: int = 0
+    limit_applied: int | None = None
+    error: ErrorDetail | None = None
+
+
+class JobListResponse(AppBaseModel):
+    items: list[JobResponse]
+
+
+class JobResultPage(AppBaseModel):
+    job_id: str
+    columns: list[QueryColumn]
+    rows: list[list[Any]]
+    offset: int
+    limit: int
+    total_rows: int
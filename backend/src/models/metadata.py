@@ -20,6 +20,8 @@ class MetadataTable(AppBaseModel):
     name: str
     columns: list[MetadataColumn]
     comment: str | None = None
+    estimated_row_count: int | None = None
+    total_bytes: int | None = None
 
 
 class MetadataView(AppBaseModel):
@@ -5,12 +5,20 @@ from typing import Any
 from pydantic import Field
 
 from .base import AppBaseModel
+from .errors import ErrorDetail
+
+# Statements accepted in one /query/batch request.
+MAX_BATCH_QUERIES = 50
 
 
 class QueryRequest(AppBaseModel):
     sql_text: str = Field(..., min_length=1)
+    # Values for :name (an object) or $1 (a list) placeholders, bound by the driver.
+    params: dict[str, Any] | list[Any] | None = None
     timeout_seconds: int = Field(30, ge=1)
     max_rows: int = Field(1000, ge=1)
+    # Also return the Server-Timing phases in the response body.
+    include_timings: bool = False
 
 
 class QueryColumn(AppBaseModel):
@@ -24,3 +32,41 @@ class QueryResponse(AppBaseModel):
     duration_ms: int
     limit_applied: int
     request_id: str
+    warnings: list[str] = Field(default_factory=list)
+    cached: bool = False
+    # Milliseconds per phase, when the request asked for them.
+    timings: dict[str, float] | None = None
+
+
+class QueryBatchRequest(AppBaseModel):
+    queries: list[QueryRequest] = Field(..., min_length=1, max_length=MAX_BATCH_QUERIES)
+
+
+class QueryBatchItem(AppBaseModel):
+    # The HTTP status the statement would have had on its own.
+    status: int
+    result: QueryResponse | None = None
+    error: ErrorDetail | None = None
+
+
+class QueryBatchResponse(AppBaseModel):
+    items: list[QueryBatchItem]
+    duration_ms: int
+
+
+class QueryCancelResponse(AppBaseModel):
+    query_id: str
+    cancelled: bool
+
+
+class QueryQueueStatsResponse(AppBaseModel):
+    connection_id: str
+    max_concurrent: int
+    max_queued: int
+    active: int
+    queued: int
+    admitted: int
+    rejected: int
+    timed_out: int
+    avg_wait_ms: float
+    max_wait_ms: float
@@ -2,6 +2,23 @@ from __future__ import annotations
 
 import aiosqlite
 
+_JOB_COLUMNS = (
+    ("priority", "TEXT"),
+    ("submitted_at", "TEXT"),
+    ("finished_at", "TEXT"),
+    ("timeout_seconds", "INTEGER"),
+    ("max_rows", "INTEGER"),
+    ("limit_applied", "INTEGER"),
+    ("columns_json", "TEXT"),
+    ("result_path", "TEXT"),
+    ("error_code", "TEXT"),
+    ("heartbeat_at", "TEXT"),
+)
+_LOG_COLUMNS = (
+    ("fingerprint", "TEXT"),
+    ("slow", "INTEGER NOT NULL DEFAULT 0"),
+)
+
 
 async def create_history_tables(connection: aiosqlite.Connection) -> None:
     await connection.executescript(
@@ -28,6 +45,34 @@ async def create_history_tables(connection: aiosqlite.Connection) -> None:
             error_message TEXT,
             FOREIGN KEY(query_history_id) REFERENCES query_history(id) ON DELETE CASCADE
         );
+
+        CREATE TABLE IF NOT EXISTS query_stats (
+            connection_id TEXT NOT NULL,
+            fingerprint TEXT NOT NULL,
+            normalized_sql TEXT NOT NULL,
+            calls INTEGER NOT NULL,
+            total_ms REAL NOT NULL,
+            max_ms REAL NOT NULL,
+            row_count INTEGER NOT NULL,
+            error_count INTEGER NOT NULL,
+            first_seen TEXT NOT NULL,
+            last_seen TEXT NOT NULL,
+            PRIMARY KEY (connection_id, fingerprint)
+        );
         """
     )
+    # Columns added for query jobs and the execution log; older databases get them on first use.
+    cursor = await connection.execute("PRAGMA table_info(query_history)")
+    existing = {row[1] for row in await cursor.fetchall()}
+    for name, definition in _JOB_COLUMNS + _LOG_COLUMNS:
+        if name not in existing:
+            await connection.execute(f"ALTER TABLE query_history ADD COLUMN {name} {definition}")
+    await connection.execute(
+        "CREATE INDEX IF NOT EXISTS idx_query_history_jobs "
+        "ON query_history (connection_id, source, submitted_at)"
+    )
+    await connection.execute(
+        "CREATE INDEX IF NOT EXISTS idx_query_history_log "
+        "ON query_history (connection_id, source, started_at)"
+    )
     await connection.commit()
@@ -19,6 +19,14 @@ async def create_metadata_tables(connection: aiosqlite.Connection) -> None:
             payload_json TEXT
         );
 
+        CREATE TABLE IF NOT EXISTS metadata_fingerprints (
+            snapshot_id TEXT PRIMARY KEY,
+            schema_filter TEXT NOT NULL,
+            fingerprints_json TEXT NOT NULL,
+            estimates_json TEXT,
+            FOREIGN KEY(snapshot_id) REFERENCES metadata_snapshots(id) ON DELETE CASCADE
+        );
+
         CREATE TABLE IF NOT EXISTS schemas (
             id TEXT PRIMARY KEY,
             snapshot_id TEXT NOT NULL,
@@ -67,4 +75,8 @@ async def create_metadata_tables(connection: aiosqlite.Connection) -> None:
         );
         """
     )
+    # Row estimates were added later; older databases get the column on first use.
+    cursor = await connection.execute("PRAGMA table_info(metadata_fingerprints)")
+    if "estimates_json" not in {row[1] for row in await cursor.fetchall()}:
+        await connection.execute("ALTER TABLE metadata_fingerprints ADD COLUMN estimates_json TEXT")
     await connection.commit()
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import json
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Iterator
+
+import pyarrow as pa
+
+# Rows per record batch written to a result file.
+BATCH_ROWS = 8192
+
+_JSON_ENCODING = {b"encoding": b"json"}
+_DECIMAL_ENCODING = {b"encoding": b"decimal"}
+
+
+def _has_struct(data_type: pa.DataType) -> bool:
+    if pa.types.is_struct(data_type):
+        return True
+    return any(_has_struct(data_type.field(index).type) for index in range(data_type.num_fields))
+
+
+# Arrow types for reported database column types whose values inference would widen.
+# Values that do not fit (e.g. MariaDB unsigned columns) fall back to inference.
+_TYPE_HINTS = {
+    "int2": pa.int16(),
+    "int4": pa.int32(),
+    "float4": pa.float32(),
+    "tinyint": pa.int8(),
+    "smallint": pa.int16(),
+    "int": pa.int32(),
+    "float": pa.float32(),
+}
+
+
+def _column_array(
+    values: tuple[Any, ...], type_hint: pa.DataType | None = None
+) -> tuple[pa.Array, dict[bytes, bytes] | None]:
+    if type_hint is not None:
+        try:
+            return pa.array(values, type=type_hint), None
+        except (pa.ArrowException, OverflowError, TypeError, ValueError):
+            pass
+    # Mixed or unsupported values (e.g. int and text, ranges, huge ints) are kept as JSON text
+    # and decoded on read. So are JSON objects, which Arrow would widen to one struct with
+    # the union of their keys.
+    try:
+        array = pa.array(values)
+        if not _has_struct(array.type):
+            return array, None
+    except (pa.ArrowException, OverflowError, TypeError, ValueError):
+        pass
+    encoded = [None if value is None else json.dumps(value, default=str) for value in values]
+    return pa.array(encoded, type=pa.string()), _JSON_ENCODING
+
+
+def _result_column(values: tuple[Any, ...]) -> tuple[pa.Array, dict[bytes, bytes] | None]:
+    array, metadata = _column_array(values)
+    if pa.types.is_decimal(array.type) and not _has_scale(values, array.type.scale):
+        # Arrow pads decimals to a common scale, which would change their text in exports.
+        array = pa.array([None if value is None else str(value) for value in values])
+        metadata = _DECIMAL_ENCODING
+    return array, metadata
+
+
+def write_arrow_result(path: Path, column_count: int, rows: list[list[Any]]) -> int:
+    """Write ``rows`` column-major to an Arrow IPC file and return its size in bytes.
+
+    Fields are named by position, so duplicate column names in a result are preserved.
+    """
+    columns = list(zip(*rows, strict=True)) if rows else [()] * column_count
+    arrays, fields = [], []
+    for index, values in enumerate(columns):
+        array, metadata = _result_column(values)
+        arrays.append(array)
+        fields.append(pa.field(str(index), array.type, metadata=metadata))
+    table = pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+    with pa.ipc.new_file(str(path), table.schema) as writer:
+        writer.write_table(table, max_chunksize=BATCH_ROWS)
+    return path.stat().st_size
+
+
+class ArrowResultWriter:
+    """Writes a result file batch by batch as rows arrive, without holding the whole result.
+
+    Column types come from the first batch. When a later batch does not fit a column, e.g.
+    a column that was all NULL so far or decimals of another scale, the column is widened
+    and the batches already written are rewritten with it. The file appears at ``path`` on
+    ``close``; until then it is written next to it.
+    """
+
+    def __init__(self, path: Path, column_count: int) -> None:
+        self.path = path
+        self.row_count = 0
+        self._column_count = column_count
+        self._schema: pa.Schema | None = None
+        self._writer: pa.ipc.RecordBatchFileWriter | None = None
+        self._current = path.with_name(f"{path.name}.part")
+        self._rewrites = 0
+
+    def write(self, rows: list[list[Any]]) -> None:
+        if not rows:
+            return
+        columns = list(zip(*rows, strict=True))
+        if self._schema is None:
+            arrays, fields = [], []
+            for index, values in enumerate(columns):
+                array, metadata = _result_column(values)
+                arrays.append(array)
+                fields.append(pa.field(str(index), array.type, metadata=metadata))
+            self._open(pa.schema(fields))
+        else:
+            fitted = [
+                _fitted_array(values, field)
+                for values, field in zip(columns, self._schema, strict=True)
+            ]
+            misfits = [index for index, array in enumerate(fitted) if array is None]
+            if misfits:
+                self._widen({index: columns[index] for index in misfits})
+            arrays = [
+                array if array is not None else _fitted_array(values, self._schema.field(index))
+                for index, (array, values) in enumerate(zip(fitted, columns, strict=True))
+            ]
+        assert self._writer is not None and self._schema is not None
+        self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self._schema))
+        self.row_count += len(rows)
+
+    def close(self) -> int:
+        """Finish the file, move it to ``path`` and return its size in bytes."""
+        if self._writer is None:
+            self._open(
+                pa.schema([pa.field(str(index), pa.null()) for index in range(self._column_count)])
+            )
+        assert self._writer is not None
+        self._writer.close()
+        self._current.replace(self.path)
+        return self.path.stat().st_size
+
+    def discard(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._current.unlink(missing_ok=True)
+
+    def _open(self, schema: pa.Schema) -> None:
+        self._schema = schema
+        self._writer = pa.ipc.new_file(str(self._current), schema)
+
+    def _widen(self, misfits: dict[int, tuple[Any, ...]]) -> None:
+        assert self._writer is not None and self._schema is not None
+        previous, old_schema = self._current, self._schema
+        schema = old_schema
+        for index, values in misfits.items():
+            schema = schema.set(index, _wider_field(old_schema.field(index), values))
+        self._writer.close()
+        self._rewrites += 1
+        self._current = self.path.with_name(f"{self.path.name}.{self._rewrites}.part")
+        self._open(schema)
+        with pa.memory_map(str(previous)) as source:
+            reader = pa.ipc.open_file(source)
+            for batch_index in range(reader.num_record_batches):
+                batch = reader.get_batch(batch_index)
+                arrays = list(batch.columns)
+                for index in misfits:
+                    decoded = _decoded(batch.column(index), old_schema.field(index).metadata)
+                    arrays[index] = _fitted_array(tuple(decoded), schema.field(index))
+                self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+        previous.unlink()
+
+
+def arrow_stream_bytes(
+    columns: list[dict[str, str]], rows: list[list[Any]], metadata: dict[str, str]
+) -> bytes:
+    """Serialize a result as an Arrow IPC stream with its column names and source types.
+
+    Each field carries the database type under ``dbquery.type``; JSON-text fallback columns
+    also carry ``encoding=json``.
+    """
+    arrays, fields = [], []
+    values = list(zip(*rows, strict=True)) if rows else [()] * len(columns)
+    for column, column_values in zip(columns, values, strict=True):
+        array, field_metadata = _column_array(column_values, _TYPE_HINTS.get(column["type"]))
+        arrays.append(array)
+        field_metadata = {**(field_metadata or {}), b"dbquery.type": column["type"].encode()}
+        fields.append(pa.field(column["name"], array.type, metadata=field_metadata))
+    table = pa.Table.from_arrays(arrays, schema=pa.schema(fields, metadata=metadata))
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table, max_chunksize=BATCH_ROWS)
+    return sink.getvalue().to_pybytes()
+
+
+def read_arrow_batches(path: Path) -> Iterator[list[list[Any]]]:
+    """Yield the rows of a result file batch by batch from a memory map."""
+    with pa.memory_map(str(path)) as source:
+        reader = pa.ipc.open_file(source)
+        for index in range(reader.num_record_batches):
+            yield _batch_rows(reader.get_batch(index))
+
+
+def read_arrow_rows(path: Path, offset: int, limit: int) -> list[list[Any]]:
+    """Read rows ``offset`` to ``offset + limit`` of a result file from a memory map.
+
+    Only the record batches overlapping that range are decoded.
+    """
+    rows: list[list[Any]] = []
+    with pa.memory_map(str(path)) as source:
+        reader = pa.ipc.open_file(source)
+        start = 0
+        for index in range(reader.num_record_batches):
+            if len(rows) >= limit:
+                break
+            batch = reader.get_batch(index)
+            end = start + batch.num_rows
+            if end > offset:
+                rows.extend(_batch_rows(batch.slice(max(offset - start, 0), limit - len(rows))))
+            start = end
+    return rows
+
+
+def _batch_rows(batch: pa.RecordBatch) -> list[list[Any]]:
+    columns = [
+        _decoded(column, field.metadata)
+        for column, field in zip(batch.columns, batch.schema, strict=True)
+    ]
+    return [list(row) for row in zip(*columns, strict=True)] if columns else [[]] * batch.num_rows
+
+
+def _fitted_array(values: tuple[Any, ...], field: pa.Field) -> pa.Array | None:
+    """``values`` as an array of ``field``'s type and encoding, or None if they do not fit."""
+    if field.metadata == _JSON_ENCODING:
+        encoded = [None if value is None else json.dumps(value, default=str) for value in values]
+        return pa.array(encoded, type=pa.string())
+    if field.metadata == _DECIMAL_ENCODING:
+        if not all(value is None or isinstance(value, Decimal) for value in values):
+            return None
+        return pa.array([None if value is None else str(value) for value in values])
+    if pa.types.is_null(field.type):
+        return pa.nulls(len(values)) if all(value is None for value in values) else None
+    try:
+        array = pa.array(values, type=field.type)
+    except (pa.ArrowException, OverflowError, TypeError, ValueError):
+        return None
+    if pa.types.is_decimal(field.type) and not _has_scale(values, field.type.scale):
+        return None
+    return array
+
+
+def _wider_field(field: pa.Field, values: tuple[Any, ...]) -> pa.Field:
+    # A column that was all NULL takes the type of its first values; decimals of mixed
+    # scale become decimal text, and anything else becomes JSON text.
+    if pa.types.is_null(field.type):
+        array, metadata = _result_column(values)
+        return pa.field(field.name, array.type, metadata=metadata)
+    decimals = pa.types.is_decimal(field.type) or field.metadata == _DECIMAL_ENCODING
+    if decimals and all(value is None or isinstance(value, Decimal) for value in values):
+        return pa.field(field.name, pa.string(), metadata=_DECIMAL_ENCODING)
+    return pa.field(field.name, pa.string(), metadata=_JSON_ENCODING)
+
+
+def _has_scale(values: tuple[Any, ...], scale: int) -> bool:
+    return all(value is None or value.as_tuple().exponent == -scale for value in values)
+
+
+def _decoded(column: pa.Array, metadata: dict[bytes, bytes] | None) -> list[Any]:
+    values = column.to_pylist()
+    if metadata == _JSON_ENCODING:
+        return [None if value is None else json.loads(value) for value in values]
+    if metadata == _DECIMAL_ENCODING:
+        return [None if value is None else Decimal(value) for value in values]
+    return values
@@ -5,14 +5,27 @@ from datetime import datetime, timezone
 from typing import Dict
 from uuid import uuid4
 
+from ..adapters.pool_manager import (
+    EnginePoolManager,
+    PoolOptions,
+    default_pool_options,
+    get_pool_manager,
+)
+from ..adapters.schema_filter import SchemaFilter
 from ..models.connections import (
     ConnectionCreate,
     ConnectionResponse,
     ConnectionTestResponse,
     ConnectionUpdate,
+    CostGuardMode,
+    PoolStatsListResponse,
+    PoolStatsResponse,
 )
 from ..utils.app_errors import AppError
 from .adapter_registry import AdapterRegistry, get_registry
+from .cost_guard import CostGuardPolicy, default_cost_guard_policy
+from .query_scheduler import SchedulerLimits, default_scheduler_limits
+from .result_cache import ResultCachePolicy, default_result_cache_policy
 
 
 @dataclass
@@ -25,6 +38,19 @@ class ConnectionRecord:
     last_used_at: datetime | None
     last_test_status: str
     last_test_error: str | None
+    pool_size: int | None = None
+    max_overflow: int | None = None
+    pool_recycle_seconds: int | None = None
+    max_concurrent_queries: int | None = None
+    max_queued_queries: int | None = None
+    queue_timeout_seconds: int | None = None
+    include_schemas: list[str] | None = None
+    exclude_schemas: list[str] | None = None
+    cost_guard: CostGuardMode | None = None
+    max_query_cost: float | None = None
+    max_estimated_rows: int | None = None
+    result_cache_ttl_seconds: int | None = None
+    result_cache_invalidate: bool | None = None
 
     def to_response(self) -> ConnectionResponse:
         return ConnectionResponse(
@@ -34,12 +60,81 @@ class ConnectionRecord:
             created_at=self.created_at,
             last_used_at=self.last_used_at,
             last_test_status=self.last_test_status,
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_recycle_seconds=self.pool_recycle_seconds,
+            max_concurrent_queries=self.max_concurrent_queries,
+            max_queued_queries=self.max_queued_queries,
+            queue_timeout_seconds=self.queue_timeout_seconds,
+            include_schemas=self.include_schemas,
+            exclude_schemas=self.exclude_schemas,
+            cost_guard=self.cost_guard,
+            max_query_cost=self.max_query_cost,
+            max_estimated_rows=self.max_estimated_rows,
+            result_cache_ttl_seconds=self.result_cache_ttl_seconds,
+            result_cache_invalidate=self.result_cache_invalidate,
+        )
+
+    def schema_filter(self) -> SchemaFilter:
+        return SchemaFilter.from_lists(self.include_schemas, self.exclude_schemas)
+
+    def cost_guard_policy(self) -> CostGuardPolicy:
+        defaults = default_cost_guard_policy()
+        return CostGuardPolicy(
+            mode=self.cost_guard or defaults.mode,
+            max_cost=self.max_query_cost or defaults.max_cost,
+            max_estimated_rows=self.max_estimated_rows or defaults.max_estimated_rows,
+        )
+
+    def result_cache_policy(self) -> ResultCachePolicy:
+        defaults = default_result_cache_policy()
+        return ResultCachePolicy(
+            ttl_seconds=(
+                self.result_cache_ttl_seconds
+                if self.result_cache_ttl_seconds is not None
+                else defaults.ttl_seconds
+            ),
+            invalidate=(
+                self.result_cache_invalidate
+                if self.result_cache_invalidate is not None
+                else defaults.invalidate
+            ),
+        )
+
+    def scheduler_limits(self) -> SchedulerLimits:
+        defaults = default_scheduler_limits()
+        return SchedulerLimits(
+            max_concurrent=self.max_concurrent_queries or defaults.max_concurrent,
+            max_queued=(
+                self.max_queued_queries
+                if self.max_queued_queries is not None
+                else defaults.max_queued
+            ),
+            queue_timeout_seconds=self.queue_timeout_seconds or defaults.queue_timeout_seconds,
+        )
+
+    def pool_options(self, defaults: PoolOptions) -> PoolOptions | None:
+        overrides = (self.pool_size, self.max_overflow, self.pool_recycle_seconds)
+        if all(value is None for value in overrides):
+            return None
+        return PoolOptions(
+            pool_size=self.pool_size if self.pool_size is not None else defaults.pool_size,
+            max_overflow=(
+                self.max_overflow if self.max_overflow is not None else defaults.max_overflow
+            ),
+            pool_recycle_seconds=(
+                self.pool_recycle_seconds
+                if self.pool_recycle_seconds is not None
+                else defaults.pool_recycle_seconds
+            ),
+            pool_timeout_seconds=defaults.pool_timeout_seconds,
         )
 
 
 class ConnectionService:
-    def __init__(self, registry: AdapterRegistry) -> None:
+    def __init__(self, registry: AdapterRegistry, pools: EnginePoolManager | None = None) -> None:
         self._registry = registry
+        self._pools = pools or get_pool_manager()
         self._records: Dict[str, ConnectionRecord] = {}
 
     def clear(self) -> None:
@@ -48,7 +143,10 @@ class ConnectionService:
     def list_connections(self) -> list[ConnectionResponse]:
         return [record.to_response() for record in self._records.values()]
 
-    def create_connection(self, data: ConnectionCreate) -> ConnectionResponse:
+    def list_records(self) -> list[ConnectionRecord]:
+        return list(self._records.values())
+
+    async def create_connection(self, data: ConnectionCreate) -> ConnectionResponse:
         for record in self._records.values():
             if record.name == data.name:
                 raise AppError(code="CONNECTION_NAME_EXISTS", message="Connection name exists.")
@@ -62,16 +160,33 @@ class ConnectionService:
             last_used_at=None,
             last_test_status="unknown",
             last_test_error=None,
+            pool_size=data.pool_size,
+            max_overflow=data.max_overflow,
+            pool_recycle_seconds=data.pool_recycle_seconds,
+            max_concurrent_queries=data.max_concurrent_queries,
+            max_queued_queries=data.max_queued_queries,
+            queue_timeout_seconds=data.queue_timeout_seconds,
+            include_schemas=data.include_schemas,
+            exclude_schemas=data.exclude_schemas,
+            cost_guard=data.cost_guard,
+            max_query_cost=data.max_query_cost,
+            max_estimated_rows=data.max_estimated_rows,
+            result_cache_ttl_seconds=data.result_cache_ttl_seconds,
+            result_cache_invalidate=data.result_cache_invalidate,
         )
         self._records[connection_id] = record
+        await self._configure_pool(record)
         return record.to_response()
 
-    def delete_connection(self, connection_id: str) -> None:
+    async def delete_connection(self, connection_id: str) -> None:
         if connection_id not in self._records:
             raise AppError(code="NOT_FOUND", message="Connection not found.", status_code=404)
-        del self._records[connection_id]
+        record = self._records.pop(connection_id)
+        await self._release_pool(record.connection_url)
 
-    def update_connection(self, connection_id: str, data: ConnectionUpdate) -> ConnectionResponse:
+    async def update_connection(
+        self, connection_id: str, data: ConnectionUpdate
+    ) -> ConnectionResponse:
         record = self.get_record(connection_id)
         if data.name is not None and data.name != record.name:
             for other in self._records.values():
@@ -80,19 +195,92 @@ class ConnectionService:
             record.name = data.name
 
         reset_status = False
+        previous_url = record.connection_url
         if data.db_type is not None and data.db_type != record.db_type:
             record.db_type = data.db_type
             reset_status = True
         if data.connection_url is not None and data.connection_url != record.connection_url:
             record.connection_url = data.connection_url
             reset_status = True
+        if data.pool_size is not None:
+            record.pool_size = data.pool_size
+        if data.max_overflow is not None:
+            record.max_overflow = data.max_overflow
+        if data.pool_recycle_seconds is not None:
+            record.pool_recycle_seconds = data.pool_recycle_seconds
+        if data.max_concurrent_queries is not None:
+            record.max_concurrent_queries = data.max_concurrent_queries
+        if data.max_queued_queries is not None:
+            record.max_queued_queries = data.max_queued_queries
+        if data.queue_timeout_seconds is not None:
+            record.queue_timeout_seconds = data.queue_timeout_seconds
+        if data.include_schemas is not None:
+            record.include_schemas = data.include_schemas or None
+        if data.exclude_schemas is not None:
+            record.exclude_schemas = data.exclude_schemas or None
+        if data.cost_guard is not None:
+            record.cost_guard = data.cost_guard
+        if data.max_query_cost is not None:
+            record.max_query_cost = data.max_query_cost
+        if data.max_estimated_rows is not None:
+            record.max_estimated_rows = data.max_estimated_rows
+        if data.result_cache_ttl_seconds is not None:
+            record.result_cache_ttl_seconds = data.result_cache_ttl_seconds
+        if data.result_cache_invalidate is not None:
+            record.result_cache_invalidate = data.result_cache_invalidate
 
         if reset_status:
             record.last_test_status = "unknown"
             record.last_test_error = None
 
+        if previous_url != record.connection_url:
+            await self._release_pool(previous_url)
+        await self._configure_pool(record)
         return record.to_response()
 
+    def pool_stats(self, connection_id: str) -> PoolStatsResponse:
+        return self._pool_stats(self.get_record(connection_id))
+
+    def list_pool_stats(self) -> PoolStatsListResponse:
+        items = [self._pool_stats(record) for record in self._records.values()]
+        return PoolStatsListResponse(items=items, engine_count=self._pools.engine_count())
+
+    def _pool_stats(self, record: ConnectionRecord) -> PoolStatsResponse:
+        stats = self._pools.stats(record.connection_url)
+        if stats is None:
+            options = self._pools.options_for(record.connection_url)
+            return PoolStatsResponse(
+                connection_id=record.id,
+                active=False,
+                pool_size=options.pool_size,
+                max_overflow=options.max_overflow,
+                pool_recycle_seconds=options.pool_recycle_seconds,
+            )
+        return PoolStatsResponse(
+            connection_id=record.id,
+            active=True,
+            pool_size=stats.pool_size,
+            max_overflow=stats.max_overflow,
+            pool_recycle_seconds=stats.pool_recycle_seconds,
+            checked_out=stats.checked_out,
+            idle=stats.idle,
+            overflow=stats.overflow,
+            waiting=stats.waiting,
+            seconds_since_use=stats.seconds_since_use,
+        )
+
+    async def _configure_pool(self, record: ConnectionRecord) -> None:
+        options = record.pool_options(default_pool_options())
+        if self._pools.configure(record.connection_url, options):
+            await self._pools.dispose(record.connection_url)
+
+    async def _release_pool(self, connection_url: str) -> None:
+        # Engines are keyed by URL, so keep them while another connection still uses it.
+        if any(other.connection_url == connection_url for other in self._records.values()):
+            return
+        self._pools.configure(connection_url, None)
+        await self._pools.dispose(connection_url)
+
     def get_record(self, connection_id: str) -> ConnectionRecord:
         record = self._records.get(connection_id)
         if record is None:
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+from ..adapters.base import DatabaseAdapter, QueryPlanEstimate
+from ..utils.app_errors import AppError
+from ..utils.settings import get_settings
+
+
+@dataclass(frozen=True)
+class CostGuardPolicy:
+    mode: str
+    max_cost: float | None
+    max_estimated_rows: float | None
+
+    @property
+    def active(self) -> bool:
+        has_limit = self.max_cost is not None or self.max_estimated_rows is not None
+        return self.mode != "off" and has_limit
+
+
+def default_cost_guard_policy() -> CostGuardPolicy:
+    settings = get_settings()
+    return CostGuardPolicy(
+        mode=settings.query_cost_guard,
+        max_cost=settings.query_max_cost or None,
+        max_estimated_rows=settings.query_max_estimated_rows or None,
+    )
+
+
+class PlanCache:
+    """LRU of plan estimates keyed by connection URL and normalized SQL, with a TTL.
+
+    A parameterized statement gets one estimate, planned with the values it first ran with.
+    """
+
+    def __init__(self, max_entries: int | None = None, ttl_seconds: int | None = None) -> None:
+        settings = get_settings()
+        self._max_entries = max_entries or settings.query_plan_cache_size
+        self._ttl_seconds = ttl_seconds or settings.query_plan_cache_ttl_seconds
+        self._entries: OrderedDict[tuple[str, str], tuple[QueryPlanEstimate, float]] = (
+            OrderedDict()
+        )
+
+    def get(self, connection_url: str, sql: str) -> QueryPlanEstimate | None:
+        key = (connection_url, sql)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        estimate, stored_at = entry
+        if time.monotonic() - stored_at > self._ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return estimate
+
+    def put(self, connection_url: str, sql: str, estimate: QueryPlanEstimate) -> None:
+        self._entries[(connection_url, sql)] = (estimate, time.monotonic())
+        self._entries.move_to_end((connection_url, sql))
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CostGuard:
+    """Pre-flight EXPLAIN that warns about or rejects statements the planner expects to be
+    expensive."""
+
+    def __init__(self, cache: PlanCache | None = None) -> None:
+        self._cache = cache or PlanCache()
+
+    async def check(
+        self,
+        adapter: DatabaseAdapter,
+        connection_url: str,
+        sql: str,
+        policy: CostGuardPolicy,
+        timeout_seconds: int,
+        params: Sequence[Any] = (),
+    ) -> list[str]:
+        """Return warnings for the statement, or raise QUERY_TOO_EXPENSIVE in reject mode."""
+        if not policy.active or not adapter.capabilities.supports_explain:
+            return []
+        estimate = self._cache.get(connection_url, sql)
+        if estimate is None:
+            try:
+                estimate = await adapter.explain_query(connection_url, sql, timeout_seconds, params)
+            except Exception:  # noqa: BLE001
+                # Fail open: if the plan cannot be produced the statement reports its own error.
+                return []
+            if estimate is None:
+                return []
+            self._cache.put(connection_url, sql, estimate)
+
+        exceeded = _exceeded(estimate, policy)
+        if not exceeded:
+            return []
+        if policy.mode == "reject":
+            raise AppError(
+                code="QUERY_TOO_EXPENSIVE",
+                message="Query plan exceeds the cost limits for this connection.",
+                details={
+                    "exceeded": exceeded,
+                    "limits": {
+                        "maxCost": policy.max_cost,
+                        "maxEstimatedRows": policy.max_estimated_rows,
+                    },
+                    "plan": estimate.summary,
+                },
+            )
+        return [f"Query plan exceeds {limit}." for limit in exceeded]
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+def _exceeded(estimate: QueryPlanEstimate, policy: CostGuardPolicy) -> list[str]:
+    exceeded = []
+    if (
+        policy.max_cost is not None
+        and estimate.total_cost is not None
+        and estimate.total_cost > policy.max_cost
+    ):
+        exceeded.append(f"maxCost ({estimate.total_cost:g} > {policy.max_cost:g})")
+    if (
+        policy.max_estimated_rows is not None
+        and estimate.estimated_rows is not None
+        and estimate.estimated_rows > policy.max_estimated_rows
+    ):
+        exceeded.append(
+            f"maxEstimatedRows ({estimate.estimated_rows:g} > {policy.max_estimated_rows:g})"
+        )
+    return exceeded
+
+
+_guard = CostGuard()
+
+
+def get_cost_guard() -> CostGuard:
+    return _guard
@@ -2,65 +2,216 @@ from __future__ import annotations
 
 import csv
 import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager, suppress
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 from uuid import uuid4
 
 from ..utils.app_errors import AppError
+from ..utils.settings import get_settings
+from .arrow_results import read_arrow_batches, write_arrow_result
+
+# Ids of dropped results remembered so their export fails as expired rather than unknown.
+MAX_TOMBSTONES = 10_000
+# Upper bound between full scans for expired entries; the LRU head is checked on every store.
+SWEEP_INTERVAL_SECONDS = 60.0
 
 
 @dataclass
 class StoredResult:
     columns: list[dict[str, Any]]
-    rows: list[list[Any]]
+    # Arrow IPC file holding the rows; only this handle stays in memory.
+    path: Path
     created_at: datetime
+    size_bytes: int = 0
+    expires_at: float = float("inf")
+
+    def row_batches(self) -> Iterator[list[list[Any]]]:
+        return read_arrow_batches(self.path)
+
+
+@dataclass(frozen=True)
+class ResultStoreStats:
+    entries: int
+    size_bytes: int
+    max_bytes: int
+    ttl_seconds: int
+    evicted: int
+    expired: int
+    rejected: int
 
 
 class ExportService:
-    def __init__(self, export_dir: Path | None = None) -> None:
-        self._results: dict[str, StoredResult] = {}
+    def __init__(
+        self,
+        export_dir: Path | None = None,
+        max_bytes: int | None = None,
+        ttl_seconds: int | None = None,
+    ) -> None:
+        settings = get_settings()
+        self._max_bytes = max_bytes or settings.export_store_max_bytes
+        self._ttl_seconds = ttl_seconds or settings.export_store_ttl_seconds
+        self._results: OrderedDict[str, StoredResult] = OrderedDict()
+        self._tombstones: OrderedDict[str, str] = OrderedDict()
+        self._size_bytes = 0
+        self._counts = {"evicted": 0, "expired": 0, "rejected": 0}
+        self._next_sweep = 0.0
+        # Results are stored from worker threads and exported from the sync endpoint pool.
+        self._lock = threading.Lock()
         self._exports: dict[str, Path] = {}
         self._export_dir = export_dir or Path("./db_query/exports")
         self._export_dir.mkdir(parents=True, exist_ok=True)
+        self._results_dir = self._export_dir / "results"
+        self._results_dir.mkdir(exist_ok=True)
+        # Files left by a stopped process have no handle pointing at them any more. Other
+        # processes sharing the directory still serve theirs, but never past the TTL.
+        cutoff = time.time() - self._ttl_seconds
+        for stale in self._results_dir.glob("*.arrow"):
+            with suppress(FileNotFoundError):
+                if stale.stat().st_mtime < cutoff:
+                    stale.unlink()
 
     def store_result(self, request_id: str, columns: list[dict[str, Any]], rows: list[list[Any]]) -> None:
-        self._results[request_id] = StoredResult(columns=columns, rows=rows, created_at=datetime.now(timezone.utc))
+        """Spill a result to disk; blocking, so async callers run it in a worker thread."""
+        path = self._results_dir / f"{request_id}.arrow"
+        size_bytes = write_arrow_result(path, len(columns), rows)
+        with self._lock:
+            now = time.monotonic()
+            self._sweep(now)
+            if size_bytes > self._max_bytes:
+                path.unlink(missing_ok=True)
+                self._drop(request_id, "rejected")
+                return
+            self._results[request_id] = StoredResult(
+                columns=columns,
+                path=path,
+                created_at=datetime.now(timezone.utc),
+                size_bytes=size_bytes,
+                expires_at=now + self._ttl_seconds,
+            )
+            self._size_bytes += size_bytes
+            while self._size_bytes > self._max_bytes:
+                self._drop(next(iter(self._results)), "evicted")
+
+    def stats(self) -> ResultStoreStats:
+        with self._lock:
+            self._sweep(time.monotonic())
+            return ResultStoreStats(
+                entries=len(self._results),
+                size_bytes=self._size_bytes,
+                max_bytes=self._max_bytes,
+                ttl_seconds=self._ttl_seconds,
+                **self._counts,
+            )
+
+    def _get_result(self, query_id: str) -> StoredResult:
+        with self._lock:
+            result = self._results.get(query_id)
+            if result is not None and result.expires_at <= time.monotonic():
+                self._drop(query_id, "expired")
+                result = None
+            if result is not None:
+                self._results.move_to_end(query_id)
+                return result
+            reason = self._tombstones.get(query_id)
+        if reason is not None:
+            raise _expired(query_id, reason)
+        raise AppError(code="EXPORT_NOT_FOUND", message="Query result not found.", status_code=404)
+
+    def _sweep(self, now: float) -> None:
+        while self._results:
+            query_id, oldest = next(iter(self._results.items()))
+            if oldest.expires_at > now:
+                break
+            self._drop(query_id, "expired")
+        if now >= self._next_sweep:
+            # Exports move entries to the LRU tail, so expired ones can also sit further in.
+            expired = [key for key, result in self._results.items() if result.expires_at <= now]
+            for query_id in expired:
+                self._drop(query_id, "expired")
+            self._next_sweep = now + min(self._ttl_seconds, SWEEP_INTERVAL_SECONDS)
+
+    def _drop(self, query_id: str, reason: str) -> None:
+        result = self._results.pop(query_id, None)
+        if result is not None:
+            self._size_bytes -= result.size_bytes
+            result.path.unlink(missing_ok=True)
+        self._counts[reason] += 1
+        self._tombstones[query_id] = reason
+        self._tombstones.move_to_end(query_id)
+        while len(self._tombstones) > MAX_TOMBSTONES:
+            self._tombstones.popitem(last=False)
 
     def export_csv(self, query_id: str) -> tuple[str, Path]:
-        result = self._results.get(query_id)
-        if result is None:
-            raise AppError(code="EXPORT_NOT_FOUND", message="Query result not found.", status_code=404)
+        result = self._get_result(query_id)
 
         export_id = str(uuid4())
         file_path = self._export_dir / f"export_{export_id}.csv"
-        with file_path.open("w", newline="", encoding="utf-8") as file:
+        with _evicted_while_reading(query_id, file_path), file_path.open(
+            "w", newline="", encoding="utf-8"
+        ) as file:
             writer = csv.writer(file)
             writer.writerow([col["name"] for col in result.columns])
-            writer.writerows(result.rows)
+            for rows in result.row_batches():
+                writer.writerows(rows)
 
         self._exports[export_id] = file_path
         return export_id, file_path
 
     def export_json(self, query_id: str) -> tuple[str, Path]:
-        result = self._results.get(query_id)
-        if result is None:
-            raise AppError(code="EXPORT_NOT_FOUND", message="Query result not found.", status_code=404)
+        result = self._get_result(query_id)
 
         export_id = str(uuid4())
         file_path = self._export_dir / f"export_{export_id}.json"
         columns = [col["name"] for col in result.columns]
-        rows = [dict(zip(columns, row)) for row in result.rows]
-        with file_path.open("w", encoding="utf-8") as file:
-            json.dump(rows, file)
+        with _evicted_while_reading(query_id, file_path), file_path.open(
+            "w", encoding="utf-8"
+        ) as file:
+            file.write("[")
+            separator = ""
+            for rows in result.row_batches():
+                for row in rows:
+                    file.write(separator + json.dumps(dict(zip(columns, row, strict=True))))
+                    separator = ", "
+            file.write("]")
 
         self._exports[export_id] = file_path
         return export_id, file_path
 
     def reset(self) -> None:
-        self._results = {}
-        self._exports = {}
+        with self._lock:
+            for result in self._results.values():
+                result.path.unlink(missing_ok=True)
+            self._results = OrderedDict()
+            self._tombstones = OrderedDict()
+            self._size_bytes = 0
+            self._counts = {"evicted": 0, "expired": 0, "rejected": 0}
+            self._next_sweep = 0.0
+            self._exports = {}
+
+
+def _expired(query_id: str, reason: str) -> AppError:
+    return AppError(
+        code="EXPORT_EXPIRED",
+        message="Query result is no longer available; run the query again to export it.",
+        status_code=410,
+        details={"queryId": query_id, "reason": reason},
+    )
+
+
+@contextmanager
+def _evicted_while_reading(query_id: str, file_path: Path) -> Iterator[None]:
+    try:
+        yield
+    except FileNotFoundError as exc:
+        # The result was dropped between the lookup and the read.
+        file_path.unlink(missing_ok=True)
+        raise _expired(query_id, "evicted") from exc
 
 
 _export_service = ExportService()
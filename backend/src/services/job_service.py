@@ -0,0 +1,393 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator
+from uuid import uuid4
+
+import aiosqlite
+
+from ..models.errors import ErrorDetail
+from ..models.jobs import JobListResponse, JobResponse, JobResultPage, JobSubmitRequest
+from ..models.query import QueryColumn, QueryRequest
+from ..repositories.history_repo import create_history_tables
+from ..repositories.sqlite import get_sqlite_connection
+from ..utils.app_errors import AppError
+from ..utils.settings import get_settings
+from .arrow_results import ArrowResultWriter, read_arrow_rows
+from .query_service import QueryService, QueryStream
+
+# Jobs share query_history with other query records and are told apart by source.
+JOB_SOURCE = "job"
+# How long a cancel request waits for the job to wind down before answering.
+CANCEL_WAIT_SECONDS = 5.0
+# Processes refresh the heartbeat of the jobs they run this often. A queued or running job
+# whose heartbeat is older than the lease was left behind by a process that stopped.
+HEARTBEAT_SECONDS = 10.0
+LEASE_SECONDS = 60
+
+_ACTIVE_STATUSES = ("queued", "running")
+_COLUMNS = (
+    "id, connection_id, sql_text, priority, status, submitted_at, started_at, finished_at, "
+    "duration_ms, row_count, limit_applied, error_code, error_message, columns_json, result_path"
+)
+
+
+@dataclass
+class _Pool:
+    slots: asyncio.Semaphore
+    # Ids of jobs waiting for a slot, oldest first.
+    waiting: deque[str]
+
+
+class JobService:
+    """Runs queries in the background and keeps their state in ``query_history``.
+
+    Interactive and batch jobs have separate worker limits, so a backlog of batch jobs never
+    holds up interactive ones. Results are streamed into Arrow files and read back by page.
+    """
+
+    def __init__(
+        self,
+        query_service: QueryService,
+        result_dir: Path | None = None,
+        interactive_workers: int | None = None,
+        batch_workers: int | None = None,
+        result_ttl_seconds: int | None = None,
+    ) -> None:
+        settings = get_settings()
+        self._queries = query_service
+        self._result_dir = result_dir or Path("./db_query/jobs")
+        self._workers = {
+            "interactive": interactive_workers or settings.job_interactive_workers,
+            "batch": batch_workers or settings.job_batch_workers,
+        }
+        self._result_ttl_seconds = result_ttl_seconds or settings.job_result_ttl_seconds
+        self._pools: dict[str, _Pool] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._tasks: dict[str, asyncio.Task[None]] = {}
+        self._heartbeat: asyncio.Task[None] | None = None
+        self._next_recovery = 0.0
+        self._tables_ready = False
+
+    async def submit(self, connection_id: str, request: JobSubmitRequest) -> JobResponse:
+        # Bad SQL or an unknown connection is rejected now rather than as a failed job.
+        query = QueryRequest(
+            sql_text=request.sql_text,
+            params=request.params,
+            timeout_seconds=request.timeout_seconds,
+            max_rows=request.max_rows,
+        )
+        self._queries.validate(connection_id, query, job=True)
+        job_id = str(uuid4())
+        now = _now().isoformat()
+        async with self._connect() as conn:
+            await self._purge_expired(conn)
+            await conn.execute(
+                "INSERT INTO query_history (id, connection_id, sql_text, source, started_at, "
+                "duration_ms, row_count, status, priority, submitted_at, timeout_seconds, "
+                "max_rows, heartbeat_at) VALUES (?, ?, ?, ?, ?, 0, 0, 'queued', ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    connection_id,
+                    request.sql_text,
+                    JOB_SOURCE,
+                    now,
+                    request.priority,
+                    now,
+                    request.timeout_seconds,
+                    request.max_rows,
+                    now,
+                ),
+            )
+            await conn.commit()
+        pool = self._pool(request.priority)
+        pool.waiting.append(job_id)
+        self._tasks[job_id] = asyncio.create_task(self._run(job_id, connection_id, query, pool))
+        self._start_heartbeat()
+        return await self.get(connection_id, job_id)
+
+    async def get(self, connection_id: str, job_id: str) -> JobResponse:
+        return self._response(await self._row(connection_id, job_id))
+
+    async def list_jobs(self, connection_id: str, limit: int = 50) -> JobListResponse:
+        async with self._connect() as conn:
+            cursor = await conn.execute(
+                f"SELECT {_COLUMNS} FROM query_history WHERE connection_id = ? AND source = ? "
+                "ORDER BY submitted_at DESC LIMIT ?",
+                (connection_id, JOB_SOURCE, limit),
+            )
+            rows = await cursor.fetchall()
+        return JobListResponse(items=[self._response(row) for row in rows])
+
+    async def results(
+        self, connection_id: str, job_id: str, offset: int, limit: int
+    ) -> JobResultPage:
+        row = await self._row(connection_id, job_id)
+        if row["status"] != "succeeded":
+            raise AppError(
+                code="JOB_NOT_FINISHED",
+                message="Job has no results yet.",
+                status_code=409,
+                details={"jobId": job_id, "status": row["status"]},
+            )
+        expired = AppError(
+            code="JOB_RESULT_EXPIRED",
+            message="Job results are no longer available; submit the job again.",
+            status_code=410,
+            details={"jobId": job_id},
+        )
+        if row["result_path"] is None:
+            raise expired
+        try:
+            rows = await asyncio.to_thread(read_arrow_rows, Path(row["result_path"]), offset, limit)
+        except FileNotFoundError as exc:
+            raise expired from exc
+        return JobResultPage.model_construct(
+            job_id=job_id,
+            columns=[QueryColumn.model_construct(**col) for col in json.loads(row["columns_json"])],
+            rows=rows,
+            offset=offset,
+            limit=limit,
+            total_rows=row["row_count"],
+        )
+
+    async def cancel(self, connection_id: str, job_id: str) -> JobResponse:
+        row = await self._row(connection_id, job_id)
+        if row["status"] not in _ACTIVE_STATUSES:
+            raise AppError(
+                code="JOB_FINISHED",
+                message="Job has already finished.",
+                status_code=409,
+                details={"jobId": job_id, "status": row["status"]},
+            )
+        task = self._tasks.get(job_id)
+        if task is not None:
+            cancelled = False
+            if row["status"] == "running":
+                # Stop the statement on the server first so the pooled connection survives.
+                try:
+                    cancelled = (await self._queries.cancel_query(connection_id, job_id)).cancelled
+                except AppError:
+                    cancelled = False  # not registered yet, or the adapter cannot cancel
+            if not cancelled:
+                task.cancel()
+            await asyncio.wait({task}, timeout=CANCEL_WAIT_SECONDS)
+        return await self.get(connection_id, job_id)
+
+    async def _run(self, job_id: str, connection_id: str, query: QueryRequest, pool: _Pool) -> None:
+        start: float | None = None
+        try:
+            async with pool.slots:
+                pool.waiting.remove(job_id)
+                now = _now().isoformat()
+                await self._update(job_id, status="running", started_at=now, heartbeat_at=now)
+                start = time.perf_counter()
+                # Streamed straight into the result file: the rows are never held in memory,
+                # kept for export or cached.
+                stream = await self._queries.stream_job(connection_id, query, job_id)
+                try:
+                    columns, writer = await self._write_result(job_id, stream)
+                finally:
+                    await stream.close()
+                await self._update(
+                    job_id,
+                    status="succeeded",
+                    finished_at=_now().isoformat(),
+                    duration_ms=_elapsed_ms(start),
+                    row_count=writer.row_count,
+                    limit_applied=stream.limit_applied,
+                    columns_json=json.dumps(columns),
+                    result_path=writer.path.as_posix(),
+                )
+        except asyncio.CancelledError:
+            await self._fail(job_id, "cancelled", "JOB_CANCELLED", "Job was cancelled.", start)
+        except AppError as exc:
+            status = "cancelled" if exc.code == "QUERY_CANCELLED" else "failed"
+            await self._fail(job_id, status, exc.code, exc.message, start)
+        except Exception as exc:  # noqa: BLE001
+            await self._fail(job_id, "failed", "QUERY_FAILED", str(exc), start)
+        finally:
+            if job_id in pool.waiting:
+                pool.waiting.remove(job_id)
+            self._tasks.pop(job_id, None)
+
+    async def _write_result(
+        self, job_id: str, stream: QueryStream
+    ) -> tuple[list[dict[str, Any]], ArrowResultWriter]:
+        self._result_dir.mkdir(parents=True, exist_ok=True)
+        path = self._result_dir / f"{job_id}.arrow"
+        columns: list[dict[str, Any]] = []
+        writer: ArrowResultWriter | None = None
+        try:
+            async for batch in stream.batches:
+                if writer is None:
+                    columns = batch["columns"]
+                    writer = ArrowResultWriter(path, len(columns))
+                await asyncio.to_thread(writer.write, batch["rows"])
+            writer = writer or ArrowResultWriter(path, 0)
+            await asyncio.to_thread(writer.close)
+        except BaseException:
+            if writer is not None:
+                writer.discard()
+            raise
+        return columns, writer
+
+    async def _fail(
+        self, job_id: str, status: str, code: str, message: str, start: float | None
+    ) -> None:
+        await self._update(
+            job_id,
+            status=status,
+            finished_at=_now().isoformat(),
+            duration_ms=_elapsed_ms(start) if start is not None else 0,
+            error_code=code,
+            error_message=message,
+        )
+
+    def _pool(self, priority: str) -> _Pool:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Semaphores are bound to the loop they first wait on.
+            self._loop = loop
+            self._pools = {
+                name: _Pool(asyncio.Semaphore(workers), deque())
+                for name, workers in self._workers.items()
+            }
+        return self._pools[priority]
+
+    async def _row(self, connection_id: str, job_id: str) -> aiosqlite.Row:
+        async with self._connect() as conn:
+            cursor = await conn.execute(
+                f"SELECT {_COLUMNS} FROM query_history "
+                "WHERE id = ? AND connection_id = ? AND source = ?",
+                (job_id, connection_id, JOB_SOURCE),
+            )
+            row = await cursor.fetchone()
+        if row is None:
+            raise AppError(code="JOB_NOT_FOUND", message="Job not found.", status_code=404)
+        return row
+
+    async def _update(self, job_id: str, **fields: Any) -> None:
+        await self._update_where("id = ?", [job_id], **fields)
+
+    async def _update_where(self, condition: str, params: list[str], **fields: Any) -> None:
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        async with self._connect() as conn:
+            await conn.execute(
+                f"UPDATE query_history SET {assignments} WHERE {condition}",
+                (*fields.values(), *params),
+            )
+            await conn.commit()
+
+    def _start_heartbeat(self) -> None:
+        heartbeat = self._heartbeat
+        loop = asyncio.get_running_loop()
+        if heartbeat is None or heartbeat.done() or heartbeat.get_loop() is not loop:
+            self._heartbeat = asyncio.create_task(self._beat())
+
+    async def _beat(self) -> None:
+        while self._tasks:
+            await asyncio.sleep(HEARTBEAT_SECONDS)
+            job_ids = list(self._tasks)
+            if not job_ids:
+                continue
+            placeholders = ", ".join("?" for _ in job_ids)
+            try:
+                await self._update_where(
+                    f"id IN ({placeholders})", job_ids, heartbeat_at=_now().isoformat()
+                )
+            except aiosqlite.Error:
+                continue  # retried on the next beat, well within the lease
+
+    @asynccontextmanager
+    async def _connect(self) -> AsyncIterator[aiosqlite.Connection]:
+        async with get_sqlite_connection() as conn:
+            conn.row_factory = aiosqlite.Row
+            if not self._tables_ready:
+                await create_history_tables(conn)
+                self._tables_ready = True
+            await self._recover_abandoned(conn)
+            yield conn
+
+    async def _recover_abandoned(self, conn: aiosqlite.Connection) -> None:
+        # Only jobs whose owner stopped refreshing them are failed, so jobs run by other
+        # processes sharing the database are left alone.
+        now = time.monotonic()
+        if now < self._next_recovery:
+            return
+        self._next_recovery = now + HEARTBEAT_SECONDS
+        cutoff = (_now() - timedelta(seconds=LEASE_SECONDS)).isoformat()
+        await conn.execute(
+            "UPDATE query_history SET status = 'failed', error_code = 'JOB_INTERRUPTED', "
+            "error_message = 'The server stopped before the job finished.', finished_at = ? "
+            "WHERE source = ? AND status IN ('queued', 'running') "
+            "AND (heartbeat_at IS NULL OR heartbeat_at < ?)",
+            (_now().isoformat(), JOB_SOURCE, cutoff),
+        )
+        await conn.commit()
+
+    async def _purge_expired(self, conn: aiosqlite.Connection) -> None:
+        cutoff = (_now() - timedelta(seconds=self._result_ttl_seconds)).isoformat()
+        cursor = await conn.execute(
+            "SELECT id, result_path FROM query_history "
+            "WHERE source = ? AND result_path IS NOT NULL AND finished_at < ?",
+            (JOB_SOURCE, cutoff),
+        )
+        expired = await cursor.fetchall()
+        for _, result_path in expired:
+            Path(result_path).unlink(missing_ok=True)
+        await conn.executemany(
+            "UPDATE query_history SET result_path = NULL WHERE id = ?",
+            [(job_id,) for job_id, _ in expired],
+        )
+
+    def _response(self, row: aiosqlite.Row) -> JobResponse:
+        status = row["status"]
+        started_at = None if status == "queued" else _parse(row["started_at"])
+        elapsed_ms = row["duration_ms"]
+        if status == "running" and started_at is not None:
+            elapsed_ms = int((_now() - started_at).total_seconds() * 1000)
+        error = None
+        if row["error_code"] is not None:
+            error = ErrorDetail(code=row["error_code"], message=row["error_message"] or "")
+        return JobResponse(
+            id=row["id"],
+            connection_id=row["connection_id"],
+            sql_text=row["sql_text"],
+            priority=row["priority"],
+            status=status,
+            submitted_at=_parse(row["submitted_at"]),
+            started_at=started_at,
+            finished_at=_parse(row["finished_at"]) if row["finished_at"] else None,
+            elapsed_ms=elapsed_ms,
+            queue_position=self._queue_position(row["id"], row["priority"]),
+            row_count=row["row_count"],
+            limit_applied=row["limit_applied"],
+            error=error,
+        )
+
+    def _queue_position(self, job_id: str, priority: str) -> int | None:
+        pool = self._pools.get(priority)
+        if pool is None or job_id not in pool.waiting:
+            return None
+        return pool.waiting.index(job_id)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _parse(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+
+
+def _elapsed_ms(start: float) -> int:
+    return int((time.perf_counter() - start) * 1000)
@@ -23,6 +23,8 @@ def normalize_metadata(raw: dict[str, Any]) -> dict[str, Any]:
         table_item = {
             "name": table["name"],
             "comment": table.get("comment"),
+            "estimatedRowCount": _as_int(table.get("estimated_row_count")),
+            "totalBytes": _as_int(table.get("total_bytes")),
             "columns": [],
         }
         schema_name = table.get("schema")
@@ -69,3 +71,86 @@ def normalize_metadata(raw: dict[str, Any]) -> dict[str, Any]:
         "relationships": relationships,
     }
     return normalized
+
+
+def _as_int(value: Any) -> int | None:
+    # Drivers hand back Decimal/float for some size columns.
+    return int(value) if value is not None else None
+
+
+def apply_table_estimates(
+    snapshot: dict[str, Any], estimates: dict[str, tuple[int | None, int | None]]
+) -> None:
+    """Overwrite row estimates and sizes in a normalized snapshot, keyed by ``schema.name``."""
+    for schema in snapshot.get("schemas", []):
+        for table in schema.get("tables", []):
+            estimate = estimates.get(f"{schema['name']}.{table['name']}")
+            if estimate is not None:
+                table["estimatedRowCount"] = _as_int(estimate[0])
+                table["totalBytes"] = _as_int(estimate[1])
+
+
+def table_estimates(snapshot: dict[str, Any]) -> dict[str, list[int | None]]:
+    """Row estimates and sizes held in a normalized snapshot, keyed by ``schema.name``."""
+    return {
+        f"{schema['name']}.{table['name']}": [
+            table.get("estimatedRowCount"),
+            table.get("totalBytes"),
+        ]
+        for schema in snapshot.get("schemas", [])
+        for table in schema.get("tables", [])
+    }
+
+
+def normalize_estimates(
+    estimates: dict[str, tuple[int | None, int | None]],
+) -> dict[str, list[int | None]]:
+    """Adapter estimates in the JSON form :func:`table_estimates` returns, for comparison."""
+    return {key: [_as_int(rows), _as_int(size)] for key, (rows, size) in estimates.items()}
+
+
+def changed_relations(previous: dict[str, str], current: dict[str, str]) -> set[str]:
+    """Relations (``schema.name``) added, dropped or altered between two fingerprint maps."""
+    keys = previous.keys() | current.keys()
+    return {key for key in keys if previous.get(key) != current.get(key)}
+
+
+def patch_metadata(
+    previous: dict[str, Any], partial: dict[str, Any], relations: set[str]
+) -> dict[str, Any]:
+    """Replace ``relations`` in a normalized snapshot with their entries from ``partial``.
+
+    ``partial`` is the normalized result of fetching only those relations, so a relation
+    missing from it has been dropped. The schema list is taken from ``partial``.
+    """
+    previous_schemas = {schema["name"]: schema for schema in previous.get("schemas", [])}
+    schemas = []
+    for fresh in partial.get("schemas", []):
+        name = fresh["name"]
+        kept = previous_schemas.get(name, {})
+        schemas.append(
+            {
+                "name": name,
+                "tables": [
+                    table
+                    for table in kept.get("tables", [])
+                    if f"{name}.{table['name']}" not in relations
+                ]
+                + fresh.get("tables", []),
+                "views": [
+                    view
+                    for view in kept.get("views", [])
+                    if f"{name}.{view['name']}" not in relations
+                ]
+                + fresh.get("views", []),
+            }
+        )
+
+    relationships = [
+        relationship
+        for relationship in previous.get("relationships", [])
+        if relationship.get("sourceTable") not in relations
+        and relationship.get("targetTable") not in relations
+    ]
+    relationships.extend(partial.get("relationships", []))
+    return {"schemas": schemas, "relationships": relationships}
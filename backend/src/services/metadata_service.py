@@ -9,13 +9,28 @@ from ..models.metadata import MetadataResponse
 from ..repositories.metadata_repo import create_metadata_tables
 from ..repositories.sqlite import get_sqlite_connection
 from ..utils.app_errors import AppError
+from ..utils.metrics import get_metrics
 from ..utils.settings import get_settings
 from .adapter_registry import AdapterRegistry
 from .connection_service import ConnectionService
-from .metadata_normalizer import normalize_metadata
+from .metadata_normalizer import (
+    apply_table_estimates,
+    changed_relations,
+    normalize_estimates,
+    normalize_metadata,
+    patch_metadata,
+    table_estimates,
+)
 
 
-_memory_cache: dict[str, tuple[MetadataResponse, datetime]] = {}
+# Snapshot, when it was cached, and the schema filter it was built with.
+_memory_cache: dict[str, tuple[MetadataResponse, datetime, str]] = {}
+# Snapshot lookups by where they were answered: memory, sqlite, or a refresh on a miss.
+_LOOKUPS = get_metrics().counter(
+    "dbquery_metadata_cache_lookups_total",
+    "Metadata snapshot lookups by the cache layer that answered them.",
+    ("connection_id", "result"),
+)
 
 
 class MetadataService:
@@ -25,22 +40,31 @@ class MetadataService:
         self._settings = get_settings()
 
     async def get_snapshot(self, connection_id: str) -> MetadataResponse:
+        """Return the latest snapshot built with the connection's current schema filter."""
         now = datetime.now(timezone.utc)
+        filter_key = self._connections.get_record(connection_id).schema_filter().cache_key()
         cached = _memory_cache.get(connection_id)
         if cached:
-            cached_response, cached_at = cached
-            if (now - cached_at).total_seconds() <= self._settings.metadata_cache_ttl_seconds:
+            cached_response, cached_at, cached_filter = cached
+            if cached_filter != filter_key:
+                _memory_cache.pop(connection_id, None)
+            elif (now - cached_at).total_seconds() <= self._settings.metadata_cache_ttl_seconds:
+                _LOOKUPS.inc(connection_id, "memory_hit")
                 return cached_response
 
         try:
             async with get_sqlite_connection() as conn:
                 await create_metadata_tables(conn)
                 cursor = await conn.execute(
-                    "SELECT id, status, refreshed_at, payload_json FROM metadata_snapshots WHERE connection_id = ? ORDER BY refreshed_at DESC LIMIT 1",
+                    "SELECT s.id, s.status, s.refreshed_at, s.payload_json, f.schema_filter"
+                    " FROM metadata_snapshots AS s"
+                    " LEFT JOIN metadata_fingerprints AS f ON f.snapshot_id = s.id"
+                    " WHERE s.connection_id = ? ORDER BY s.refreshed_at DESC LIMIT 1",
                     (connection_id,),
                 )
                 row = await cursor.fetchone()
-                if row:
+                # A snapshot taken under another schema filter is a miss.
+                if row and row[4] == filter_key:
                     payload = json.loads(row[3]) if row[3] else {"schemas": [], "relationships": []}
                     refreshed_at = datetime.fromisoformat(row[2])
                     if refreshed_at.tzinfo is None:
@@ -52,7 +76,8 @@ class MetadataService:
                         schemas=payload.get("schemas", []),
                         relationships=payload.get("relationships", []),
                     )
-                    _memory_cache[connection_id] = (response, now)
+                    _memory_cache[connection_id] = (response, now, filter_key)
+                    _LOOKUPS.inc(connection_id, "sqlite_hit")
                     return response
         except Exception as exc:
             raise AppError(
@@ -62,16 +87,58 @@ class MetadataService:
                 details={"error": str(exc)},
             ) from exc
 
+        _LOOKUPS.inc(connection_id, "miss")
         return await self.refresh_snapshot(connection_id)
 
-    async def refresh_snapshot(self, connection_id: str) -> MetadataResponse:
+    async def refresh_snapshot(self, connection_id: str, full: bool = False) -> MetadataResponse:
+        """Refresh the snapshot, re-fetching only relations whose fingerprint changed.
+
+        A full fetch is done when ``full`` is set, when the adapter has no fingerprints, or
+        when there is no previous snapshot taken with the same schema filter.
+        """
         record = self._connections.get_record(connection_id)
         adapter = self._registry.get_adapter(record.db_type)
         if adapter is None:
             raise AppError(code="ADAPTER_NOT_FOUND", message="No adapter for db type.")
 
+        schema_filter = record.schema_filter()
+        filter_key = schema_filter.cache_key()
+        try:
+            fingerprints = await adapter.fetch_table_fingerprints(
+                record.connection_url, schema_filter
+            )
+        except Exception as exc:
+            raise AppError(
+                code="METADATA_FETCH_FAILED",
+                message="Failed to fetch metadata from database.",
+                status_code=500,
+                details={"error": str(exc)},
+            ) from exc
+
+        previous = None
+        if fingerprints is not None and not full:
+            try:
+                async with get_sqlite_connection() as conn:
+                    await create_metadata_tables(conn)
+                    previous = await self._load_fingerprints(conn, connection_id, filter_key)
+            except Exception as exc:
+                raise AppError(
+                    code="METADATA_CACHE_ERROR",
+                    message="Failed to read metadata cache.",
+                    status_code=500,
+                    details={"error": str(exc)},
+                ) from exc
+        changed: set[str] = set()
+        if previous is not None and fingerprints is not None:
+            changed = changed_relations(previous[1], fingerprints)
+
         try:
-            raw = await adapter.fetch_metadata(record.connection_url)
+            # Row estimates are not part of the fingerprints, so they are read on their own.
+            estimates = (
+                await adapter.fetch_table_estimates(record.connection_url, schema_filter)
+                if previous is not None
+                else None
+            )
         except Exception as exc:
             raise AppError(
                 code="METADATA_FETCH_FAILED",
@@ -79,24 +146,86 @@ class MetadataService:
                 status_code=500,
                 details={"error": str(exc)},
             ) from exc
-        normalized = normalize_metadata(raw)
+
+        fresh_estimates = normalize_estimates(estimates) if estimates is not None else None
         now = datetime.now(timezone.utc)
-        snapshot_id = str(uuid4())
+        if (
+            previous is not None
+            and not changed
+            and (fresh_estimates is None or fresh_estimates == previous[2])
+        ):
+            return await self._touch_snapshot(connection_id, previous[0], now)
+
+        partial = None
+        try:
+            if previous is None:
+                raw = await adapter.fetch_metadata(record.connection_url, schema_filter)
+                normalized = normalize_metadata(raw)
+            elif changed:
+                raw = await adapter.fetch_metadata(
+                    record.connection_url, schema_filter, relations=changed
+                )
+                partial = normalize_metadata(raw)
+        except Exception as exc:
+            raise AppError(
+                code="METADATA_FETCH_FAILED",
+                message="Failed to fetch metadata from database.",
+                status_code=500,
+                details={"error": str(exc)},
+            ) from exc
 
         try:
             async with get_sqlite_connection() as conn:
                 await create_metadata_tables(conn)
+                if previous is None:
+                    snapshot_id = str(uuid4())
+                    await conn.execute(
+                        "INSERT INTO metadata_snapshots"
+                        " (id, connection_id, refreshed_at, status, payload_json)"
+                        " VALUES (?, ?, ?, ?, ?)",
+                        (
+                            snapshot_id,
+                            connection_id,
+                            now.isoformat(),
+                            "ready",
+                            json.dumps(normalized),
+                        ),
+                    )
+                    await self._trim_snapshots(conn, connection_id)
+                else:
+                    # Patch the previous snapshot in place rather than writing a new one.
+                    snapshot_id = previous[0]
+                    cursor = await conn.execute(
+                        "SELECT payload_json FROM metadata_snapshots WHERE id = ?", (snapshot_id,)
+                    )
+                    row = await cursor.fetchone()
+                    base = json.loads(row[0]) if row and row[0] else {}
+                    normalized = base
+                    if partial is not None:
+                        normalized = patch_metadata(base, partial, changed)
+                    if estimates is not None:
+                        apply_table_estimates(normalized, estimates)
+                    await conn.execute(
+                        "UPDATE metadata_snapshots SET refreshed_at = ?, payload_json = ?"
+                        " WHERE id = ?",
+                        (now.isoformat(), json.dumps(normalized), snapshot_id),
+                    )
+                # Written even without fingerprints, to record the snapshot's schema filter.
+                # The estimates are kept beside them so an unchanged refresh skips this write.
+                stored_estimates = (
+                    fresh_estimates if fresh_estimates is not None else table_estimates(normalized)
+                )
                 await conn.execute(
-                    "INSERT INTO metadata_snapshots (id, connection_id, refreshed_at, status, payload_json) VALUES (?, ?, ?, ?, ?)",
+                    "INSERT OR REPLACE INTO metadata_fingerprints"
+                    " (snapshot_id, schema_filter, fingerprints_json, estimates_json)"
+                    " VALUES (?, ?, ?, ?)",
                     (
                         snapshot_id,
-                        connection_id,
-                        now.isoformat(),
-                        "ready",
-                        json.dumps(normalized),
+                        filter_key,
+                        json.dumps(fingerprints),
+                        json.dumps(stored_estimates),
                     ),
                 )
-                await self._trim_snapshots(conn, connection_id)
                 await conn.commit()
         except Exception as exc:
             raise AppError(
@@ -113,9 +242,54 @@ class MetadataService:
             schemas=normalized.get("schemas", []),
             relationships=normalized.get("relationships", []),
         )
-        _memory_cache[connection_id] = (response, now)
+        _memory_cache[connection_id] = (response, now, filter_key)
         return response
 
+    async def _load_fingerprints(
+        self, conn: Any, connection_id: str, filter_key: str
+    ) -> tuple[str, dict[str, str], dict[str, list[int | None]] | None] | None:
+        cursor = await conn.execute(
+            "SELECT s.id, s.status, f.schema_filter, f.fingerprints_json, f.estimates_json"
+            " FROM metadata_snapshots AS s"
+            " LEFT JOIN metadata_fingerprints AS f ON f.snapshot_id = s.id"
+            " WHERE s.connection_id = ? ORDER BY s.refreshed_at DESC LIMIT 1",
+            (connection_id,),
+        )
+        row = await cursor.fetchone()
+        if row is None or row[1] != "ready" or row[2] != filter_key or row[3] is None:
+            return None
+        fingerprints = json.loads(row[3])
+        if fingerprints is None:
+            return None
+        return row[0], fingerprints, json.loads(row[4]) if row[4] else None
+
+    async def _touch_snapshot(
+        self, connection_id: str, snapshot_id: str, now: datetime
+    ) -> MetadataResponse:
+        try:
+            async with get_sqlite_connection() as conn:
+                await conn.execute(
+                    "UPDATE metadata_snapshots SET refreshed_at = ? WHERE id = ?",
+                    (now.isoformat(), snapshot_id),
+                )
+                await conn.commit()
+        except Exception as exc:
+            raise AppError(
+                code="METADATA_CACHE_ERROR",
+                message="Failed to write metadata cache.",
+                status_code=500,
+                details={"error": str(exc)},
+            ) from exc
+
+        cached = _memory_cache.get(connection_id)
+        if cached and cached[0].snapshot_id == snapshot_id:
+            response = cached[0].model_copy(update={"refreshed_at": now})
+            _memory_cache[connection_id] = (response, now, cached[2])
+            return response
+        # Nothing changed, but the caller still needs the snapshot body.
+        _memory_cache.pop(connection_id, None)
+        return await self.get_snapshot(connection_id)
+
     async def _trim_snapshots(self, conn: Any, connection_id: str) -> None:
         max_snapshots = self._settings.metadata_cache_max_snapshots
         if max_snapshots < 1:
@@ -135,3 +309,7 @@ class MetadataService:
             f"DELETE FROM metadata_snapshots WHERE id IN ({placeholders})",
             ids_to_delete,
         )
+        await conn.execute(
+            f"DELETE FROM metadata_fingerprints WHERE snapshot_id IN ({placeholders})",
+            ids_to_delete,
+        )
@@ -1,12 +1,21 @@
 from __future__ import annotations
 
+import time
+
 from openai import AsyncOpenAI
 
 from ..utils.logging import get_logger
+from ..utils.metrics import get_metrics
 from ..utils.settings import get_settings
 
 
 _logger = get_logger(__name__)
+_LLM_SECONDS = get_metrics().histogram(
+    "dbquery_llm_request_duration_seconds",
+    "Latency of chat completion calls to the SQL generation model.",
+    ("model", "outcome"),
+    buckets=(0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0),
+)
 
 
 class ModelScopeClient:
@@ -27,14 +36,20 @@ class ModelScopeClient:
         self._client = AsyncOpenAI(base_url=base_url, api_key=api_key)
 
     async def generate_sql(self, prompt: str) -> str:
-        response = await self._client.chat.completions.create(
-            model=self._model_name,
-            messages=[
-                {"role": "system", "content": "You generate SQL only."},
-                {"role": "user", "content": prompt},
-            ],
-            stream=False,
-        )
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            response = await self._client.chat.completions.create(
+                model=self._model_name,
+                messages=[
+                    {"role": "system", "content": "You generate SQL only."},
+                    {"role": "user", "content": prompt},
+                ],
+                stream=False,
+            )
+            outcome = "ok"
+        finally:
+            _LLM_SECONDS.observe(time.perf_counter() - start, self._model_name, outcome)
         choices = response.choices or []
         if not choices:
             return ""
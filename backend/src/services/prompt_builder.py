@@ -5,12 +5,25 @@ from typing import Iterable
 from ..models.metadata import MetadataRelationship, MetadataSchema
 
 
+def _format_row_count(count: int) -> str:
+    for threshold, suffix in ((1_000_000_000, "B"), (1_000_000, "M"), (1_000, "K")):
+        if count >= threshold:
+            return f"{count / threshold:.1f}".rstrip("0").rstrip(".") + suffix
+    return str(count)
+
+
 def _format_tables(schemas: Iterable[MetadataSchema], max_entries: int | None = None) -> list[str]:
     entries: list[str] = []
     for schema in schemas:
         for table in schema.tables:
             cols = ", ".join(col.name for col in table.columns)
-            entries.append(f"{schema.name}.{table.name} ({cols})")
+            # Row estimates steer the model towards selective filters on large tables.
+            size = (
+                f" [~{_format_row_count(table.estimated_row_count)} rows]"
+                if table.estimated_row_count is not None
+                else ""
+            )
+            entries.append(f"{schema.name}.{table.name}{size} ({cols})")
         for view in schema.views:
             cols = ", ".join(col.name for col in view.columns)
             entries.append(f"{schema.name}.{view.name} [view] ({cols})")
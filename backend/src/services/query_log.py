@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import asyncio
+import math
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from sqlite3 import Row
+from typing import AsyncIterator, Sequence
+from uuid import uuid4
+
+import aiosqlite
+
+from ..models.history import (
+    FingerprintLatency,
+    HourlyLatency,
+    LatencySummary,
+    QueryLatencyStatsResponse,
+    SlowQueryItem,
+    SlowQueryListResponse,
+)
+from ..repositories.history_repo import create_history_tables
+from ..repositories.sqlite import get_sqlite_connection
+from ..utils.logging import get_logger
+from ..utils.settings import get_settings
+
+# Executions share query_history with jobs and are told apart by source.
+QUERY_SOURCE = "query"
+
+_logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class QueryLogEntry:
+    connection_id: str
+    sql_text: str
+    fingerprint: str
+    started_at: datetime
+    duration_ms: int
+    row_count: int
+    status: str
+    error_message: str | None = None
+
+
+class QueryLog:
+    """Write-behind log of query executions in ``query_history``.
+
+    ``record`` only appends to an in-memory batch. Batches are written in one transaction,
+    ``flush_ms`` after the first pending entry or as soon as ``batch_size`` are pending. When
+    SQLite falls behind by ``max_pending`` entries, new ones are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        slow_ms: int | None = None,
+        flush_ms: int | None = None,
+        batch_size: int | None = None,
+        max_pending: int | None = None,
+    ) -> None:
+        settings = get_settings()
+        self.slow_ms = slow_ms or settings.query_slow_ms
+        self._flush_seconds = (flush_ms or settings.query_log_flush_ms) / 1000
+        self._batch_size = batch_size or settings.query_log_batch_size
+        self._max_pending = max_pending or settings.query_log_max_pending
+        self._pending: list[tuple[object, ...]] = []
+        self._timer: asyncio.Task[None] | None = None
+        self._writes: set[asyncio.Task[None]] = set()
+        self._tables_ready = False
+        self.dropped = 0
+
+    def record(self, entry: QueryLogEntry) -> None:
+        if len(self._pending) >= self._max_pending:
+            self.dropped += 1
+            return
+        self._pending.append(
+            (
+                str(uuid4()),
+                entry.connection_id,
+                entry.sql_text,
+                QUERY_SOURCE,
+                entry.started_at.isoformat(),
+                entry.duration_ms,
+                entry.row_count,
+                entry.status,
+                entry.error_message,
+                entry.fingerprint,
+                int(entry.duration_ms >= self.slow_ms),
+            )
+        )
+        loop = asyncio.get_running_loop()
+        if len(self._pending) >= self._batch_size:
+            task = loop.create_task(self.flush())
+            self._writes.add(task)
+            task.add_done_callback(self._writes.discard)
+        elif self._timer is None or self._timer.done() or self._timer.get_loop() is not loop:
+            # A timer left on a finished loop never fires, so it is replaced too.
+            self._timer = loop.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self._flush_seconds)
+        await self.flush()
+
+    async def flush(self) -> None:
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        try:
+            async with self._connect() as conn:
+                await conn.executemany(
+                    "INSERT INTO query_history (id, connection_id, sql_text, source, started_at, "
+                    "duration_ms, row_count, status, error_message, fingerprint, slow) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    batch,
+                )
+                await conn.commit()
+        except Exception:  # noqa: BLE001
+            # The log is diagnostic; losing a batch must not fail the queries it describes.
+            self.dropped += len(batch)
+            _logger.exception("Failed to write %d query log entries", len(batch))
+
+    async def close(self) -> None:
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+        await self.flush()
+
+    @asynccontextmanager
+    async def _connect(self) -> AsyncIterator[aiosqlite.Connection]:
+        async with get_sqlite_connection() as conn:
+            if not self._tables_ready:
+                await create_history_tables(conn)
+                self._tables_ready = True
+            yield conn
+
+    async def slow_queries(self, connection_id: str, limit: int) -> SlowQueryListResponse:
+        await self.flush()
+        async with self._connect() as conn:
+            cursor = await conn.execute(
+                "SELECT id, sql_text, fingerprint, started_at, duration_ms, row_count, status, "
+                "error_message FROM query_history "
+                "WHERE connection_id = ? AND source = ? AND slow = 1 "
+                "ORDER BY started_at DESC LIMIT ?",
+                (connection_id, QUERY_SOURCE, limit),
+            )
+            rows = await cursor.fetchall()
+        return SlowQueryListResponse(
+            items=[
+                SlowQueryItem(
+                    id=row[0],
+                    sql_text=row[1],
+                    fingerprint=row[2],
+                    started_at=datetime.fromisoformat(row[3]),
+                    duration_ms=row[4],
+                    row_count=row[5],
+                    status=row[6],
+                    error_message=row[7],
+                )
+                for row in rows
+            ]
+        )
+
+    async def latency_stats(
+        self, connection_id: str, hours: int, top: int
+    ) -> QueryLatencyStatsResponse:
+        """p50/p95/p99 over the last ``hours``, overall, per fingerprint and per hour."""
+        await self.flush()
+        since = datetime.now(timezone.utc) - timedelta(hours=hours)
+        async with self._connect() as conn:
+            cursor = await conn.execute(
+                "SELECT fingerprint, sql_text, started_at, duration_ms, status, slow "
+                "FROM query_history WHERE connection_id = ? AND source = ? AND started_at >= ? "
+                "ORDER BY started_at",
+                (connection_id, QUERY_SOURCE, since.isoformat()),
+            )
+            rows = list(await cursor.fetchall())
+
+        by_fingerprint: dict[str, list[Row]] = defaultdict(list)
+        by_hour: dict[str, list[Row]] = defaultdict(list)
+        for row in rows:
+            by_fingerprint[row[0] or ""].append(row)
+            by_hour[row[2][:13]].append(row)
+
+        fingerprints = [
+            FingerprintLatency(
+                fingerprint=fingerprint,
+                sql_text=group[-1][1],
+                total_ms=sum(row[3] for row in group),
+                **_summary(group),
+            )
+            for fingerprint, group in by_fingerprint.items()
+        ]
+        fingerprints.sort(key=lambda item: item.total_ms, reverse=True)
+        return QueryLatencyStatsResponse(
+            connection_id=connection_id,
+            since=since,
+            slow_threshold_ms=self.slow_ms,
+            overall=LatencySummary(**_summary(rows)),
+            fingerprints=fingerprints[:top],
+            hours=[
+                HourlyLatency(hour=datetime.fromisoformat(f"{hour}:00:00+00:00"), **_summary(group))
+                for hour, group in by_hour.items()
+            ],
+        )
+
+
+def _summary(rows: Sequence[Row]) -> dict[str, int]:
+    durations = sorted(row[3] for row in rows)
+    return {
+        "count": len(durations),
+        "slow_count": sum(row[5] for row in rows),
+        "error_count": sum(1 for row in rows if row[4] != "succeeded"),
+        "p50_ms": _percentile(durations, 50),
+        "p95_ms": _percentile(durations, 95),
+        "p99_ms": _percentile(durations, 99),
+        "max_ms": durations[-1] if durations else 0,
+    }
+
+
+def _percentile(durations: list[int], percent: int) -> int:
+    # Nearest rank: a duration that was actually observed.
+    if not durations:
+        return 0
+    return durations[max(0, math.ceil(percent / 100 * len(durations)) - 1)]
+
+
+_query_log = QueryLog()
+
+
+def get_query_log() -> QueryLog:
+    return _query_log
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from ..utils.app_errors import AppError
+from ..utils.settings import get_settings
+
+
+@dataclass(frozen=True)
+class SchedulerLimits:
+    max_concurrent: int
+    max_queued: int
+    queue_timeout_seconds: float
+
+
+@dataclass(frozen=True)
+class GateStats:
+    max_concurrent: int
+    max_queued: int
+    active: int
+    queued: int
+    admitted: int
+    rejected: int
+    timed_out: int
+    avg_wait_ms: float
+    max_wait_ms: float
+
+
+def default_scheduler_limits() -> SchedulerLimits:
+    settings = get_settings()
+    return SchedulerLimits(
+        max_concurrent=settings.query_max_concurrent,
+        max_queued=settings.query_max_queued,
+        queue_timeout_seconds=settings.query_queue_timeout_seconds,
+    )
+
+
+class _ConnectionGate:
+    def __init__(self, limits: SchedulerLimits) -> None:
+        self.limits = limits
+        self.active = 0
+        self.waiters: deque[asyncio.Future[None]] = deque()
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.waited = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        # Smoothed time a slot is held, used for the retry hint.
+        self.avg_hold_seconds = 0.0
+
+    def retry_after_seconds(self) -> int:
+        hold = self.avg_hold_seconds or 1.0
+        backlog = len(self.waiters) + 1
+        return max(1, math.ceil(hold * backlog / self.limits.max_concurrent))
+
+    def record_wait(self, seconds: float) -> None:
+        self.waited += 1
+        self.total_wait_seconds += seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def record_hold(self, seconds: float) -> None:
+        if self.avg_hold_seconds == 0.0:
+            self.avg_hold_seconds = seconds
+        else:
+            self.avg_hold_seconds = 0.8 * self.avg_hold_seconds + 0.2 * seconds
+
+    def release(self) -> None:
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                # Hand the slot straight to the next waiter; ``active`` is unchanged.
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+
+class HeldSlot:
+    """A slot taken by ``QueryScheduler.hold``; ``release`` may be called more than once."""
+
+    def __init__(self, scheduler: QueryScheduler, connection_id: str) -> None:
+        self._scheduler = scheduler
+        self._connection_id = connection_id
+        self._start = time.perf_counter()
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._scheduler.release(self._connection_id, time.perf_counter() - self._start)
+
+
+class QueryScheduler:
+    """Per-connection concurrency limit with a bounded FIFO wait queue."""
+
+    def __init__(self) -> None:
+        self._gates: dict[str, _ConnectionGate] = {}
+
+    def _gate(self, connection_id: str, limits: SchedulerLimits) -> _ConnectionGate:
+        gate = self._gates.get(connection_id)
+        if gate is None:
+            gate = _ConnectionGate(limits)
+            self._gates[connection_id] = gate
+        else:
+            gate.limits = limits
+        return gate
+
+    async def acquire(
+        self, connection_id: str, limits: SchedulerLimits, unbounded: bool = False
+    ) -> None:
+        """Wait for a slot, failing with a 429 when the queue is full or the wait too long.
+
+        ``unbounded`` callers, such as background jobs, queue in the same FIFO order but are
+        never rejected: they wait however long it takes.
+        """
+        gate = self._gate(connection_id, limits)
+        if gate.active < limits.max_concurrent and not gate.waiters:
+            gate.active += 1
+            gate.admitted += 1
+            return
+
+        if not unbounded and len(gate.waiters) >= limits.max_queued:
+            gate.rejected += 1
+            raise AppError(
+                code="QUERY_QUEUE_FULL",
+                message="Too many queries are running on this connection. Retry later.",
+                status_code=429,
+                details={
+                    "retryAfterSeconds": gate.retry_after_seconds(),
+                    "queued": len(gate.waiters),
+                    "maxQueued": limits.max_queued,
+                },
+            )
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        gate.waiters.append(waiter)
+        start = time.perf_counter()
+        try:
+            timeout = None if unbounded else limits.queue_timeout_seconds
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=timeout)
+        except (TimeoutError, asyncio.CancelledError) as exc:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we gave up; pass it on.
+                gate.release()
+            else:
+                waiter.cancel()
+                if waiter in gate.waiters:
+                    gate.waiters.remove(waiter)
+            if isinstance(exc, asyncio.CancelledError):
+                raise
+            gate.timed_out += 1
+            raise AppError(
+                code="QUERY_QUEUE_TIMEOUT",
+                message="Query waited too long for a free slot on this connection.",
+                status_code=429,
+                details={
+                    "retryAfterSeconds": gate.retry_after_seconds(),
+                    "queueTimeoutSeconds": limits.queue_timeout_seconds,
+                },
+            ) from exc
+        finally:
+            gate.record_wait(time.perf_counter() - start)
+        gate.admitted += 1
+
+    def release(self, connection_id: str, held_seconds: float) -> None:
+        gate = self._gates.get(connection_id)
+        if gate is None:
+            return
+        gate.record_hold(held_seconds)
+        gate.release()
+
+    async def hold(
+        self, connection_id: str, limits: SchedulerLimits, unbounded: bool = False
+    ) -> HeldSlot:
+        """Acquire a slot that outlives this call, e.g. for a response streamed later."""
+        await self.acquire(connection_id, limits, unbounded)
+        return HeldSlot(self, connection_id)
+
+    @asynccontextmanager
+    async def slot(self, connection_id: str, limits: SchedulerLimits) -> AsyncIterator[None]:
+        await self.acquire(connection_id, limits)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(connection_id, time.perf_counter() - start)
+
+    def stats(self, connection_id: str, limits: SchedulerLimits) -> GateStats:
+        gate = self._gates.get(connection_id) or _ConnectionGate(limits)
+        avg_wait = gate.total_wait_seconds / gate.waited if gate.waited else 0.0
+        return GateStats(
+            max_concurrent=limits.max_concurrent,
+            max_queued=limits.max_queued,
+            active=gate.active,
+            queued=len(gate.waiters),
+            admitted=gate.admitted,
+            rejected=gate.rejected,
+            timed_out=gate.timed_out,
+            avg_wait_ms=round(avg_wait * 1000, 3),
+            max_wait_ms=round(gate.max_wait_seconds * 1000, 3),
+        )
+
+    def reset(self) -> None:
+        self._gates = {}
+
+
+_scheduler = QueryScheduler()
+
+
+def get_query_scheduler() -> QueryScheduler:
+    return _scheduler
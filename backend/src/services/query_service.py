@@ -1,15 +1,77 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, AsyncGenerator
 from uuid import uuid4
 
-from ..models.query import QueryRequest, QueryResponse, QueryColumn
+from ..adapters.base import DatabaseAdapter, QueryCancelledError, QueryTimeoutError
+from ..adapters.query_registry import QueryRegistry, get_query_registry
+from ..models.query import (
+    QueryCancelResponse,
+    QueryColumn,
+    QueryQueueStatsResponse,
+    QueryRequest,
+    QueryResponse,
+)
 from ..utils.app_errors import AppError
+from ..utils.metrics import get_metrics
 from ..utils.settings import get_settings
+from ..utils.timing import add_phases, collect_timings, record_phase, timed
 from .adapter_registry import AdapterRegistry
-from .connection_service import ConnectionService
+from .connection_service import ConnectionRecord, ConnectionService
+from .cost_guard import CostGuard, get_cost_guard
 from .export_service import ExportService, get_export_service
-from .sql_validator import validate_select_only
+from .query_log import QueryLog, QueryLogEntry, get_query_log
+from .query_scheduler import HeldSlot, QueryScheduler, get_query_scheduler
+from .query_stats import QueryStats, get_query_stats
+from .result_cache import ResultCache, ResultCacheKey, get_result_cache
+from .single_flight import SingleFlight
+from .sql_validator import ValidatedSelect, bind_limit, bind_parameters, parse_select_only
+
+_QUERY_SECONDS = get_metrics().histogram(
+    "dbquery_query_duration_seconds",
+    "Time to answer a buffered query, from validation to stored result.",
+    ("connection_id", "cache"),
+)
+_QUERY_ROWS = get_metrics().counter(
+    "dbquery_query_rows_total", "Rows returned by queries.", ("connection_id",)
+)
+
+
+# A statement checked and ready to run, with the values for its placeholders.
+PreparedQuery = tuple[ConnectionRecord, DatabaseAdapter, ValidatedSelect, tuple[Any, ...]]
+
+
+@dataclass
+class QueryStream:
+    request_id: str
+    limit_applied: int
+    batches: AsyncGenerator[dict[str, Any], None]
+    slot: HeldSlot
+    warnings: list[str] = field(default_factory=list)
+
+    async def close(self) -> None:
+        """Give the scheduler slot back, whether or not the batches were ever iterated.
+
+        A generator that never started does not run its ``finally``, e.g. when the client
+        went away before the response began.
+        """
+        await self.batches.aclose()
+        self.slot.release()
+
+
+@dataclass
+class ExecutedQuery:
+    columns: list[dict[str, Any]]
+    rows: list[list[Any]]
+    warnings: list[str]
+    duration_ms: int
+    # Phases of the shared execution; every caller that waited on it adds them to its own.
+    timings: dict[str, float] = field(default_factory=dict)
 
 
 class QueryService:
@@ -18,42 +80,455 @@ class QueryService:
         registry: AdapterRegistry,
         connection_service: ConnectionService,
         export_service: ExportService | None = None,
+        query_registry: QueryRegistry | None = None,
+        scheduler: QueryScheduler | None = None,
+        cost_guard: CostGuard | None = None,
+        result_cache: ResultCache | None = None,
+        flights: SingleFlight[ExecutedQuery] | None = None,
+        query_log: QueryLog | None = None,
+        query_stats: QueryStats | None = None,
     ) -> None:
         self._registry = registry
         self._connections = connection_service
         self._exports = export_service or get_export_service()
+        self._inflight = query_registry or get_query_registry()
+        self._scheduler = scheduler or get_query_scheduler()
+        self._cost_guard = cost_guard or get_cost_guard()
+        self._results = result_cache or get_result_cache()
+        self._flights: SingleFlight[ExecutedQuery] = flights or SingleFlight()
+        self._log = query_log or get_query_log()
+        self._stats = query_stats or get_query_stats()
 
-    async def execute_query(self, connection_id: str, request: QueryRequest) -> QueryResponse:
+    def _prepare(
+        self, connection_id: str, request: QueryRequest, job: bool = False
+    ) -> PreparedQuery:
         connection = self._connections.get_record(connection_id)
         adapter = self._registry.get_adapter(connection.db_type)
         if adapter is None:
             raise AppError(code="ADAPTER_NOT_FOUND", message="No adapter for db type.")
 
         settings = get_settings()
-        if request.max_rows > settings.max_max_rows:
+        # Jobs page through a result file rather than a response body, so they have their
+        # own cap, and a statement without a LIMIT is limited to the job's maxRows.
+        max_rows = settings.job_max_rows if job else settings.max_max_rows
+        if request.max_rows > max_rows:
             raise AppError(code="MAX_ROWS_EXCEEDED", message="maxRows exceeds allowed maximum.")
 
-        sql_text, limit_applied = validate_select_only(
-            request.sql_text, settings.default_max_rows, adapter.dialect
-        )
+        with timed("validate"):
+            validated = parse_select_only(
+                request.sql_text,
+                request.max_rows if job else settings.default_max_rows,
+                adapter.dialect,
+            )
+            values = bind_parameters(validated, request.params)
+            validated = bind_limit(validated, values)
 
-        if limit_applied > request.max_rows:
+        if validated.limit_applied > request.max_rows:
             raise AppError(code="LIMIT_EXCEEDS_MAX_ROWS", message="Limit exceeds maxRows.")
+        return connection, adapter, validated, values
 
+    def validate(self, connection_id: str, request: QueryRequest, job: bool = False) -> None:
+        """Raise the error ``execute_query``, or ``stream_job`` for a job, would raise first."""
+        self._prepare(connection_id, request, job)
+
+    async def execute_query(
+        self, connection_id: str, request: QueryRequest, request_id: str | None = None
+    ) -> QueryResponse:
         start = time.perf_counter()
-        result = await adapter.execute_query(
-            connection.connection_url, sql_text, request.timeout_seconds, request.max_rows
-        )
-        duration_ms = int((time.perf_counter() - start) * 1000)
-
-        columns = [QueryColumn(name=col["name"], type=col["type"]) for col in result["columns"]]
-        rows = result["rows"]
-        request_id = str(uuid4())
-        self._exports.store_result(request_id, result["columns"], rows)
-        return QueryResponse(
-            columns=columns,
-            rows=rows,
+        prepared = self._prepare(connection_id, request)
+        return await self._execute(start, *prepared, request, request_id or str(uuid4()))
+
+    async def execute_batch(
+        self, connection_id: str, requests: list[QueryRequest]
+    ) -> list[QueryResponse | AppError]:
+        """Run independent statements concurrently; each item holds its result or its error.
+
+        Every statement is validated before any of them runs, and invalid ones are not run.
+        """
+        connection = self._connections.get_record(connection_id)
+        prepared: list[PreparedQuery | AppError] = []
+        for request in requests:
+            try:
+                prepared.append(self._prepare(connection_id, request))
+            except AppError as exc:
+                prepared.append(exc)
+        # Never more items in flight than the connection runs at once, so a large batch
+        # waits its turn here instead of overflowing the scheduler queue.
+        gate = asyncio.Semaphore(connection.scheduler_limits().max_concurrent)
+
+        async def run(
+            item: PreparedQuery | AppError,
+            request: QueryRequest,
+        ) -> QueryResponse | AppError:
+            if isinstance(item, AppError):
+                return item
+            async with gate:
+                try:
+                    return await self._execute(
+                        time.perf_counter(), *item, request, str(uuid4())
+                    )
+                except AppError as exc:
+                    return exc
+                except Exception as exc:  # noqa: BLE001
+                    return AppError(
+                        code="QUERY_FAILED",
+                        message="Query execution failed.",
+                        status_code=500,
+                        details={"error": str(exc)},
+                    )
+
+        return list(await asyncio.gather(*map(run, prepared, requests)))
+
+    async def _execute(
+        self,
+        start: float,
+        connection: ConnectionRecord,
+        adapter: DatabaseAdapter,
+        validated: ValidatedSelect,
+        values: tuple[Any, ...],
+        request: QueryRequest,
+        request_id: str,
+    ) -> QueryResponse:
+        connection_id = connection.id
+        cache_policy = connection.result_cache_policy()
+        cache_key = ResultCacheKey(
+            connection_id,
+            connection.connection_url,
+            validated.sql,
+            request.max_rows,
+            json.dumps(values, default=str) if values else "",
+        )
+        with timed("cache"):
+            cached = await self._results.lookup(adapter, cache_key, cache_policy)
+        if cached is not None:
+            with timed("store"):
+                await asyncio.to_thread(
+                    self._exports.store_result, request_id, cached.columns, cached.rows
+                )
+            _observe(connection_id, "hit", start, len(cached.rows))
+            return QueryResponse.model_construct(
+                columns=_columns(cached.columns),
+                rows=cached.rows,
+                duration_ms=0,
+                limit_applied=cached.limit_applied,
+                request_id=request_id,
+                warnings=cached.warnings,
+                cached=True,
+            )
+
+        # Identical statements already running are joined rather than executed again.
+        # The timeout is part of the key so no caller inherits a shorter deadline.
+        try:
+            executed = await self._flights.run(
+                (cache_key, request.timeout_seconds),
+                request_id,
+                connection_id,
+                lambda execution_id: self._execute_timed(
+                    connection, adapter, validated, values, request, cache_key, execution_id
+                ),
+            )
+        except (QueryTimeoutError, QueryCancelledError) as exc:
+            raise _query_interrupted(exc, request_id) from exc
+        add_phases(executed.timings)
+
+        with timed("store"):
+            await asyncio.to_thread(
+                self._exports.store_result, request_id, executed.columns, executed.rows
+            )
+        _observe(connection_id, "miss", start, len(executed.rows))
+        # Built without validation: the rows come from the driver and are not user input.
+        return QueryResponse.model_construct(
+            columns=_columns(executed.columns),
+            rows=executed.rows,
+            duration_ms=executed.duration_ms,
+            limit_applied=validated.limit_applied,
+            request_id=request_id,
+            warnings=executed.warnings,
+        )
+
+    async def _execute_timed(
+        self,
+        connection: ConnectionRecord,
+        adapter: DatabaseAdapter,
+        validated: ValidatedSelect,
+        values: tuple[Any, ...],
+        request: QueryRequest,
+        cache_key: ResultCacheKey,
+        execution_id: str,
+    ) -> ExecutedQuery:
+        # The execution runs in the context of the caller that started it, so its phases are
+        # collected apart and handed to each caller with the result, joiners included.
+        with collect_timings() as timings:
+            executed = await self._execute_shared(
+                connection, adapter, validated, values, request, cache_key, execution_id
+            )
+        executed.timings = timings
+        return executed
+
+    async def _execute_shared(
+        self,
+        connection: ConnectionRecord,
+        adapter: DatabaseAdapter,
+        validated: ValidatedSelect,
+        values: tuple[Any, ...],
+        request: QueryRequest,
+        cache_key: ResultCacheKey,
+        execution_id: str,
+    ) -> ExecutedQuery:
+        with timed("guard"):
+            warnings = await self._preflight(connection, adapter, validated.sql, values, request)
+        # Markers are read before the statement runs, so a write that lands while it runs
+        # invalidates the entry instead of being hidden by it.
+        cache_policy = connection.result_cache_policy()
+        with timed("cache"):
+            counters = await self._results.change_counters(
+                adapter, connection.connection_url, validated.tables, cache_policy
+            )
+
+        queued = time.perf_counter()
+        async with self._scheduler.slot(connection.id, connection.scheduler_limits()):
+            record_phase("queue", queued)
+            started_at = datetime.now(timezone.utc)
+            start = time.perf_counter()
+            try:
+                with self._inflight.track(execution_id, connection.id):
+                    result = await adapter.execute_query(
+                        connection.connection_url,
+                        validated.sql,
+                        request.timeout_seconds,
+                        request.max_rows,
+                        params=values,
+                    )
+            except BaseException as exc:
+                self._record(connection.id, validated, started_at, start, 0, exc)
+                raise
+        # Logged once per execution, however many callers share it.
+        self._record(connection.id, validated, started_at, start, len(result["rows"]))
+        # The adapter's own figure covers the statement alone, without pool checkout.
+        duration_ms = result.get("duration_ms", int((time.perf_counter() - start) * 1000))
+
+        with timed("store"):
+            self._results.store(
+                cache_key,
+                cache_policy,
+                result,
+                validated.limit_applied,
+                warnings,
+                validated.tables,
+                counters,
+            )
+        return ExecutedQuery(
+            columns=result["columns"],
+            rows=result["rows"],
+            warnings=warnings,
             duration_ms=duration_ms,
-            limit_applied=limit_applied,
+        )
+
+    async def stream_query(
+        self, connection_id: str, request: QueryRequest, request_id: str | None = None
+    ) -> QueryStream:
+        # Streamed results are never buffered, so they are not kept for export or cached.
+        prepared = self._prepare(connection_id, request)
+        return await self._open_stream(prepared, request, request_id or str(uuid4()))
+
+    async def stream_job(
+        self, connection_id: str, request: QueryRequest, job_id: str
+    ) -> QueryStream:
+        """Stream a background job's rows under the job cap, cancellable by the job id.
+
+        Jobs wait for a scheduler slot for as long as interactive load keeps them queued
+        instead of failing with a 429.
+        """
+        prepared = self._prepare(connection_id, request, job=True)
+        return await self._open_stream(prepared, request, job_id, unbounded=True)
+
+    async def _open_stream(
+        self,
+        prepared: PreparedQuery,
+        request: QueryRequest,
+        request_id: str,
+        unbounded: bool = False,
+    ) -> QueryStream:
+        connection, adapter, validated, values = prepared
+        sql_text, limit_applied = validated.sql, validated.limit_applied
+        with timed("guard"):
+            warnings = await self._preflight(connection, adapter, sql_text, values, request)
+        # The slot is taken before the response starts so a full queue is still a plain 429;
+        # it is given back when the stream finishes or is closed.
+        queued = time.perf_counter()
+        slot = await self._scheduler.hold(connection.id, connection.scheduler_limits(), unbounded)
+        record_phase("queue", queued)
+        batches = self._tracked_stream(
+            connection, adapter, validated, values, request, request_id, slot
+        )
+        return QueryStream(
             request_id=request_id,
+            limit_applied=limit_applied,
+            batches=batches,
+            slot=slot,
+            warnings=warnings,
+        )
+
+    async def _preflight(
+        self,
+        connection: ConnectionRecord,
+        adapter: DatabaseAdapter,
+        sql_text: str,
+        values: tuple[Any, ...],
+        request: QueryRequest,
+    ) -> list[str]:
+        # Runs before a scheduler slot is taken, so rejected statements never queue.
+        return await self._cost_guard.check(
+            adapter,
+            connection.connection_url,
+            sql_text,
+            connection.cost_guard_policy(),
+            request.timeout_seconds,
+            values,
+        )
+
+    async def _tracked_stream(
+        self,
+        connection: ConnectionRecord,
+        adapter: DatabaseAdapter,
+        validated: ValidatedSelect,
+        values: tuple[Any, ...],
+        request: QueryRequest,
+        request_id: str,
+        slot: HeldSlot,
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        # Logged when the stream ends, fails or is closed early; a stream that never started
+        # executed nothing and is not logged.
+        started_at = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        row_count = 0
+        error: BaseException | None = None
+        try:
+            with self._inflight.track(request_id, connection.id):
+                async for batch in adapter.stream_query(
+                    connection.connection_url,
+                    validated.sql,
+                    request.timeout_seconds,
+                    request.max_rows,
+                    params=values,
+                ):
+                    row_count += len(batch["rows"])
+                    _QUERY_ROWS.inc(connection.id, amount=len(batch["rows"]))
+                    yield batch
+        except (QueryTimeoutError, QueryCancelledError) as exc:
+            error = exc
+            raise _query_interrupted(exc, request_id) from exc
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            slot.release()
+            self._record(connection.id, validated, started_at, start, row_count, error)
+
+    async def cancel_query(self, connection_id: str, query_id: str) -> QueryCancelResponse:
+        connection = self._connections.get_record(connection_id)
+        flight = self._flights.get(query_id)
+        query = self._inflight.get(query_id)
+        if flight is not None:
+            found = flight.connection_id == connection_id
+        else:
+            found = query is not None and query.connection_id == connection_id
+        if not found:
+            raise AppError(code="QUERY_NOT_FOUND", message="Query is not running.", status_code=404)
+        adapter = self._registry.get_adapter(connection.db_type)
+        if adapter is None:
+            raise AppError(code="ADAPTER_NOT_FOUND", message="No adapter for db type.")
+        if not adapter.capabilities.supports_cancel:
+            raise AppError(
+                code="CANCEL_NOT_SUPPORTED", message="Adapter does not support cancellation."
+            )
+        if flight is not None:
+            # A shared execution keeps running for the callers that still wait on it; the
+            # last one to leave stops it on the server, or before it starts if still queued.
+            if self._flights.detach(query_id) == 0:
+                if not await adapter.cancel_query(flight.execution_id):
+                    flight.task.cancel()
+            return QueryCancelResponse(query_id=query_id, cancelled=True)
+        cancelled = await adapter.cancel_query(query_id)
+        return QueryCancelResponse(query_id=query_id, cancelled=cancelled)
+
+    def _record(
+        self,
+        connection_id: str,
+        validated: ValidatedSelect,
+        started_at: datetime,
+        start: float,
+        row_count: int,
+        error: BaseException | None = None,
+    ) -> None:
+        if error is None:
+            status = "succeeded"
+        elif isinstance(error, QueryTimeoutError):
+            status = "timeout"
+        elif isinstance(error, (QueryCancelledError, asyncio.CancelledError, GeneratorExit)):
+            # GeneratorExit: the client stopped reading a stream before it ended.
+            status = "cancelled"
+        else:
+            status = "failed"
+        duration_ms = (time.perf_counter() - start) * 1000
+        self._stats.record(
+            connection_id,
+            validated.fingerprint,
+            validated.normalized_sql,
+            duration_ms,
+            row_count,
+            failed=error is not None,
+        )
+        self._log.record(
+            QueryLogEntry(
+                connection_id=connection_id,
+                sql_text=validated.sql,
+                fingerprint=validated.fingerprint,
+                started_at=started_at,
+                duration_ms=int(duration_ms),
+                row_count=row_count,
+                status=status,
+                error_message=None if error is None else str(error) or type(error).__name__,
+            )
+        )
+
+    def queue_stats(self, connection_id: str) -> QueryQueueStatsResponse:
+        connection = self._connections.get_record(connection_id)
+        stats = self._scheduler.stats(connection_id, connection.scheduler_limits())
+        return QueryQueueStatsResponse(
+            connection_id=connection_id,
+            max_concurrent=stats.max_concurrent,
+            max_queued=stats.max_queued,
+            active=stats.active,
+            queued=stats.queued,
+            admitted=stats.admitted,
+            rejected=stats.rejected,
+            timed_out=stats.timed_out,
+            avg_wait_ms=stats.avg_wait_ms,
+            max_wait_ms=stats.max_wait_ms,
+        )
+
+
+def _observe(connection_id: str, cache: str, start: float, row_count: int) -> None:
+    _QUERY_SECONDS.observe(time.perf_counter() - start, connection_id, cache)
+    _QUERY_ROWS.inc(connection_id, amount=row_count)
+
+
+def _columns(columns: list[dict[str, Any]]) -> list[QueryColumn]:
+    return [QueryColumn.model_construct(name=col["name"], type=col["type"]) for col in columns]
+
+
+def _query_interrupted(exc: Exception, request_id: str) -> AppError:
+    if isinstance(exc, QueryTimeoutError):
+        return AppError(
+            code="QUERY_TIMEOUT",
+            message="Query exceeded timeout and was cancelled.",
+            status_code=504,
+            details={"requestId": request_id, "error": str(exc)},
         )
+    return AppError(
+        code="QUERY_CANCELLED",
+        message="Query was cancelled.",
+        status_code=409,
+        details={"requestId": request_id},
+    )
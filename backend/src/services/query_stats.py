@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import AsyncIterator
+
+import aiosqlite
+
+from ..models.history import QueryFingerprintStats, QueryFingerprintStatsResponse
+from ..repositories.history_repo import create_history_tables
+from ..repositories.sqlite import get_sqlite_connection
+from ..utils.logging import get_logger
+from ..utils.settings import get_settings
+
+_logger = get_logger(__name__)
+
+
+@dataclass
+class _Counters:
+    normalized_sql: str
+    first_seen: datetime
+    last_seen: datetime
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    row_count: int = 0
+    error_count: int = 0
+
+
+class QueryStats:
+    """Cumulative execution statistics per connection and query fingerprint.
+
+    ``record`` only adds to in-memory counters. They are merged into ``query_stats`` every
+    ``flush_seconds``, or as soon as ``max_entries`` fingerprints are pending.
+    """
+
+    def __init__(self, flush_seconds: int | None = None, max_entries: int | None = None) -> None:
+        settings = get_settings()
+        self._flush_seconds = flush_seconds or settings.query_stats_flush_seconds
+        self._max_entries = max_entries or settings.query_stats_max_entries
+        self._pending: dict[tuple[str, str], _Counters] = {}
+        self._timer: asyncio.Task[None] | None = None
+        self._writes: set[asyncio.Task[None]] = set()
+        self._tables_ready = False
+
+    def record(
+        self,
+        connection_id: str,
+        fingerprint: str,
+        normalized_sql: str,
+        duration_ms: float,
+        row_count: int,
+        failed: bool,
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        counters = self._pending.get((connection_id, fingerprint))
+        if counters is None:
+            counters = self._pending[(connection_id, fingerprint)] = _Counters(
+                normalized_sql, now, now
+            )
+        counters.last_seen = now
+        counters.calls += 1
+        counters.total_ms += duration_ms
+        counters.max_ms = max(counters.max_ms, duration_ms)
+        counters.row_count += row_count
+        counters.error_count += failed
+
+        loop = asyncio.get_running_loop()
+        if len(self._pending) >= self._max_entries:
+            task = loop.create_task(self.flush())
+            self._writes.add(task)
+            task.add_done_callback(self._writes.discard)
+        elif self._timer is None or self._timer.done() or self._timer.get_loop() is not loop:
+            # A timer left on a finished loop never fires, so it is replaced too.
+            self._timer = loop.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self._flush_seconds)
+        await self.flush()
+
+    async def flush(self) -> None:
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        try:
+            async with self._connect() as conn:
+                await conn.executemany(
+                    "INSERT INTO query_stats (connection_id, fingerprint, normalized_sql, calls, "
+                    "total_ms, max_ms, row_count, error_count, first_seen, last_seen) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (connection_id, fingerprint) DO UPDATE SET "
+                    "normalized_sql = excluded.normalized_sql, "
+                    "calls = calls + excluded.calls, "
+                    "total_ms = total_ms + excluded.total_ms, "
+                    "max_ms = MAX(max_ms, excluded.max_ms), "
+                    "row_count = row_count + excluded.row_count, "
+                    "error_count = error_count + excluded.error_count, "
+                    "last_seen = excluded.last_seen",
+                    [
+                        (
+                            connection_id,
+                            fingerprint,
+                            counters.normalized_sql,
+                            counters.calls,
+                            counters.total_ms,
+                            counters.max_ms,
+                            counters.row_count,
+                            counters.error_count,
+                            counters.first_seen.isoformat(),
+                            counters.last_seen.isoformat(),
+                        )
+                        for (connection_id, fingerprint), counters in pending.items()
+                    ],
+                )
+                await conn.commit()
+        except Exception:  # noqa: BLE001
+            # Statistics are diagnostic; losing an interval must not fail the queries.
+            _logger.exception("Failed to write statistics for %d fingerprints", len(pending))
+
+    @asynccontextmanager
+    async def _connect(self) -> AsyncIterator[aiosqlite.Connection]:
+        async with get_sqlite_connection() as conn:
+            if not self._tables_ready:
+                await create_history_tables(conn)
+                self._tables_ready = True
+            yield conn
+
+    async def close(self) -> None:
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+        await self.flush()
+
+    async def top(self, connection_id: str, limit: int) -> QueryFingerprintStatsResponse:
+        """Fingerprints of ``connection_id`` with the most total execution time first."""
+        await self.flush()
+        async with self._connect() as conn:
+            cursor = await conn.execute(
+                "SELECT fingerprint, normalized_sql, calls, total_ms, max_ms, row_count, "
+                "error_count, first_seen, last_seen FROM query_stats WHERE connection_id = ? "
+                "ORDER BY total_ms DESC LIMIT ?",
+                (connection_id, limit),
+            )
+            rows = await cursor.fetchall()
+        return QueryFingerprintStatsResponse(
+            connection_id=connection_id,
+            items=[
+                QueryFingerprintStats(
+                    fingerprint=row[0],
+                    normalized_sql=row[1],
+                    calls=row[2],
+                    total_ms=round(row[3], 3),
+                    mean_ms=round(row[3] / row[2], 3),
+                    max_ms=round(row[4], 3),
+                    row_count=row[5],
+                    error_count=row[6],
+                    first_seen=datetime.fromisoformat(row[7]),
+                    last_seen=datetime.fromisoformat(row[8]),
+                )
+                for row in rows
+            ],
+        )
+
+    async def reset(self, connection_id: str) -> None:
+        await self.flush()
+        async with self._connect() as conn:
+            await conn.execute("DELETE FROM query_stats WHERE connection_id = ?", (connection_id,))
+            await conn.commit()
+
+
+_query_stats = QueryStats()
+
+
+def get_query_stats() -> QueryStats:
+    return _query_stats
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Collection
+
+from ..adapters.base import DatabaseAdapter
+from ..utils.settings import get_settings
+
+# Rows measured per entry; the byte size of larger results is extrapolated from the sample.
+SIZE_SAMPLE_ROWS = 64
+
+# Returned when markers could not be read: never stored and never matched.
+_UNAVAILABLE: dict[str, str] = {}
+
+
+@dataclass(frozen=True)
+class ResultCachePolicy:
+    ttl_seconds: int
+    invalidate: bool
+
+    @property
+    def active(self) -> bool:
+        return self.ttl_seconds > 0
+
+
+def default_result_cache_policy() -> ResultCachePolicy:
+    settings = get_settings()
+    return ResultCachePolicy(
+        ttl_seconds=settings.query_result_cache_ttl_seconds,
+        invalidate=settings.query_result_cache_invalidate,
+    )
+
+
+@dataclass(frozen=True)
+class ResultCacheKey:
+    connection_id: str
+    connection_url: str
+    sql: str
+    max_rows: int
+    # Bound values as JSON, which keeps the key hashable; empty without parameters.
+    params: str = ""
+
+
+@dataclass
+class CachedResult:
+    columns: list[dict[str, Any]]
+    rows: list[list[Any]]
+    limit_applied: int
+    warnings: list[str]
+    tables: frozenset[str]
+    # Change markers taken before the statement ran, or None when not validated by table.
+    counters: dict[str, str] | None
+    size_bytes: int
+    expires_at: float
+
+
+class ResultCache:
+    """Byte-bounded LRU of buffered query results keyed by connection and normalized SQL."""
+
+    def __init__(self, max_bytes: int | None = None) -> None:
+        self._max_bytes = max_bytes or get_settings().query_result_cache_max_bytes
+        self._entries: OrderedDict[ResultCacheKey, CachedResult] = OrderedDict()
+        self._size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def lookup(
+        self, adapter: DatabaseAdapter, key: ResultCacheKey, policy: ResultCachePolicy
+    ) -> CachedResult | None:
+        if not policy.active:
+            return None
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() >= entry.expires_at:
+            self._discard(key)
+            entry = None
+        if entry is not None and entry.counters is not None:
+            current = await self.change_counters(adapter, key.connection_url, entry.tables, policy)
+            if current is _UNAVAILABLE or current != entry.counters:
+                self._discard(key)
+                entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    async def change_counters(
+        self,
+        adapter: DatabaseAdapter,
+        connection_url: str,
+        tables: Collection[str],
+        policy: ResultCachePolicy,
+    ) -> dict[str, str] | None:
+        """Current change markers for ``tables``, or None when entries rely on the TTL alone.
+
+        Tables without a marker, such as views, are only bounded by the TTL as well.
+        """
+        if not policy.active or not policy.invalidate or not tables:
+            return None
+        try:
+            return await adapter.fetch_table_change_counters(connection_url, tables)
+        except Exception:  # noqa: BLE001
+            return _UNAVAILABLE
+
+    def store(
+        self,
+        key: ResultCacheKey,
+        policy: ResultCachePolicy,
+        result: dict[str, Any],
+        limit_applied: int,
+        warnings: list[str],
+        tables: frozenset[str],
+        counters: dict[str, str] | None,
+    ) -> None:
+        if not policy.active or counters is _UNAVAILABLE:
+            return
+        size_bytes = estimate_result_bytes(result["rows"])
+        # A single result may take at most a quarter of the budget, so one large export
+        # cannot flush every dashboard query out of the cache.
+        if size_bytes > self._max_bytes // 4:
+            return
+        self._discard(key)
+        self._entries[key] = CachedResult(
+            columns=result["columns"],
+            rows=result["rows"],
+            limit_applied=limit_applied,
+            warnings=warnings,
+            tables=tables,
+            counters=counters,
+            size_bytes=size_bytes,
+            expires_at=time.monotonic() + policy.ttl_seconds,
+        )
+        self._size_bytes += size_bytes
+        while self._size_bytes > self._max_bytes:
+            oldest, _ = next(iter(self._entries.items()))
+            self._discard(oldest)
+            self.evictions += 1
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size_bytes
+
+    def _discard(self, key: ResultCacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size_bytes -= entry.size_bytes
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size_bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def estimate_result_bytes(rows: list[list[Any]]) -> int:
+    """Approximate in-memory size of ``rows`` from an evenly spaced sample."""
+    if not rows:
+        return sys.getsizeof(rows)
+    step = max(1, len(rows) // SIZE_SAMPLE_ROWS)
+    sample = rows[::step]
+    sampled = sum(sys.getsizeof(row) + sum(map(sys.getsizeof, row)) for row in sample)
+    return sys.getsizeof(rows) + sampled * len(rows) // len(sample)
+
+
+_cache = ResultCache()
+
+
+def get_result_cache() -> ResultCache:
+    return _cache
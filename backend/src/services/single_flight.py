@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Hashable
+from uuid import uuid4
+
+from ..adapters.base import QueryCancelledError
+
+
+@dataclass
+class Flight[T]:
+    key: Hashable
+    execution_id: str
+    connection_id: str
+    task: asyncio.Future[T]
+    # Request id of every caller still waiting, with the future that detaches it.
+    waiters: dict[str, asyncio.Future[None]] = field(default_factory=dict)
+
+
+class SingleFlight[T]:
+    """Shares one execution between concurrent callers with the same key.
+
+    Each caller waits under its own request id. The execution is only abandoned once every
+    caller has left, either by going away or by being detached on request.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, Flight[T]] = {}
+        self._by_waiter: dict[str, Flight[T]] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def run(
+        self,
+        key: Hashable,
+        waiter_id: str,
+        connection_id: str,
+        factory: Callable[[str], Awaitable[T]],
+    ) -> T:
+        flight = self._flights.get(key)
+        if flight is None:
+            execution_id = str(uuid4())
+            task = asyncio.ensure_future(factory(execution_id))
+            flight = Flight(key, execution_id, connection_id, task)
+            flight.task.add_done_callback(lambda _: self._finished(flight))
+            self._flights[key] = flight
+            self.executions += 1
+        else:
+            self.coalesced += 1
+
+        detached = asyncio.get_running_loop().create_future()
+        flight.waiters[waiter_id] = detached
+        self._by_waiter[waiter_id] = flight
+        try:
+            await asyncio.wait({flight.task, detached}, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            if self._leave(flight, waiter_id) == 0:
+                flight.task.cancel()
+            raise
+        self._leave(flight, waiter_id)
+        if detached.done():
+            raise QueryCancelledError("Query was cancelled.")
+        return flight.task.result()
+
+    def get(self, waiter_id: str) -> Flight[T] | None:
+        return self._by_waiter.get(waiter_id)
+
+    def detach(self, waiter_id: str) -> int | None:
+        """Stop waiting on behalf of ``waiter_id``; return how many callers still wait."""
+        flight = self._by_waiter.get(waiter_id)
+        if flight is None:
+            return None
+        detached = flight.waiters.get(waiter_id)
+        remaining = self._leave(flight, waiter_id)
+        if detached is not None and not detached.done():
+            detached.set_result(None)
+        return remaining
+
+    def _leave(self, flight: Flight[T], waiter_id: str) -> int:
+        flight.waiters.pop(waiter_id, None)
+        self._by_waiter.pop(waiter_id, None)
+        remaining = len(flight.waiters)
+        if remaining == 0 and self._flights.get(flight.key) is flight:
+            # Nobody is left to share it, so later callers start a fresh execution.
+            del self._flights[flight.key]
+        return remaining
+
+    def _finished(self, flight: Flight[T]) -> None:
+        if self._flights.get(flight.key) is flight:
+            del self._flights[flight.key]
+        if not flight.task.cancelled():
+            flight.task.exception()  # retrieved here in case every caller already left
+
+    def __len__(self) -> int:
+        return len(self._flights)
@@ -1,11 +1,20 @@
 from __future__ import annotations
 
-from typing import Iterable
+import hashlib
+import re
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Any, Iterable, Mapping, Sequence
+from uuid import uuid4
 
 from sqlglot import exp, parse
+from sqlglot.optimizer.normalize_identifiers import normalize_identifiers
 
 from ..utils.app_errors import AppError
 
+# Dialects whose drivers take ``%s`` placeholders; the others take ``$1``.
+_FORMAT_PARAMSTYLE_DIALECTS = frozenset({"mysql"})
+
 _DISALLOWED_NODES: Iterable[type[exp.Expression]] = (
     exp.Insert,
     exp.Update,
@@ -24,11 +33,56 @@ def _find_disallowed(expression: exp.Expression) -> type[exp.Expression] | None:
     return None
 
 
-def validate_select_only(sql_text: str, default_limit: int, dialect: str | None = None) -> tuple[str, int]:
+@dataclass(frozen=True)
+class ValidatedSelect:
+    sql: str
+    limit_applied: int
+    # ``schema.name`` or bare ``name`` of every table read, CTE names excluded.
+    tables: frozenset[str]
+    # Hash of ``normalized_sql``: groups executions of the same query shape.
+    fingerprint: str
+    # The statement with literals and bind parameters replaced by ``?``, IN-lists of them
+    # collapsed to one, and identifiers normalized.
+    normalized_sql: str
+    # What each driver placeholder in ``sql`` is bound to, in order: a parameter name for
+    # ``:name``, or a 0-based index into the values for ``$1``.
+    parameters: tuple[str | int, ...] = ()
+    # Parameter the LIMIT is bound to, if any; ``limit_applied`` is then only known once
+    # the values are, see ``bind_limit``.
+    limit_parameter: str | int | None = None
+
+
+def _referenced_tables(expression: exp.Expression, dialect: str | None) -> frozenset[str]:
+    cte_names = {cte.alias_or_name for cte in expression.find_all(exp.CTE)}
+    tables = set()
+    for table in expression.find_all(exp.Table):
+        if not isinstance(table.this, exp.Identifier):
+            continue  # table-valued functions
+        if not table.db and table.name in cte_names:
+            continue
+        table = normalize_identifiers(table.copy(), dialect=dialect)
+        tables.add(f"{table.db}.{table.name}" if table.db else table.name)
+    return frozenset(tables)
+
+
+def validate_select_only(
+    sql_text: str, default_limit: int, dialect: str | None = None
+) -> tuple[str, int]:
+    validated = parse_select_only(sql_text, default_limit, dialect)
+    return validated.sql, validated.limit_applied
+
+
+@lru_cache(maxsize=1024)
+def parse_select_only(
+    sql_text: str, default_limit: int, dialect: str | None = None
+) -> ValidatedSelect:
+    # Cached, so a parameterized statement is parsed once however many values it runs with.
     try:
         statements = parse(sql_text, read=dialect)
     except Exception as exc:  # noqa: BLE001
-        raise AppError(code="INVALID_SQL", message="SQL syntax error.", details={"error": str(exc)}) from exc
+        raise AppError(
+            code="INVALID_SQL", message="SQL syntax error.", details={"error": str(exc)}
+        ) from exc
 
     if len(statements) != 1:
         raise AppError(code="INVALID_SQL", message="Only single statement SQL is allowed.")
@@ -48,6 +102,7 @@ def validate_select_only(sql_text: str, default_limit: int, dialect: str | None
         raise AppError(code="INVALID_SQL", message="Only SELECT statements are allowed.")
 
     limit_applied = default_limit
+    limit_parameter: str | int | None = None
     if select_expr.args.get("limit") is None:
         select_expr = select_expr.limit(default_limit)
         if isinstance(expression, exp.With):
@@ -61,5 +116,149 @@ def validate_select_only(sql_text: str, default_limit: int, dialect: str | None
                 limit_applied = int(limit_expr.expression.name)
             except ValueError:
                 limit_applied = default_limit
+        elif isinstance(limit_expr, exp.Limit) and isinstance(
+            limit_expr.expression, (exp.Placeholder, exp.Parameter)
+        ):
+            limit_parameter = _parameter_key(limit_expr.expression)
+
+    tables = _referenced_tables(expression, dialect)
+    normalized_sql = _normalize(expression, dialect)
+    sql, parameters = _render(expression, dialect)
+    return ValidatedSelect(
+        sql=sql,
+        limit_applied=limit_applied,
+        tables=tables,
+        fingerprint=hashlib.sha1(normalized_sql.encode()).hexdigest()[:16],
+        normalized_sql=normalized_sql,
+        parameters=parameters,
+        limit_parameter=limit_parameter,
+    )
+
+
+def _normalize(expression: exp.Expression, dialect: str | None) -> str:
+    # Like pg_stat_statements, but the same on every dialect: a query run with other values,
+    # inlined or bound, or with a longer IN-list keeps its shape.
+    shape = normalize_identifiers(expression.copy(), dialect=dialect)
+    shape = shape.transform(_strip_value, copy=False)
+    shape = shape.transform(_collapse_in_list, copy=False)
+    return shape.sql(dialect=dialect)
+
+
+def _strip_value(node: exp.Expression) -> exp.Expression:
+    if isinstance(node, exp.Neg) and isinstance(node.this, exp.Literal):
+        return _value_marker()
+    if isinstance(node, (exp.Literal, exp.Placeholder)):
+        return _value_marker()
+    if isinstance(node, exp.Parameter) and _parameter_key(node) is not None:
+        return _value_marker()
+    return node
+
+
+def _collapse_in_list(node: exp.Expression) -> exp.Expression:
+    if isinstance(node, exp.In) and node.expressions and all(map(_is_value, node.expressions)):
+        node.set("expressions", [_value_marker()])
+    return node
+
+
+def _value_marker() -> exp.Expression:
+    # A Var renders as its text in every dialect; a Placeholder would become %s on some.
+    return exp.Var(this="?")
+
+
+def _is_value(node: exp.Expression) -> bool:
+    return isinstance(node, exp.Var) and node.name == "?"
+
+
+def _render(expression: exp.Expression, dialect: str | None) -> tuple[str, tuple[str | int, ...]]:
+    # Placeholders become unique markers first: the order the driver binds them in is their
+    # order in the rendered SQL, which is not the order of the syntax tree.
+    marker = f"__bind_{uuid4().hex}_"
+    keys: list[str | int] = []
+    for node in list(expression.find_all(exp.Placeholder, exp.Parameter)):
+        key = _parameter_key(node)
+        if key is None:
+            continue
+        node.replace(exp.Var(this=f"{marker}{len(keys)}__"))
+        keys.append(key)
+    sql = expression.sql(dialect=dialect)
+    if not keys:
+        return sql, ()
+    if len({type(key) for key in keys}) > 1:
+        raise AppError(code="INVALID_SQL", message="Use either :name or $n parameters, not both.")
+
+    pattern = re.compile(rf"{marker}(\d+)__")
+    if dialect in _FORMAT_PARAMSTYLE_DIALECTS:
+        # One %s per occurrence; a literal % must be doubled once the driver formats the SQL.
+        ordered = tuple(keys[int(index)] for index in pattern.findall(sql))
+        return pattern.sub("%s", sql.replace("%", "%%")), ordered
+    # One $k per distinct parameter, so a value used twice is sent once.
+    distinct: dict[str | int, int] = {}
+    for index in pattern.findall(sql):
+        distinct.setdefault(keys[int(index)], len(distinct) + 1)
+    return (
+        pattern.sub(lambda match: f"${distinct[keys[int(match.group(1))]]}", sql),
+        tuple(distinct),
+    )
+
+
+def _parameter_key(node: exp.Expression) -> str | int | None:
+    if isinstance(node, exp.Parameter):
+        # $1 on PostgreSQL; other dialects use Parameter for variables such as MySQL's @x.
+        number = node.this
+        if isinstance(number, exp.Literal) and not number.is_string:
+            return int(number.name) - 1
+        return None
+    if node.this is None:
+        # Anonymous ? or %s would be bound by position, which the parsed tree does not keep.
+        raise AppError(code="INVALID_SQL", message="Use :name or $n parameters instead of ?.")
+    return node.name
+
+
+def bind_parameters(
+    validated: ValidatedSelect, params: Mapping[str, Any] | Sequence[Any] | None
+) -> tuple[Any, ...]:
+    """Values for the driver placeholders of ``validated.sql``, in order."""
+    if not validated.parameters:
+        if params:
+            raise AppError(code="INVALID_PARAMETERS", message="Statement takes no parameters.")
+        return ()
+    named = isinstance(validated.parameters[0], str)
+    if named and isinstance(params, Mapping):
+        available: set[str | int] = set(params)
+    elif not named and params is not None and not isinstance(params, Mapping):
+        available = set(range(len(params)))
+    else:
+        expected = "an object of :name values" if named else "a list of $n values"
+        raise AppError(
+            code="INVALID_PARAMETERS", message=f"Statement parameters must be {expected}."
+        )
+    missing = set(validated.parameters) - available
+    unused = available - set(validated.parameters)
+    if missing or unused:
+        raise AppError(
+            code="INVALID_PARAMETERS",
+            message="Parameters do not match the statement.",
+            details={
+                "missing": sorted(_display(key) for key in missing),
+                "unused": sorted(_display(key) for key in unused),
+            },
+        )
+    return tuple(params[key] for key in validated.parameters)  # type: ignore[index]
+
+
+def bind_limit(validated: ValidatedSelect, values: tuple[Any, ...]) -> ValidatedSelect:
+    """``validated`` with ``limit_applied`` read from the value bound to its LIMIT, if any."""
+    if validated.limit_parameter is None:
+        return validated
+    value = values[validated.parameters.index(validated.limit_parameter)]
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise AppError(
+            code="INVALID_PARAMETERS",
+            message="LIMIT must be bound to a non-negative integer.",
+            details={"parameter": _display(validated.limit_parameter)},
+        )
+    return replace(validated, limit_applied=value)
+
 
-    return expression.sql(dialect=dialect), limit_applied
+def _display(key: str | int) -> str:
+    return f":{key}" if isinstance(key, str) else f"${key + 1}"
@@ -3,7 +3,9 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 
-@dataclass(frozen=True)
+# Not frozen: contextlib assigns __traceback__ on exceptions leaving an async context
+# manager, e.g. an adapter's pooled connection. eq=False keeps them hashable by identity.
+@dataclass(eq=False)
 class AppError(Exception):
     code: str
     message: str
@@ -21,6 +21,25 @@ def _get_int(name: str, default: int) -> int:
         raise ValueError(f"Invalid int for {name}: {raw}") from exc
 
 
+def _get_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    value = raw.strip().lower()
+    if value in ("1", "true", "yes", "on"):
+        return True
+    if value in ("0", "false", "no", "off"):
+        return False
+    raise ValueError(f"Invalid bool for {name}: {raw}")
+
+
+def _get_choice(name: str, default: str, choices: tuple[str, ...]) -> str:
+    raw = os.getenv(name, default).strip().lower()
+    if raw not in choices:
+        raise ValueError(f"Invalid value for {name}: {raw} (expected one of {', '.join(choices)})")
+    return raw
+
+
 @dataclass(frozen=True)
 class Settings:
     modelscope_base_url: str
@@ -31,6 +50,37 @@ class Settings:
     max_max_rows: int
     metadata_cache_ttl_seconds: int
     metadata_cache_max_snapshots: int
+    pool_size: int
+    pool_max_overflow: int
+    pool_recycle_seconds: int
+    pool_timeout_seconds: int
+    pool_max_engines: int
+    pool_engine_idle_seconds: int
+    db_native_fetch: bool
+    query_max_concurrent: int
+    query_max_queued: int
+    query_queue_timeout_seconds: int
+    query_cost_guard: str
+    query_max_cost: int
+    query_max_estimated_rows: int
+    query_plan_cache_size: int
+    query_plan_cache_ttl_seconds: int
+    query_result_cache_ttl_seconds: int
+    query_result_cache_invalidate: bool
+    query_result_cache_max_bytes: int
+    export_store_max_bytes: int
+    export_store_ttl_seconds: int
+    http_compression_min_bytes: int
+    job_interactive_workers: int
+    job_batch_workers: int
+    job_result_ttl_seconds: int
+    job_max_rows: int
+    query_slow_ms: int
+    query_log_flush_ms: int
+    query_log_batch_size: int
+    query_log_max_pending: int
+    query_stats_flush_seconds: int
+    query_stats_max_entries: int
     sqlite_path: Path
 
 
@@ -49,5 +99,36 @@ def get_settings() -> Settings:
         max_max_rows=_get_int("MAX_MAX_ROWS", 1000),
         metadata_cache_ttl_seconds=_get_int("METADATA_CACHE_TTL_SECONDS", 300),
         metadata_cache_max_snapshots=_get_int("METADATA_CACHE_MAX_SNAPSHOTS", 5),
+        pool_size=_get_int("DB_POOL_SIZE", 5),
+        pool_max_overflow=_get_int("DB_POOL_MAX_OVERFLOW", 10),
+        pool_recycle_seconds=_get_int("DB_POOL_RECYCLE_SECONDS", 1800),
+        pool_timeout_seconds=_get_int("DB_POOL_TIMEOUT_SECONDS", 30),
+        pool_max_engines=_get_int("DB_POOL_MAX_ENGINES", 50),
+        pool_engine_idle_seconds=_get_int("DB_POOL_ENGINE_IDLE_SECONDS", 600),
+        db_native_fetch=_get_bool("DB_NATIVE_FETCH", False),
+        query_max_concurrent=_get_int("QUERY_MAX_CONCURRENT", 4),
+        query_max_queued=_get_int("QUERY_MAX_QUEUED", 32),
+        query_queue_timeout_seconds=_get_int("QUERY_QUEUE_TIMEOUT_SECONDS", 10),
+        query_cost_guard=_get_choice("QUERY_COST_GUARD", "off", ("off", "warn", "reject")),
+        query_max_cost=_get_int("QUERY_MAX_COST", 0),
+        query_max_estimated_rows=_get_int("QUERY_MAX_ESTIMATED_ROWS", 0),
+        query_plan_cache_size=_get_int("QUERY_PLAN_CACHE_SIZE", 512),
+        query_plan_cache_ttl_seconds=_get_int("QUERY_PLAN_CACHE_TTL_SECONDS", 300),
+        query_result_cache_ttl_seconds=_get_int("QUERY_RESULT_CACHE_TTL_SECONDS", 0),
+        query_result_cache_invalidate=_get_bool("QUERY_RESULT_CACHE_INVALIDATE", True),
+        query_result_cache_max_bytes=_get_int("QUERY_RESULT_CACHE_MAX_BYTES", 64 * 1024 * 1024),
+        export_store_max_bytes=_get_int("EXPORT_STORE_MAX_BYTES", 256 * 1024 * 1024),
+        export_store_ttl_seconds=_get_int("EXPORT_STORE_TTL_SECONDS", 3600),
+        http_compression_min_bytes=_get_int("HTTP_COMPRESSION_MIN_BYTES", 1024),
+        job_interactive_workers=_get_int("JOB_INTERACTIVE_WORKERS", 4),
+        job_batch_workers=_get_int("JOB_BATCH_WORKERS", 1),
+        job_result_ttl_seconds=_get_int("JOB_RESULT_TTL_SECONDS", 24 * 3600),
+        job_max_rows=_get_int("JOB_MAX_ROWS", 1_000_000),
+        query_slow_ms=_get_int("QUERY_SLOW_MS", 1000),
+        query_log_flush_ms=_get_int("QUERY_LOG_FLUSH_MS", 1000),
+        query_log_batch_size=_get_int("QUERY_LOG_BATCH_SIZE", 200),
+        query_log_max_pending=_get_int("QUERY_LOG_MAX_PENDING", 10000),
+        query_stats_flush_seconds=_get_int("QUERY_STATS_FLUSH_SECONDS", 60),
+        query_stats_max_entries=_get_int("QUERY_STATS_MAX_ENTRIES", 5000),
         sqlite_path=sqlite_path,
     )
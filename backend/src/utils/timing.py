@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import contextvars
+import time
+
+# Milliseconds spent per phase of the current request; None when nobody is collecting.
+_TIMINGS_CTX: contextvars.ContextVar[dict[str, float] | None] = contextvars.ContextVar(
+    "timings", default=None
+)
+
+
+class collect_timings:
+    """Collect the phases timed in this context, including tasks it starts, into a dict."""
+
+    # A class rather than @contextmanager: that re-raises through a generator, which fails
+    # for the frozen AppError.
+    def __init__(self) -> None:
+        self.timings: dict[str, float] = {}
+        self._token: contextvars.Token[dict[str, float] | None] | None = None
+
+    def __enter__(self) -> dict[str, float]:
+        self._token = _TIMINGS_CTX.set(self.timings)
+        return self.timings
+
+    def __exit__(self, *exc_info: object) -> None:
+        assert self._token is not None
+        _TIMINGS_CTX.reset(self._token)
+
+
+def record_phase(name: str, since: float) -> None:
+    """Add the time since the ``perf_counter`` reading ``since`` to phase ``name``."""
+    timings = _TIMINGS_CTX.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + (time.perf_counter() - since) * 1000
+
+
+def add_phases(timings: dict[str, float]) -> None:
+    """Add phases collected in another context, such as a shared execution, to this one."""
+    current = _TIMINGS_CTX.get()
+    if current is not None:
+        for name, duration in timings.items():
+            current[name] = current.get(name, 0.0) + duration
+
+
+class timed:
+    """Add the time spent in the block to phase ``name``."""
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info: object) -> None:
+        record_phase(self._name, self._start)
+
+
+def server_timing(timings: dict[str, float]) -> str:
+    """Format ``timings`` as a Server-Timing header value."""
+    return ", ".join(f"{name};dur={duration:.1f}" for name, duration in timings.items())
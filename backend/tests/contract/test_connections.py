@@ -22,7 +22,12 @@ class FakeAdapter(DatabaseAdapter):
         return {"schemas": [], "relationships": []}
 
     async def execute_query(
-        self, connection_url: str, sql: str, timeout_seconds: int, max_rows: int
+        self,
+        connection_url: str,
+        sql: str,
+        timeout_seconds: int,
+        max_rows: int,
+        params: tuple[object, ...] = (),
     ) -> dict[str, object]:
         return {"columns": [{"name": "value", "type": "int"}], "rows": [[1]]}
 
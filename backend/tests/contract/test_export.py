@@ -23,7 +23,12 @@ class FakeAdapter(DatabaseAdapter):
         return {"schemas": [], "relationships": []}
 
     async def execute_query(
-        self, connection_url: str, sql: str, timeout_seconds: int, max_rows: int
+        self,
+        connection_url: str,
+        sql: str,
+        timeout_seconds: int,
+        max_rows: int,
+        params: tuple[object, ...] = (),
     ) -> dict[str, object]:
         return {"columns": [{"name": "value", "type": "int"}], "rows": [[1]]}
 
@@ -56,3 +61,10 @@ def test_export_contract() -> None:
     export_response = client.post("/api/v1/exports", json={"queryId": query_id, "format": "json"})
     assert export_response.status_code == 200
     assert export_response.json()["exportId"]
+
+    stats_response = client.get("/api/v1/exports/stats")
+    assert stats_response.status_code == 200
+    assert stats_response.json()["entries"] == 1
+
+    missing = client.post("/api/v1/exports", json={"queryId": "unknown", "format": "csv"})
+    assert missing.status_code == 404
@@ -0,0 +1,102 @@
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.src.adapters.base import AdapterCapabilities, DatabaseAdapter
+from backend.src.api.app import create_app
+from backend.src.services.adapter_registry import get_registry
+from backend.src.services.connection_service import get_connection_service
+from backend.src.services.export_service import get_export_service
+from backend.src.services.job_service import JobService
+from backend.src.services.query_service import QueryService
+
+
+class FakeAdapter(DatabaseAdapter):
+    @property
+    def dialect(self) -> str:
+        return "postgres"
+
+    @property
+    def capabilities(self) -> AdapterCapabilities:
+        return AdapterCapabilities(False, False, False, False)
+
+    async def test_connection(self, connection_url: str) -> None:
+        _ = connection_url
+
+    async def fetch_metadata(self, connection_url: str) -> dict[str, object]:
+        return {"schemas": [], "relationships": []}
+
+    async def execute_query(
+        self,
+        connection_url: str,
+        sql: str,
+        timeout_seconds: int,
+        max_rows: int,
+        params: tuple[object, ...] = (),
+    ) -> dict[str, object]:
+        if "pg_sleep" in sql.lower():
+            await asyncio.sleep(30)
+        return {
+            "columns": [{"name": "value", "type": "int4"}],
+            "rows": [[index] for index in range(25)],
+        }
+
+    async def cancel_query(self, query_id: str) -> bool:
+        return False
+
+
+def _wait_for(client: TestClient, url: str, statuses: set[str]) -> dict:
+    deadline = time.monotonic() + 5
+    while True:
+        job = client.get(url).json()
+        if job["status"] in statuses or time.monotonic() > deadline:
+            return job
+        time.sleep(0.02)
+
+
+def test_job_lifecycle(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    registry = get_registry()
+    registry.reset()
+    registry.set_adapter("postgres", FakeAdapter())
+    get_connection_service().clear()
+    get_export_service().reset()
+    service = JobService(
+        QueryService(registry, get_connection_service(), get_export_service()), result_dir=tmp_path
+    )
+    monkeypatch.setattr("backend.src.api.jobs._service", service)
+
+    with TestClient(create_app()) as client:
+        payload = {"name": "Jobs", "dbType": "postgres", "connectionUrl": "postgresql://db"}
+        connection_id = client.post("/api/v1/connections", json=payload).json()["id"]
+        jobs_url = f"/api/v1/connections/{connection_id}/jobs"
+
+        submitted = client.post(jobs_url, json={"sqlText": "select value from items"})
+        assert submitted.status_code == 202
+        job_url = f"{jobs_url}/{submitted.json()['id']}"
+        job = _wait_for(client, job_url, {"succeeded", "failed"})
+        assert job["status"] == "succeeded"
+        assert job["rowCount"] == 25
+
+        page = client.get(f"{job_url}/results", params={"offset": 10, "limit": 5}).json()
+        assert page["rows"] == [[10], [11], [12], [13], [14]]
+        assert page["totalRows"] == 25
+        assert page["columns"] == [{"name": "value", "type": "int4"}]
+
+        slow = client.post(
+            jobs_url, json={"sqlText": "select pg_sleep(30) from items", "priority": "batch"}
+        ).json()
+        slow_url = f"{jobs_url}/{slow['id']}"
+        assert _wait_for(client, slow_url, {"running"})["status"] == "running"
+        cancelled = client.delete(slow_url)
+        assert cancelled.json()["status"] == "cancelled"
+        assert client.get(f"{slow_url}/results").status_code == 409
+        assert client.delete(slow_url).json()["error"]["code"] == "JOB_FINISHED"
+
+        listed = client.get(jobs_url).json()["items"]
+        assert [item["id"] for item in listed[:2]] == [slow["id"], submitted.json()["id"]]
+
+        rejected = client.post(jobs_url, json={"sqlText": "delete from items"})
+        assert rejected.status_code == 400
@@ -0,0 +1,61 @@
+from fastapi.testclient import TestClient
+
+from backend.src.adapters.base import AdapterCapabilities, DatabaseAdapter
+from backend.src.api.app import create_app
+from backend.src.services.adapter_registry import get_registry
+from backend.src.services.connection_service import get_connection_service
+from backend.src.services.export_service import get_export_service
+from backend.src.utils.metrics import get_metrics
+
+
+class FakeAdapter(DatabaseAdapter):
+    @property
+    def dialect(self) -> str:
+        return "postgres"
+
+    @property
+    def capabilities(self) -> AdapterCapabilities:
+        return AdapterCapabilities(False, False, False, False)
+
+    async def test_connection(self, connection_url: str) -> None:
+        _ = connection_url
+
+    async def fetch_metadata(self, connection_url: str) -> dict[str, object]:
+        return {"schemas": [], "relationships": []}
+
+    async def execute_query(
+        self,
+        connection_url: str,
+        sql: str,
+        timeout_seconds: int,
+        max_rows: int,
+        params: tuple[object, ...] = (),
+    ) -> dict[str, object]:
+        return {"columns": [{"name": "value", "type": "int4"}], "rows": [[1], [2], [3]]}
+
+    async def cancel_query(self, query_id: str) -> bool:
+        return False
+
+
+def test_metrics_endpoint_reports_routes_and_queries() -> None:
+    registry = get_registry()
+    registry.reset()
+    registry.set_adapter("postgres", FakeAdapter())
+    get_connection_service().clear()
+    get_export_service().reset()
+    get_metrics().reset()
+
+    client = TestClient(create_app())
+    payload = {"name": "Metrics", "dbType": "postgres", "connectionUrl": "postgresql://db"}
+    connection_id = client.post("/api/v1/connections", json=payload).json()["id"]
+    client.post(f"/api/v1/connections/{connection_id}/query", json={"sqlText": "select 1"})
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    labels = 'route="/api/v1/connections/{connection_id}/query",method="POST",status="200"'
+    assert f"dbquery_http_request_duration_seconds_count{{{labels}}} 1" in text
+    assert f'dbquery_query_rows_total{{connection_id="{connection_id}"}} 3' in text
+    assert "dbquery_result_store_entries 1" in text
+    assert "# TYPE dbquery_pool_waiting_requests gauge" in text
@@ -1,13 +1,28 @@
+import asyncio
+import os
+
+import httpx
+import msgpack
+import pyarrow as pa
+import pytest
 from fastapi.testclient import TestClient
 
 from backend.src.api.app import create_app
 from backend.src.services.adapter_registry import get_registry
 from backend.src.services.export_service import get_export_service
 from backend.src.services.connection_service import get_connection_service
-from backend.src.adapters.base import AdapterCapabilities, DatabaseAdapter
+from backend.src.services.result_cache import get_result_cache
+from backend.src.adapters.base import AdapterCapabilities, DatabaseAdapter, QueryCancelledError
+from backend.src.adapters.postgres_adapter import PostgresAdapter
+
+# PostgreSQL server for the tests that need the real driver, such as
+# postgresql://postgres@localhost/postgres; they are skipped without one.
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
 
 
 class FakeAdapter(DatabaseAdapter):
+    def __init__(self) -> None:
+        self.executions = 0
     @property
     def dialect(self) -> str:
         return "postgres"
@@ -23,14 +38,86 @@ class FakeAdapter(DatabaseAdapter):
         return {"schemas": [], "relationships": []}
 
     async def execute_query(
-        self, connection_url: str, sql: str, timeout_seconds: int, max_rows: int
+        self,
+        connection_url: str,
+        sql: str,
+        timeout_seconds: int,
+        max_rows: int,
+        params: tuple[object, ...] = (),
     ) -> dict[str, object]:
+        self.executions += 1
         return {"columns": [{"name": "value", "type": "int"}], "rows": [[1]]}
 
     async def cancel_query(self, query_id: str) -> bool:
         return False
 
 
+class SlowAdapter(FakeAdapter):
+    def __init__(self) -> None:
+        super().__init__()
+        self.running = 0
+        self.peak = 0
+
+    async def execute_query(
+        self,
+        connection_url: str,
+        sql: str,
+        timeout_seconds: int,
+        max_rows: int,
+        params: tuple[object, ...] = (),
+    ) -> dict[str, object]:
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.05)
+        self.running -= 1
+        return await super().execute_query(connection_url, sql, timeout_seconds, max_rows)
+
+
+class BoundAdapter(FakeAdapter):
+    def __init__(self) -> None:
+        super().__init__()
+        self.bound: list[tuple[str, tuple[object, ...]]] = []
+
+    async def execute_query(
+        self,
+        connection_url: str,
+        sql: str,
+        timeout_seconds: int,
+        max_rows: int,
+        params: tuple[object, ...] = (),
+    ) -> dict[str, object]:
+        self.bound.append((sql, tuple(params)))
+        return await super().execute_query(connection_url, sql, timeout_seconds, max_rows)
+
+
+class CancellableAdapter(FakeAdapter):
+    def __init__(self) -> None:
+        super().__init__()
+        self.started = asyncio.Event()
+        self.cancelled: list[str] = []
+
+    @property
+    def capabilities(self) -> AdapterCapabilities:
+        return AdapterCapabilities(True, False, False, False)
+
+    async def execute_query(
+        self,
+        connection_url: str,
+        sql: str,
+        timeout_seconds: int,
+        max_rows: int,
+        params: tuple[object, ...] = (),
+    ) -> dict[str, object]:
+        self.started.set()
+        while not self.cancelled:
+            await asyncio.sleep(0.01)
+        raise QueryCancelledError("canceling statement due to user request")
+
+    async def cancel_query(self, query_id: str) -> bool:
+        self.cancelled.append(query_id)
+        return True
+
+
 def test_query_executes() -> None:
     registry = get_registry()
     registry.reset()
@@ -50,3 +137,264 @@ def test_query_executes() -> None:
     assert query_response.status_code == 200
     body = query_response.json()
     assert body["columns"][0]["name"] == "value"
+
+
+def test_repeated_query_is_served_from_cache() -> None:
+    adapter = FakeAdapter()
+    registry = get_registry()
+    registry.reset()
+    registry.set_adapter("postgres", adapter)
+    get_connection_service().clear()
+    get_export_service().reset()
+    get_result_cache().clear()
+
+    client = TestClient(create_app())
+    payload = {
+        "name": "Cached",
+        "dbType": "postgres",
+        "connectionUrl": "postgresql://db",
+        "resultCacheTtlSeconds": 60,
+    }
+    connection_id = client.post("/api/v1/connections", json=payload).json()["id"]
+
+    responses = [
+        client.post(f"/api/v1/connections/{connection_id}/query", json={"sqlText": sql})
+        for sql in ("select 1", "SELECT  1", "select 2")
+    ]
+    assert [response.headers["X-Cache"] for response in responses] == ["miss", "hit", "miss"]
+    assert responses[1].json()["cached"] is True
+    assert responses[1].json()["rows"] == [[1]]
+    assert adapter.executions == 2
+
+
+def test_query_binds_parameters_and_caches_per_value() -> None:
+    adapter = BoundAdapter()
+    registry = get_registry()
+    registry.reset()
+    registry.set_adapter("postgres", adapter)
+    get_connection_service().clear()
+    get_export_service().reset()
+    get_result_cache().clear()
+
+    client = TestClient(create_app())
+    payload = {
+        "name": "Bound",
+        "dbType": "postgres",
+        "connectionUrl": "postgresql://db",
+        "resultCacheTtlSeconds": 60,
+    }
+    connection_id = client.post("/api/v1/connections", json=payload).json()["id"]
+    url = f"/api/v1/connections/{connection_id}/query"
+    sql = "select * from orders where region = :region and total > :total"
+
+    responses = [
+        client.post(url, json={"sqlText": sql, "params": params})
+        for params in ({"region": "eu", "total": 10}, {"region": "us", "total": 10})
+    ]
+    responses.append(
+        client.post(url, json={"sqlText": sql, "params": {"total": 10, "region": "eu"}})
+    )
+    assert [response.headers["X-Cache"] for response in responses] == ["miss", "miss", "hit"]
+    assert adapter.bound == [
+        ("SELECT * FROM orders WHERE region = $1 AND total > $2 LIMIT 1000", ("eu", 10)),
+        ("SELECT * FROM orders WHERE region = $1 AND total > $2 LIMIT 1000", ("us", 10)),
+    ]
+
+    missing = client.post(url, json={"sqlText": sql, "params": {"region": "eu"}})
+    assert missing.status_code == 400
+    assert missing.json()["error"]["code"] == "INVALID_PARAMETERS"
+    assert missing.json()["error"]["details"]["missing"] == [":total"]
+
+
+@pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+def test_query_converts_date_parameter_for_postgres() -> None:
+    registry = get_registry()
+    registry.reset()
+    registry.set_adapter("postgres", PostgresAdapter())
+    get_connection_service().clear()
+    get_export_service().reset()
+    get_result_cache().clear()
+
+    with TestClient(create_app()) as client:
+        payload = {"name": "Postgres", "dbType": "postgres", "connectionUrl": POSTGRES_URL}
+        connection_id = client.post("/api/v1/connections", json=payload).json()["id"]
+        sql = (
+            "select d from (values (date '2024-01-02'), (date '2023-12-31')) as v(d)"
+            " where d >= :since"
+        )
+        response = client.post(
+            f"/api/v1/connections/{connection_id}/query",
+            json={"sqlText": sql, "params": {"since": "2024-01-01"}},
+        )
+        invalid = client.post(
+            f"/api/v1/connections/{connection_id}/query",
+            json={"sqlText": sql, "params": {"since": "abc"}},
+        )
+    assert response.status_code == 200
+    assert response.json()["rows"] == [["2024-01-02"]]
+    assert invalid.status_code == 400
+    assert invalid.json()["error"]["code"] == "INVALID_PARAMETERS"
+
+
+def test_query_result_encoding_follows_accept() -> None:
+    registry = get_registry()
+    registry.reset()
+    registry.set_adapter("postgres", FakeAdapter())
+    get_connection_service().clear()
+    get_export_service().reset()
+
+    client = TestClient(create_app())
+    payload = {"name": "Encoded", "dbType": "postgres", "connectionUrl": "postgresql://db"}
+    connection_id = client.post("/api/v1/connections", json=payload).json()["id"]
+    url = f"/api/v1/connections/{connection_id}/query"
+
+    columnar = client.post(
+        url,
+        json={"sqlText": "select 1"},
+        headers={"Accept": "application/vnd.dbquery.columnar+json"},
+    )
+    assert columnar.headers["content-type"] == "application/vnd.dbquery.columnar+json"
+    assert "Accept" in columnar.headers["vary"]
+    assert columnar.json()["data"] == [[1]]
+    assert columnar.json()["rowCount"] == 1
+
+    packed = client.post(
+        url, json={"sqlText": "select 1"}, headers={"Accept": "application/x-msgpack"}
+    )
+    assert msgpack.unpackb(packed.content)["columns"] == [{"name": "value", "type": "int"}]
+
+    arrow = client.post(
+        url, json={"sqlText": "select 1"}, headers={"Accept": "application/vnd.apache.arrow.stream"}
+    )
+    table = pa.ipc.open_stream(arrow.content).read_all()
+    assert table.column("value").to_pylist() == [1]
+    assert table.schema.field("value").metadata[b"dbquery.type"] == b"int"
+
+    rejected = client.post(url, json={"sqlText": "select 1"}, headers={"Accept": "text/csv"})
+    assert rejected.status_code == 406
+    assert rejected.json()["error"]["code"] == "NOT_ACCEPTABLE"
+
+
+def test_batch_runs_queries_concurrently_in_order() -> None:
+    adapter = SlowAdapter()
+    registry = get_registry()
+    registry.reset()
+    registry.set_adapter("postgres", adapter)
+    get_connection_service().clear()
+    get_export_service().reset()
+    get_result_cache().clear()
+
+    client = TestClient(create_app())
+    payload = {"name": "Batch", "dbType": "postgres", "connectionUrl": "postgresql://db"}
+    connection_id = client.post("/api/v1/connections", json=payload).json()["id"]
+
+    queries = [
+        {"sqlText": "select value from a"},
+        {"sqlText": "delete from a"},
+        {"sqlText": "select value from b"},
+        {"sqlText": "select value from c"},
+    ]
+    response = client.post(
+        f"/api/v1/connections/{connection_id}/query/batch", json={"queries": queries}
+    )
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["status"] for item in items] == [200, 400, 200, 200]
+    assert items[0]["result"]["rows"] == [[1]]
+    assert items[1]["result"] is None
+    assert items[1]["error"]["code"] == "INVALID_SQL"
+    assert adapter.executions == 3
+    assert adapter.peak == 3
+
+    empty = client.post(f"/api/v1/connections/{connection_id}/query/batch", json={"queries": []})
+    assert empty.status_code == 422
+
+
+def test_query_reports_server_timing() -> None:
+    registry = get_registry()
+    registry.reset()
+    registry.set_adapter("postgres", FakeAdapter())
+    get_connection_service().clear()
+    get_export_service().reset()
+    get_result_cache().clear()
+
+    client = TestClient(create_app())
+    payload = {"name": "Timing", "dbType": "postgres", "connectionUrl": "postgresql://db"}
+    connection_id = client.post("/api/v1/connections", json=payload).json()["id"]
+    url = f"/api/v1/connections/{connection_id}/query"
+
+    plain = client.post(url, json={"sqlText": "select value from timed"})
+    phases = [entry.split(";")[0] for entry in plain.headers["Server-Timing"].split(", ")]
+    assert phases[0] == "validate"
+    assert {"queue", "store", "serialize", "total"} <= set(phases)
+    assert plain.json()["timings"] is None
+
+    detailed = client.post(url, json={"sqlText": "select value from timed", "includeTimings": True})
+    timings = detailed.json()["timings"]
+    assert "validate" in timings and "serialize" not in timings
+
+    batch = client.post(f"{url}/batch", json={"queries": [{"sqlText": "select value from b"}]})
+    assert {"validate", "queue", "serialize", "total"} <= _phases(batch)
+    streamed = client.post(f"{url}/stream", json={"sqlText": "select value from s"})
+    assert {"validate", "guard", "queue", "total"} <= _phases(streamed)
+
+
+async def test_joined_execution_reports_its_phases_to_every_caller() -> None:
+    adapter = SlowAdapter()
+    registry = get_registry()
+    registry.reset()
+    registry.set_adapter("postgres", adapter)
+    get_connection_service().clear()
+    get_export_service().reset()
+    get_result_cache().clear()
+
+    transport = httpx.ASGITransport(create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        payload = {"name": "Joined", "dbType": "postgres", "connectionUrl": "postgresql://db"}
+        connection_id = (await client.post("/api/v1/connections", json=payload)).json()["id"]
+        url = f"/api/v1/connections/{connection_id}/query"
+        responses = await asyncio.gather(
+            *(client.post(url, json={"sqlText": "select value from shared"}) for _ in range(2))
+        )
+    assert adapter.executions == 1
+    for response in responses:
+        assert {"guard", "queue", "store", "total"} <= _phases(response)
+
+
+def _phases(response: httpx.Response) -> set[str]:
+    return {entry.split(";")[0] for entry in response.headers["Server-Timing"].split(", ")}
+
+
+async def test_running_query_is_cancelled_by_its_request_id() -> None:
+    adapter = CancellableAdapter()
+    registry = get_registry()
+    registry.reset()
+    registry.set_adapter("postgres", adapter)
+    get_connection_service().clear()
+    get_export_service().reset()
+    get_result_cache().clear()
+
+    transport = httpx.ASGITransport(create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        payload = {"name": "Cancel", "dbType": "postgres", "connectionUrl": "postgresql://db"}
+        connection_id = (await client.post("/api/v1/connections", json=payload)).json()["id"]
+        url = f"/api/v1/connections/{connection_id}/query"
+        running = asyncio.ensure_future(
+            client.post(
+                url, json={"sqlText": "select value from slow"}, headers={"X-Request-Id": "q-1"}
+            )
+        )
+        await asyncio.wait_for(adapter.started.wait(), timeout=5)
+
+        missing = await client.delete(f"{url}/q-2")
+        cancel = await client.delete(f"{url}/q-1")
+        response = await running
+
+    assert missing.status_code == 404
+    assert missing.json()["error"]["code"] == "QUERY_NOT_FOUND"
+    assert cancel.status_code == 200
+    assert cancel.json() == {"queryId": "q-1", "cancelled": True}
+    assert response.status_code == 409
+    assert response.json()["error"]["code"] == "QUERY_CANCELLED"
+    assert response.json()["error"]["details"]["requestId"] == "q-1"
+    assert len(adapter.cancelled) == 1
@@ -0,0 +1,160 @@
+import json
+from decimal import Decimal
+from typing import Any, AsyncIterator
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import ClientDisconnect
+
+from backend.src.api.app import create_app
+from backend.src.api.query import _QueryStreamResponse
+from backend.src.models.connections import ConnectionCreate
+from backend.src.models.query import QueryRequest
+from backend.src.services.adapter_registry import AdapterRegistry, get_registry
+from backend.src.services.connection_service import ConnectionService, get_connection_service
+from backend.src.services.query_scheduler import QueryScheduler
+from backend.src.services.query_service import QueryService
+from backend.src.adapters.base import AdapterCapabilities, DatabaseAdapter
+
+
+class FakeAdapter(DatabaseAdapter):
+    @property
+    def dialect(self) -> str:
+        return "postgres"
+
+    @property
+    def capabilities(self) -> AdapterCapabilities:
+        return AdapterCapabilities(False, False, False, False)
+
+    async def test_connection(self, connection_url: str) -> None:
+        _ = connection_url
+
+    async def fetch_metadata(self, connection_url: str) -> dict[str, object]:
+        return {"schemas": [], "relationships": []}
+
+    async def execute_query(
+        self,
+        connection_url: str,
+        sql: str,
+        timeout_seconds: int,
+        max_rows: int,
+        params: tuple[object, ...] = (),
+    ) -> dict[str, object]:
+        return {"columns": [{"name": "value", "type": "int"}], "rows": [[1]]}
+
+    async def stream_query(
+        self,
+        connection_url: str,
+        sql: str,
+        timeout_seconds: int,
+        max_rows: int,
+        params: tuple[object, ...] = (),
+    ) -> AsyncIterator[dict[str, Any]]:
+        columns = [{"name": "value", "type": "int"}]
+        yield {"columns": columns, "rows": [[1], [2]]}
+        yield {"columns": columns, "rows": [[3]]}
+
+    async def cancel_query(self, query_id: str) -> bool:
+        return False
+
+
+class TypedAdapter(FakeAdapter):
+    columns = [{"name": "amount", "type": "numeric"}, {"name": "payload", "type": "bytea"}]
+    rows = [[Decimal("1.50"), b"ab"], [None, None]]
+
+    async def execute_query(
+        self,
+        connection_url: str,
+        sql: str,
+        timeout_seconds: int,
+        max_rows: int,
+        params: tuple[object, ...] = (),
+    ) -> dict[str, object]:
+        return {"columns": self.columns, "rows": [list(row) for row in self.rows]}
+
+    async def stream_query(
+        self,
+        connection_url: str,
+        sql: str,
+        timeout_seconds: int,
+        max_rows: int,
+        params: tuple[object, ...] = (),
+    ) -> AsyncIterator[dict[str, Any]]:
+        yield {"columns": self.columns, "rows": [list(row) for row in self.rows]}
+
+
+def test_query_stream_encodes_values_like_buffered_query() -> None:
+    registry = get_registry()
+    registry.reset()
+    registry.set_adapter("postgres", TypedAdapter())
+    get_connection_service().clear()
+
+    client = TestClient(create_app())
+    payload = {"name": "Typed", "dbType": "postgres", "connectionUrl": "postgresql://typed"}
+    connection_id = client.post("/api/v1/connections", json=payload).json()["id"]
+    body = {"sqlText": "select amount, payload from t", "timeoutSeconds": 30, "maxRows": 1000}
+
+    buffered = client.post(f"/api/v1/connections/{connection_id}/query", json=body).json()
+    stream_response = client.post(f"/api/v1/connections/{connection_id}/query/stream", json=body)
+    lines = [json.loads(line) for line in stream_response.text.splitlines()]
+
+    assert lines[1]["rows"] == buffered["rows"]
+    assert lines[1]["rows"][0][0] == "1.50"
+
+
+def test_query_stream_emits_ndjson() -> None:
+    registry = get_registry()
+    registry.reset()
+    registry.set_adapter("postgres", FakeAdapter())
+    get_connection_service().clear()
+
+    client = TestClient(create_app())
+    payload = {"name": "Local", "dbType": "postgres", "connectionUrl": "postgresql://db"}
+    response = client.post("/api/v1/connections", json=payload)
+    connection_id = response.json()["id"]
+
+    stream_response = client.post(
+        f"/api/v1/connections/{connection_id}/query/stream",
+        json={"sqlText": "select 1", "timeoutSeconds": 30, "maxRows": 1000},
+    )
+    assert stream_response.status_code == 200
+    assert stream_response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in stream_response.text.splitlines()]
+    assert lines[0]["type"] == "header"
+    assert lines[0]["columns"][0]["name"] == "value"
+    assert [line["type"] for line in lines[1:]] == ["rows", "rows", "end"]
+    assert lines[-1]["rowCount"] == 3
+
+
+async def test_stream_that_never_starts_gives_its_slot_back() -> None:
+    registry = AdapterRegistry()
+    registry.set_adapter("postgres", FakeAdapter())
+    connections = ConnectionService(registry)
+    connection = await connections.create_connection(
+        ConnectionCreate(
+            name="Stream",
+            db_type="postgres",
+            connection_url=f"postgresql://{uuid4()}",
+            max_concurrent_queries=1,
+        )
+    )
+    service = QueryService(registry, connections, scheduler=QueryScheduler())
+    stream = await service.stream_query(connection.id, QueryRequest(sql_text="select 1"))
+    assert service.queue_stats(connection.id).active == 1
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict[str, Any]) -> None:
+        raise OSError("client went away")
+
+    # The client is gone before the first chunk, so the body is never iterated.
+    scope = {"type": "http", "asgi": {"spec_version": "2.4"}}
+    with pytest.raises(ClientDisconnect):
+        await _QueryStreamResponse(stream)(scope, receive, send)
+    assert service.queue_stats(connection.id).active == 0
+
+    stream = await service.stream_query(connection.id, QueryRequest(sql_text="select 1"))
+    await stream.close()
+    assert service.queue_stats(connection.id).active == 0
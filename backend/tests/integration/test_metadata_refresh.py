@@ -2,6 +2,7 @@ from fastapi.testclient import TestClient
 
 from backend.src.api.app import create_app
 from backend.src.adapters.base import AdapterCapabilities, DatabaseAdapter
+from backend.src.adapters.schema_filter import SchemaFilter
 from backend.src.services.adapter_registry import get_registry
 from backend.src.services.connection_service import get_connection_service
 
@@ -18,8 +19,10 @@ class FakeAdapter(DatabaseAdapter):
     async def test_connection(self, connection_url: str) -> None:
         _ = connection_url
 
-    async def fetch_metadata(self, connection_url: str) -> dict[str, object]:
-        _ = connection_url
+    async def fetch_metadata(
+        self, connection_url: str, schema_filter: SchemaFilter | None = None
+    ) -> dict[str, object]:
+        _ = connection_url, schema_filter
         return {
             "schemas": [{"name": "public"}],
             "tables": [{"schema": "public", "name": "users"}],
@@ -29,7 +32,12 @@ class FakeAdapter(DatabaseAdapter):
         }
 
     async def execute_query(
-        self, connection_url: str, sql: str, timeout_seconds: int, max_rows: int
+        self,
+        connection_url: str,
+        sql: str,
+        timeout_seconds: int,
+        max_rows: int,
+        params: tuple[object, ...] = (),
     ) -> dict[str, object]:
         return {"columns": [{"name": "value", "type": "int"}], "rows": [[1]]}
 
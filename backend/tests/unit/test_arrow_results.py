@@ -0,0 +1,33 @@
+from decimal import Decimal
+from pathlib import Path
+
+from backend.src.services.arrow_results import ArrowResultWriter, read_arrow_rows
+
+
+def test_result_writer_widens_columns_that_stop_fitting(tmp_path: Path) -> None:
+    path = tmp_path / "result.arrow"
+    writer = ArrowResultWriter(path, 3)
+    writer.write([[1, None, Decimal("1.50")], [2, None, Decimal("2.25")]])
+    writer.write([[3, "late", Decimal("3.5")]])
+    writer.write([[{"id": 4}, None, None]])
+    writer.close()
+
+    assert writer.row_count == 4
+    assert read_arrow_rows(path, 0, 10) == [
+        [1, None, Decimal("1.50")],
+        [2, None, Decimal("2.25")],
+        [3, "late", Decimal("3.5")],
+        [{"id": 4}, None, None],
+    ]
+    assert [entry.name for entry in tmp_path.iterdir()] == ["result.arrow"]
+
+
+def test_discarded_result_leaves_no_file(tmp_path: Path) -> None:
+    writer = ArrowResultWriter(tmp_path / "result.arrow", 1)
+    writer.write([[1]])
+    writer.discard()
+    assert list(tmp_path.iterdir()) == []
+
+    empty = ArrowResultWriter(tmp_path / "empty.arrow", 2)
+    empty.close()
+    assert read_arrow_rows(tmp_path / "empty.arrow", 0, 10) == []
@@ -0,0 +1,104 @@
+import asyncio
+import gzip
+import zlib
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from backend.src.api.compression import (
+    ENCODINGS,
+    CompressionMiddleware,
+    compressed,
+    negotiate_content_encoding,
+)
+
+BODY = "row,value\n" * 500
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/large")
+    @compressed()
+    def large() -> PlainTextResponse:
+        return PlainTextResponse(BODY)
+
+    @app.get("/small")
+    @compressed()
+    def small() -> PlainTextResponse:
+        return PlainTextResponse("tiny")
+
+    @app.get("/unmarked")
+    def unmarked() -> PlainTextResponse:
+        return PlainTextResponse(BODY)
+
+    @app.get("/stream")
+    @compressed()
+    def stream() -> StreamingResponse:
+        async def lines():
+            for index in range(3):
+                yield f"line {index}\n".encode()
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    return app
+
+
+def test_negotiate_prefers_server_order_on_equal_quality() -> None:
+    assert negotiate_content_encoding("gzip, br, zstd") == next(iter(ENCODINGS))
+    assert negotiate_content_encoding("gzip;q=1, *;q=0.5") == "gzip"
+    assert negotiate_content_encoding("gzip;q=0, identity") is None
+    assert negotiate_content_encoding(None) is None
+
+
+def test_marked_routes_are_compressed_above_threshold() -> None:
+    client = TestClient(_app())
+    headers = {"Accept-Encoding": "gzip"}
+
+    large = client.get("/large", headers=headers)
+    assert large.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in large.headers["vary"]
+    assert large.text == BODY
+    assert int(large.headers["content-length"]) < len(BODY)
+
+    small = client.get("/small", headers=headers)
+    assert "content-encoding" not in small.headers
+    assert small.text == "tiny"
+
+    assert "content-encoding" not in client.get("/unmarked", headers=headers).headers
+
+
+def test_streamed_chunks_are_decodable_as_they_arrive() -> None:
+    messages = []
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/stream",
+        "raw_path": b"/stream",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"accept-encoding", b"gzip")],
+        "scheme": "http",
+        "server": ("testserver", 80),
+        "client": ("testclient", 50000),
+        "http_version": "1.1",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+    }
+    asyncio.run(_app()(scope, receive, send))
+
+    start = dict(messages[0]["headers"])
+    assert start[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in start
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    chunks = [decoder.decompress(message["body"]) for message in messages[1:]]
+    assert chunks[:3] == [b"line 0\n", b"line 1\n", b"line 2\n"]
+    assert gzip.decompress(b"".join(message["body"] for message in messages[1:]))
@@ -0,0 +1,124 @@
+import pytest
+
+from backend.src.adapters.base import AdapterCapabilities, DatabaseAdapter, QueryPlanEstimate
+from backend.src.adapters.explain import summarize_mysql_plan, summarize_postgres_plan
+from backend.src.services.cost_guard import CostGuard, CostGuardPolicy, PlanCache
+from backend.src.utils.app_errors import AppError
+
+POSTGRES_PLAN = [
+    {
+        "Plan": {
+            "Node Type": "Limit",
+            "Total Cost": 45.2,
+            "Plan Rows": 1000,
+            "Plans": [
+                {
+                    "Node Type": "Nested Loop",
+                    "Total Cost": 9e9,
+                    "Plan Rows": 4e9,
+                    "Plans": [
+                        {
+                            "Node Type": "Seq Scan",
+                            "Schema": "public",
+                            "Relation Name": "a",
+                            "Plan Rows": 2e5,
+                        },
+                        {
+                            "Node Type": "Seq Scan",
+                            "Schema": "public",
+                            "Relation Name": "b",
+                            "Plan Rows": 2e4,
+                        },
+                    ],
+                }
+            ],
+        }
+    }
+]
+
+MARIADB_PLAN = """
+{"query_block": {"select_id": 1, "cost": 812.5, "nested_loop": [
+  {"table": {"table_name": "a", "access_type": "ALL", "rows": 2000}},
+  {"table": {"table_name": "b", "access_type": "ALL", "rows": 300}}
+]}}
+"""
+
+
+class ExplainingAdapter(DatabaseAdapter):
+    def __init__(self, estimate: QueryPlanEstimate) -> None:
+        self.estimate = estimate
+        self.explains = 0
+
+    @property
+    def dialect(self) -> str:
+        return "postgres"
+
+    @property
+    def capabilities(self) -> AdapterCapabilities:
+        return AdapterCapabilities(False, False, False, False, supports_explain=True)
+
+    async def test_connection(self, connection_url: str) -> None:
+        _ = connection_url
+
+    async def fetch_metadata(self, connection_url: str) -> dict[str, object]:
+        return {"schemas": [], "relationships": []}
+
+    async def execute_query(
+        self,
+        connection_url: str,
+        sql: str,
+        timeout_seconds: int,
+        max_rows: int,
+        params: tuple[object, ...] = (),
+    ) -> dict[str, object]:
+        return {"columns": [], "rows": []}
+
+    async def explain_query(
+        self, connection_url: str, sql: str, timeout_seconds: int, params: tuple[object, ...] = ()
+    ) -> QueryPlanEstimate | None:
+        self.explains += 1
+        return self.estimate
+
+    async def cancel_query(self, query_id: str) -> bool:
+        return False
+
+
+def test_postgres_plan_reports_largest_intermediate_rows() -> None:
+    estimate = summarize_postgres_plan(POSTGRES_PLAN)
+    assert estimate.total_cost == 45.2
+    assert estimate.estimated_rows == 4e9
+    assert [scan["relation"] for scan in estimate.summary["scans"]] == ["public.a", "public.b"]
+
+
+def test_mariadb_plan_multiplies_nested_loop_rows() -> None:
+    estimate = summarize_mysql_plan(MARIADB_PLAN)
+    assert estimate.total_cost == 812.5
+    assert estimate.estimated_rows == 600_000
+    assert estimate.summary["scans"][0] == {"relation": "a", "accessType": "ALL", "rows": 2000.0}
+
+
+async def test_cost_guard_rejects_and_caches_plans() -> None:
+    adapter = ExplainingAdapter(summarize_postgres_plan(POSTGRES_PLAN))
+    guard = CostGuard(PlanCache(max_entries=8, ttl_seconds=60))
+    policy = CostGuardPolicy(mode="reject", max_cost=None, max_estimated_rows=1e6)
+
+    for _ in range(2):
+        with pytest.raises(AppError) as exc_info:
+            await guard.check(adapter, "postgresql://db", "SELECT 1", policy, 5)
+        assert exc_info.value.code == "QUERY_TOO_EXPENSIVE"
+        assert exc_info.value.details is not None
+        assert exc_info.value.details["plan"]["estimatedRows"] == 4e9
+    assert adapter.explains == 1
+
+
+async def test_cost_guard_warns_or_skips() -> None:
+    adapter = ExplainingAdapter(QueryPlanEstimate(total_cost=5e6, estimated_rows=10, summary={}))
+    guard = CostGuard(PlanCache(max_entries=8, ttl_seconds=60))
+
+    warn = CostGuardPolicy(mode="warn", max_cost=1e6, max_estimated_rows=None)
+    warnings = await guard.check(adapter, "postgresql://db", "SELECT 1", warn, 5)
+    assert warnings and "maxCost" in warnings[0]
+
+    off = CostGuardPolicy(mode="off", max_cost=1e6, max_estimated_rows=None)
+    assert await guard.check(adapter, "postgresql://db", "SELECT 2", off, 5) == []
+    assert adapter.explains == 1
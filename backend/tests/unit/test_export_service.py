@@ -0,0 +1,103 @@
+import json
+import os
+import time
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from backend.src.services.export_service import ExportService
+from backend.src.utils.app_errors import AppError
+
+COLUMNS = [{"name": "id", "type": "int"}, {"name": "label", "type": "text"}]
+
+
+def _rows(count: int) -> list[list[object]]:
+    return [[index, f"row-{index}"] for index in range(count)]
+
+
+def _entry_bytes(tmp_path: Path, rows: int) -> int:
+    probe = ExportService(tmp_path / "probe", max_bytes=1 << 30, ttl_seconds=60)
+    probe.store_result("probe", COLUMNS, _rows(rows))
+    return probe.stats().size_bytes
+
+
+def test_results_spill_to_arrow_files_and_export_from_them(tmp_path: Path) -> None:
+    service = ExportService(tmp_path, max_bytes=1 << 30, ttl_seconds=60)
+    columns = [*COLUMNS, {"name": "payload", "type": "json"}, {"name": "amount", "type": "numeric"}]
+    rows = [
+        [1, "a", {"tags": ["x"]}, Decimal("1.50")],
+        [2, None, {"other": 2}, None],
+    ]
+    service.store_result("q1", columns, rows)
+    assert list((tmp_path / "results").glob("*.arrow"))
+
+    _, csv_path = service.export_csv("q1")
+    assert csv_path.read_text().splitlines() == [
+        "id,label,payload,amount",
+        "1,a,{'tags': ['x']},1.50",
+        "2,,{'other': 2},",
+    ]
+    service.reset()
+    assert not list((tmp_path / "results").glob("*.arrow"))
+
+
+def test_decimals_keep_their_text_in_exports(tmp_path: Path) -> None:
+    service = ExportService(tmp_path, max_bytes=1 << 30, ttl_seconds=60)
+    columns = [{"name": "amount", "type": "numeric"}]
+    service.store_result("q1", columns, [[Decimal("1.5")], [Decimal("2.25")], [Decimal("1E+2")]])
+
+    _, csv_path = service.export_csv("q1")
+    assert csv_path.read_text().splitlines() == ["amount", "1.5", "2.25", "1E+2"]
+
+
+def test_startup_removes_only_result_files_older_than_the_ttl(tmp_path: Path) -> None:
+    live = ExportService(tmp_path, max_bytes=1 << 30, ttl_seconds=60)
+    live.store_result("live", COLUMNS, _rows(3))
+    stale = tmp_path / "results" / "stale.arrow"
+    stale.write_bytes(b"")
+    os.utime(stale, (time.time() - 120, time.time() - 120))
+
+    ExportService(tmp_path, max_bytes=1 << 30, ttl_seconds=60)
+    assert not stale.exists()
+    _, csv_path = live.export_csv("live")
+    assert len(csv_path.read_text().splitlines()) == 4
+
+
+def test_store_evicts_least_recently_used_by_bytes(tmp_path: Path) -> None:
+    entry_bytes = _entry_bytes(tmp_path, 50)
+    service = ExportService(tmp_path, max_bytes=entry_bytes * 3, ttl_seconds=60)
+    for query_id in ("q1", "q2", "q3"):
+        service.store_result(query_id, COLUMNS, _rows(50))
+    service.export_csv("q1")  # q1 becomes most recently used
+    service.store_result("q4", COLUMNS, _rows(50))
+
+    with pytest.raises(AppError) as exc_info:
+        service.export_csv("q2")
+    assert exc_info.value.code == "EXPORT_EXPIRED"
+    assert exc_info.value.status_code == 410
+    _, json_path = service.export_json("q1")
+    assert json.loads(json_path.read_text())[49] == {"id": 49, "label": "row-49"}
+
+    stats = service.stats()
+    assert (stats.entries, stats.evicted) == (3, 1)
+    assert stats.size_bytes <= stats.max_bytes
+    assert len(list((tmp_path / "results").glob("*.arrow"))) == 3
+
+
+def test_expired_and_oversized_results_report_expiry(tmp_path: Path) -> None:
+    service = ExportService(tmp_path, max_bytes=_entry_bytes(tmp_path, 10), ttl_seconds=60)
+    service.store_result("small", COLUMNS, _rows(1))
+    service._results["small"].expires_at = 0  # noqa: SLF001
+    service.store_result("huge", COLUMNS, _rows(1000))
+
+    for query_id, reason in (("small", "expired"), ("huge", "rejected")):
+        with pytest.raises(AppError) as exc_info:
+            service.export_csv(query_id)
+        assert exc_info.value.details == {"queryId": query_id, "reason": reason}
+
+    with pytest.raises(AppError) as exc_info:
+        service.export_csv("unknown")
+    assert exc_info.value.code == "EXPORT_NOT_FOUND"
+    stats = service.stats()
+    assert (stats.entries, stats.size_bytes, stats.expired, stats.rejected) == (0, 0, 1, 1)
@@ -0,0 +1,168 @@
+import asyncio
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from uuid import uuid4
+
+from backend.src.adapters.base import AdapterCapabilities, DatabaseAdapter
+from backend.src.models.connections import ConnectionCreate
+from backend.src.models.jobs import JobSubmitRequest
+from backend.src.repositories.history_repo import create_history_tables
+from backend.src.repositories.sqlite import get_sqlite_connection
+from backend.src.services.adapter_registry import AdapterRegistry
+from backend.src.services.connection_service import ConnectionService
+from backend.src.services.job_service import LEASE_SECONDS, JobService
+from backend.src.services.query_scheduler import QueryScheduler
+from backend.src.services.query_service import QueryService
+
+
+class FakeAdapter(DatabaseAdapter):
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+
+    @property
+    def dialect(self) -> str:
+        return "postgres"
+
+    @property
+    def capabilities(self) -> AdapterCapabilities:
+        return AdapterCapabilities(False, False, False, False)
+
+    async def test_connection(self, connection_url: str) -> None:
+        _ = connection_url
+
+    async def fetch_metadata(self, connection_url: str) -> dict[str, object]:
+        return {"schemas": [], "relationships": []}
+
+    async def execute_query(
+        self,
+        connection_url: str,
+        sql: str,
+        timeout_seconds: int,
+        max_rows: int,
+        params: tuple[object, ...] = (),
+    ) -> dict[str, object]:
+        if "batch" in sql:
+            await self.release.wait()
+        return {"columns": [{"name": "id", "type": "int4"}], "rows": [[1]]}
+
+    async def cancel_query(self, query_id: str) -> bool:
+        return False
+
+
+async def _wait_for(service: JobService, connection_id: str, job_id: str, status: str) -> None:
+    for _ in range(200):
+        if (await service.get(connection_id, job_id)).status == status:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} never reached {status}")
+
+
+async def test_batch_backlog_does_not_hold_up_interactive_jobs(tmp_path) -> None:
+    adapter = FakeAdapter()
+    registry = AdapterRegistry()
+    registry.set_adapter("postgres", adapter)
+    connections = ConnectionService(registry)
+    connection = await connections.create_connection(
+        ConnectionCreate(name="Jobs", db_type="postgres", connection_url="postgresql://db")
+    )
+    service = JobService(QueryService(registry, connections), result_dir=tmp_path, batch_workers=1)
+
+    first = await service.submit(
+        connection.id, JobSubmitRequest(sql_text="select id from batch_a", priority="batch")
+    )
+    second = await service.submit(
+        connection.id, JobSubmitRequest(sql_text="select id from batch_b", priority="batch")
+    )
+    await _wait_for(service, connection.id, first.id, "running")
+    waiting = await service.get(connection.id, second.id)
+    assert (waiting.status, waiting.queue_position) == ("queued", 0)
+
+    interactive = await service.submit(
+        connection.id, JobSubmitRequest(sql_text="select id from users")
+    )
+    await _wait_for(service, connection.id, interactive.id, "succeeded")
+    assert (await service.get(connection.id, second.id)).status == "queued"
+
+    adapter.release.set()
+    await _wait_for(service, connection.id, second.id, "succeeded")
+    page = await service.results(connection.id, second.id, offset=0, limit=10)
+    assert page.rows == [[1]]
+
+
+async def test_only_jobs_with_a_lapsed_heartbeat_are_interrupted(tmp_path) -> None:
+    registry = AdapterRegistry()
+    registry.set_adapter("postgres", FakeAdapter())
+    service = JobService(QueryService(registry, ConnectionService(registry)), result_dir=tmp_path)
+    connection_id = str(uuid4())
+    now = datetime.now(timezone.utc)
+    abandoned, live = str(uuid4()), str(uuid4())
+    async with get_sqlite_connection() as conn:
+        await create_history_tables(conn)
+        for job_id, heartbeat in (
+            (abandoned, now - timedelta(seconds=LEASE_SECONDS + 1)),
+            (live, now),
+        ):
+            await conn.execute(
+                "INSERT INTO query_history (id, connection_id, sql_text, source, started_at, "
+                "duration_ms, row_count, status, priority, submitted_at, heartbeat_at) "
+                "VALUES (?, ?, 'select 1', 'job', ?, 0, 0, 'running', 'batch', ?, ?)",
+                (job_id, connection_id, now.isoformat(), now.isoformat(), heartbeat.isoformat()),
+            )
+        await conn.commit()
+
+    jobs = {job.id: job for job in (await service.list_jobs(connection_id)).items}
+    assert jobs[abandoned].status == "failed"
+    assert jobs[abandoned].error is not None
+    assert jobs[abandoned].error.code == "JOB_INTERRUPTED"
+    assert jobs[live].status == "running"
+
+
+class WideAdapter(FakeAdapter):
+    async def stream_query(
+        self,
+        connection_url: str,
+        sql: str,
+        timeout_seconds: int,
+        max_rows: int,
+        params: Sequence[Any] = (),
+    ) -> AsyncIterator[dict[str, Any]]:
+        columns = [{"name": "id", "type": "int4"}]
+        for start in range(0, max_rows, 1000):
+            rows = [[index] for index in range(start, min(start + 1000, max_rows))]
+            yield {"columns": columns, "rows": rows}
+
+
+async def test_jobs_stream_past_the_query_cap_and_wait_out_a_full_queue(tmp_path) -> None:
+    registry = AdapterRegistry()
+    registry.set_adapter("postgres", WideAdapter())
+    connections = ConnectionService(registry)
+    connection = await connections.create_connection(
+        ConnectionCreate(
+            name="Wide",
+            db_type="postgres",
+            connection_url="postgresql://db",
+            max_concurrent_queries=1,
+            max_queued_queries=0,
+        )
+    )
+    scheduler = QueryScheduler()
+    service = JobService(
+        QueryService(registry, connections, scheduler=scheduler), result_dir=tmp_path
+    )
+    limits = connections.get_record(connection.id).scheduler_limits()
+
+    async with scheduler.slot(connection.id, limits):
+        job = await service.submit(
+            connection.id, JobSubmitRequest(sql_text="select id from wide", max_rows=2500)
+        )
+        await _wait_for(service, connection.id, job.id, "running")
+        await asyncio.sleep(0.05)
+        assert (await service.get(connection.id, job.id)).status == "running"
+
+    await _wait_for(service, connection.id, job.id, "succeeded")
+    finished = await service.get(connection.id, job.id)
+    assert (finished.row_count, finished.limit_applied) == (2500, 2500)
+    page = await service.results(connection.id, job.id, offset=2498, limit=10)
+    assert page.rows == [[2498], [2499]]
+    assert [path.name for path in tmp_path.iterdir()] == [f"{job.id}.arrow"]
@@ -1,10 +1,22 @@
-from backend.src.services.metadata_normalizer import normalize_metadata
+from backend.src.services.metadata_normalizer import (
+    apply_table_estimates,
+    changed_relations,
+    normalize_metadata,
+    patch_metadata,
+)
 
 
 def test_normalize_metadata_groups_tables() -> None:
     raw = {
         "schemas": [{"name": "public"}],
-        "tables": [{"schema": "public", "name": "users"}],
+        "tables": [
+            {
+                "schema": "public",
+                "name": "users",
+                "estimated_row_count": 1200.0,
+                "total_bytes": 65536,
+            }
+        ],
         "views": [],
         "columns": [
             {
@@ -20,3 +32,79 @@ def test_normalize_metadata_groups_tables() -> None:
     }
     normalized = normalize_metadata(raw)
     assert normalized["schemas"][0]["tables"][0]["columns"][0]["name"] == "id"
+    assert normalized["schemas"][0]["tables"][0]["estimatedRowCount"] == 1200
+    assert normalized["schemas"][0]["tables"][0]["totalBytes"] == 65536
+
+
+def test_patch_metadata_replaces_changed_relations() -> None:
+    previous = {
+        "schemas": [
+            {
+                "name": "public",
+                "tables": [
+                    {"name": "users", "columns": [{"name": "id"}]},
+                    {"name": "orders", "columns": [{"name": "id"}]},
+                    {"name": "legacy", "columns": []},
+                ],
+                "views": [],
+            }
+        ],
+        "relationships": [
+            {
+                "name": "fk_orders_users",
+                "sourceTable": "public.orders",
+                "targetTable": "public.users",
+            },
+            {"name": "fk_legacy", "sourceTable": "public.legacy", "targetTable": "public.users"},
+        ],
+    }
+    partial = {
+        "schemas": [
+            {
+                "name": "public",
+                "tables": [{"name": "users", "columns": [{"name": "email"}]}],
+                "views": [],
+            },
+            {"name": "sales", "tables": [], "views": []},
+        ],
+        "relationships": [
+            {
+                "name": "fk_orders_users",
+                "sourceTable": "public.orders",
+                "targetTable": "public.users",
+            }
+        ],
+    }
+    changed = changed_relations(
+        {"public.users": "a", "public.orders": "b", "public.legacy": "c"},
+        {"public.users": "a2", "public.orders": "b"},
+    )
+    assert changed == {"public.users", "public.legacy"}
+
+    patched = patch_metadata(previous, partial, changed)
+    tables = {table["name"]: table for table in patched["schemas"][0]["tables"]}
+    assert set(tables) == {"users", "orders"}
+    assert tables["users"]["columns"] == [{"name": "email"}]
+    assert [schema["name"] for schema in patched["schemas"]] == ["public", "sales"]
+    assert [rel["name"] for rel in patched["relationships"]] == ["fk_orders_users"]
+
+
+def test_apply_table_estimates_updates_only_known_tables() -> None:
+    snapshot = {
+        "schemas": [
+            {
+                "name": "public",
+                "tables": [
+                    {"name": "users", "estimatedRowCount": 10, "totalBytes": 8192},
+                    {"name": "orders", "estimatedRowCount": 5, "totalBytes": 8192},
+                ],
+                "views": [],
+            }
+        ]
+    }
+    apply_table_estimates(snapshot, {"public.users": (1200, 65536), "sales.users": (1, 1)})
+
+    tables = {table["name"]: table for table in snapshot["schemas"][0]["tables"]}
+    assert tables["users"]["estimatedRowCount"] == 1200
+    assert tables["users"]["totalBytes"] == 65536
+    assert tables["orders"]["estimatedRowCount"] == 5
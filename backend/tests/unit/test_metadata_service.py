@@ -0,0 +1,186 @@
+from collections.abc import Collection
+
+from backend.src.adapters.base import AdapterCapabilities, DatabaseAdapter
+from backend.src.adapters.schema_filter import SchemaFilter
+from backend.src.models.connections import ConnectionCreate, ConnectionUpdate
+from backend.src.services import metadata_service
+from backend.src.services.adapter_registry import AdapterRegistry
+from backend.src.services.connection_service import ConnectionService
+from backend.src.services.metadata_service import MetadataService
+
+
+class FakeAdapter(DatabaseAdapter):
+    def __init__(self) -> None:
+        self.tables = {"public.users": "v1", "public.orders": "v1", "audit.events": "v1"}
+        self.estimates: dict[str, tuple[int | None, int | None]] = {
+            "public.users": (10, 8192),
+            "public.orders": (20, 16384),
+            "audit.events": (30, 24576),
+        }
+        self.fetches: list[set[str] | None] = []
+        self.estimate_reads = 0
+
+    @property
+    def dialect(self) -> str:
+        return "postgres"
+
+    @property
+    def capabilities(self) -> AdapterCapabilities:
+        return AdapterCapabilities(False, True, False, False)
+
+    async def test_connection(self, connection_url: str) -> None:
+        _ = connection_url
+
+    async def fetch_metadata(
+        self,
+        connection_url: str,
+        schema_filter: SchemaFilter | None = None,
+        relations: Collection[str] | None = None,
+    ) -> dict[str, object]:
+        self.fetches.append(set(relations) if relations is not None else None)
+        visible = self._visible(schema_filter)
+        keys = [key for key in visible if relations is None or key in relations]
+        return {
+            "schemas": [{"name": name} for name in sorted({key.split(".")[0] for key in keys})],
+            "tables": [
+                {
+                    "schema": key.split(".")[0],
+                    "name": key.split(".")[1],
+                    "comment": self.tables[key],
+                    "estimated_row_count": self.estimates[key][0],
+                    "total_bytes": self.estimates[key][1],
+                }
+                for key in keys
+            ],
+            "views": [],
+            "columns": [],
+            "relationships": [],
+        }
+
+    async def fetch_table_fingerprints(
+        self, connection_url: str, schema_filter: SchemaFilter | None = None
+    ) -> dict[str, str] | None:
+        return {key: self.tables[key] for key in self._visible(schema_filter)}
+
+    async def fetch_table_estimates(
+        self, connection_url: str, schema_filter: SchemaFilter | None = None
+    ) -> dict[str, tuple[int | None, int | None]] | None:
+        self.estimate_reads += 1
+        return {key: self.estimates[key] for key in self._visible(schema_filter)}
+
+    async def execute_query(
+        self,
+        connection_url: str,
+        sql: str,
+        timeout_seconds: int,
+        max_rows: int,
+        params: tuple[object, ...] = (),
+    ) -> dict[str, object]:
+        return {"columns": [], "rows": []}
+
+    async def cancel_query(self, query_id: str) -> bool:
+        return False
+
+    def _visible(self, schema_filter: SchemaFilter | None) -> list[str]:
+        schema_filter = schema_filter or SchemaFilter()
+        return [key for key in self.tables if schema_filter.matches(key.split(".")[0])]
+
+
+async def _service() -> tuple[MetadataService, ConnectionService, FakeAdapter, str]:
+    adapter = FakeAdapter()
+    registry = AdapterRegistry()
+    registry.set_adapter("postgres", adapter)
+    connections = ConnectionService(registry)
+    connection = await connections.create_connection(
+        ConnectionCreate(name="Metadata", db_type="postgres", connection_url="postgresql://db")
+    )
+    return MetadataService(registry, connections), connections, adapter, connection.id
+
+
+def _table(snapshot, key: str):
+    schema_name, table_name = key.split(".")
+    for schema in snapshot.schemas:
+        if schema.name == schema_name:
+            for table in schema.tables:
+                if table.name == table_name:
+                    return table
+    return None
+
+
+async def test_unchanged_estimates_leave_the_snapshot_untouched(monkeypatch) -> None:
+    service, _, adapter, connection_id = await _service()
+    await service.refresh_snapshot(connection_id)
+    patches = []
+    apply = metadata_service.apply_table_estimates
+    monkeypatch.setattr(
+        metadata_service,
+        "apply_table_estimates",
+        lambda snapshot, estimates: patches.append(estimates) or apply(snapshot, estimates),
+    )
+
+    await service.refresh_snapshot(connection_id)
+    assert adapter.estimate_reads == 1
+    assert patches == []
+
+    adapter.estimates["public.users"] = (11, 8192)
+    snapshot = await service.refresh_snapshot(connection_id)
+    assert len(patches) == 1
+    assert _table(snapshot, "public.users").estimated_row_count == 11
+
+    await service.refresh_snapshot(connection_id)
+    assert len(patches) == 1
+    assert adapter.fetches == [None]
+
+
+async def test_refresh_refetches_only_changed_relations_and_patches_in_place() -> None:
+    service, _, adapter, connection_id = await _service()
+    first = await service.refresh_snapshot(connection_id)
+    assert adapter.fetches == [None]
+
+    adapter.tables["public.orders"] = "v2"
+    adapter.tables["public.invoices"] = "v1"
+    adapter.estimates["public.invoices"] = (5, 4096)
+    del adapter.tables["audit.events"]
+    patched = await service.refresh_snapshot(connection_id)
+
+    assert adapter.fetches[1] == {"public.orders", "public.invoices", "audit.events"}
+    assert patched.snapshot_id == first.snapshot_id
+    assert _table(patched, "public.orders").comment == "v2"
+    assert _table(patched, "public.invoices") is not None
+    assert _table(patched, "public.users").comment == "v1"
+    assert _table(patched, "audit.events") is None
+
+
+async def test_refresh_without_changes_only_touches_the_snapshot() -> None:
+    service, _, adapter, connection_id = await _service()
+    first = await service.refresh_snapshot(connection_id)
+
+    second = await service.refresh_snapshot(connection_id)
+
+    assert adapter.fetches == [None]
+    assert second.snapshot_id == first.snapshot_id
+    assert second.refreshed_at >= first.refreshed_at
+    assert [schema.name for schema in second.schemas] == [
+        schema.name for schema in first.schemas
+    ]
+
+
+async def test_changed_schema_filter_forces_a_full_fetch() -> None:
+    service, connections, adapter, connection_id = await _service()
+    first = await service.refresh_snapshot(connection_id)
+
+    await connections.update_connection(connection_id, ConnectionUpdate(exclude_schemas=["audit"]))
+    filtered = await service.refresh_snapshot(connection_id)
+
+    assert adapter.fetches == [None, None]
+    assert filtered.snapshot_id != first.snapshot_id
+    assert [schema.name for schema in filtered.schemas] == ["public"]
+
+
+async def test_full_refresh_ignores_the_fingerprints() -> None:
+    service, _, adapter, connection_id = await _service()
+    await service.refresh_snapshot(connection_id)
+
+    await service.refresh_snapshot(connection_id, full=True)
+
+    assert adapter.fetches == [None, None]
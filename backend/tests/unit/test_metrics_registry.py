@@ -0,0 +1,42 @@
+from backend.src.utils.metrics import MetricFamily, MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.1, "/a")
+    histogram.observe(3.0, "/a")
+
+    lines = registry.render().splitlines()
+    assert lines[:2] == ["# HELP latency_seconds Latency.", "# TYPE latency_seconds histogram"]
+    assert lines[2:] == [
+        'latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a",le="1"} 2',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 3',
+        'latency_seconds_sum{route="/a"} 3.15',
+        'latency_seconds_count{route="/a"} 3',
+    ]
+    assert histogram.count("/a") == 3
+
+
+def test_counters_and_collectors() -> None:
+    registry = MetricsRegistry()
+    counter = registry.counter("rows_total", "Rows.", ("connection_id",))
+    assert registry.counter("rows_total", "Rows.", ("connection_id",)) is counter
+    counter.inc("c1", amount=5)
+    counter.inc('quote"d')
+
+    def collect() -> list[MetricFamily]:
+        family = MetricFamily("pool_waiting", "Waiting.", "gauge")
+        family.add(2, connection_id="c1")
+        return [family]
+
+    registry.register_collector(collect)
+    text = registry.render()
+    assert 'rows_total{connection_id="c1"} 5\n' in text
+    assert 'rows_total{connection_id="quote\\"d"} 1\n' in text
+    assert '# TYPE pool_waiting gauge\npool_waiting{connection_id="c1"} 2\n' in text
+
+    registry.reset()
+    assert counter.value("c1") == 0
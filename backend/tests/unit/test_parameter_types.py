@@ -0,0 +1,39 @@
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from asyncpg.types import Type
+
+from backend.src.adapters.parameter_types import coerce_postgres_params
+from backend.src.utils.app_errors import AppError
+
+
+def _types(*names: str) -> list[Type]:
+    return [Type(oid=0, name=name, kind="scalar", schema="pg_catalog") for name in names]
+
+
+def test_coerce_postgres_params_converts_json_values() -> None:
+    values = coerce_postgres_params(
+        _types("date", "timestamptz", "time", "interval", "numeric", "int4", "text", "jsonb"),
+        ["2024-01-01", "2024-01-01T08:30:00Z", "08:30", 90, 1.25, 3.0, 7, {"a": 1}],
+    )
+    assert values == [
+        date(2024, 1, 1),
+        datetime(2024, 1, 1, 8, 30, tzinfo=timezone.utc),
+        time(8, 30),
+        timedelta(seconds=90),
+        Decimal("1.25"),
+        3,
+        "7",
+        '{"a": 1}',
+    ]
+
+
+def test_coerce_postgres_params_keeps_nulls_and_unknown_types() -> None:
+    assert coerce_postgres_params(_types("date", "tsvector"), [None, "a & b"]) == [None, "a & b"]
+
+
+def test_coerce_postgres_params_names_the_bad_parameter() -> None:
+    with pytest.raises(AppError, match=r"\$2 expects int8") as excinfo:
+        coerce_postgres_params(_types("date", "int8"), ["2024-01-01", 2.5])
+    assert (excinfo.value.code, excinfo.value.status_code) == ("INVALID_PARAMETERS", 400)
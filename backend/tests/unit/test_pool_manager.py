@@ -0,0 +1,69 @@
+import asyncio
+from pathlib import Path
+
+from backend.src.adapters.pool_manager import EnginePoolManager, PoolOptions
+
+
+def _url(tmp_path: Path, name: str) -> str:
+    return f"sqlite+aiosqlite:///{(tmp_path / name).as_posix()}"
+
+
+async def test_pool_manager_evicts_least_recently_used_engine(tmp_path: Path) -> None:
+    manager = EnginePoolManager(max_engines=2, idle_seconds=600)
+    first = manager.get_engine("a", _url(tmp_path, "a.db"))
+    manager.get_engine("b", _url(tmp_path, "b.db"))
+    assert manager.get_engine("a", _url(tmp_path, "a.db")) is first
+
+    manager.get_engine("c", _url(tmp_path, "c.db"))
+    assert manager.engine_count() == 2
+    assert manager.stats("b") is None
+    assert manager.stats("a") is not None
+    await manager.dispose_all()
+
+
+async def test_pool_manager_reports_stats_and_reconfigures(tmp_path: Path) -> None:
+    manager = EnginePoolManager(max_engines=5, idle_seconds=600)
+    options = PoolOptions(
+        pool_size=2, max_overflow=1, pool_recycle_seconds=60, pool_timeout_seconds=5
+    )
+    assert not manager.configure("a", options)
+
+    engine = manager.get_engine("a", _url(tmp_path, "a.db"))
+    async with engine.connect():
+        stats = manager.stats("a")
+        assert stats is not None
+        assert stats.pool_size == 2
+        assert stats.checked_out == 1
+
+    changed = PoolOptions(
+        pool_size=3, max_overflow=1, pool_recycle_seconds=60, pool_timeout_seconds=5
+    )
+    assert manager.configure("a", changed)
+    await manager.dispose("a")
+    assert manager.stats("a") is None
+    await manager.dispose_all()
+
+
+async def test_pool_manager_counts_callers_waiting_for_checkout(tmp_path: Path) -> None:
+    manager = EnginePoolManager(max_engines=5, idle_seconds=600)
+    options = PoolOptions(
+        pool_size=1, max_overflow=0, pool_recycle_seconds=60, pool_timeout_seconds=5
+    )
+    manager.configure("a", options)
+    engine = manager.get_engine("a", _url(tmp_path, "a.db"))
+
+    async def checkout() -> None:
+        async with manager.connect("a", engine):
+            pass
+
+    async with manager.connect("a", engine):
+        waiter = asyncio.create_task(checkout())
+        await asyncio.sleep(0.05)
+        stats = manager.stats("a")
+        assert stats is not None
+        assert (stats.checked_out, stats.waiting) == (1, 1)
+    await waiter
+    stats = manager.stats("a")
+    assert stats is not None
+    assert (stats.checked_out, stats.waiting) == (0, 0)
+    await manager.dispose_all()
@@ -26,3 +26,20 @@ def test_prompt_builder_includes_tables() -> None:
     )
     assert "public.users" in prompt
     assert "Dialect: postgres" in prompt
+
+
+def test_prompt_builder_hints_large_tables() -> None:
+    schemas = [
+        MetadataSchema(
+            name="public",
+            tables=[
+                MetadataTable(name="events", columns=[], estimated_row_count=12_500_000),
+                MetadataTable(name="tiny", columns=[], estimated_row_count=42),
+                MetadataTable(name="fresh", columns=[]),
+            ],
+        )
+    ]
+    prompt = build_prompt("count events", schemas, [], [], "postgres")
+    assert "public.events [~12.5M rows]" in prompt
+    assert "public.tiny [~42 rows]" in prompt
+    assert "public.fresh ()" in prompt
@@ -0,0 +1,129 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from backend.src.adapters.base import AdapterCapabilities, DatabaseAdapter
+from backend.src.models.connections import ConnectionCreate
+from backend.src.models.query import QueryRequest
+from backend.src.services.adapter_registry import AdapterRegistry
+from backend.src.services.connection_service import ConnectionService
+from backend.src.services.query_log import QueryLog, QueryLogEntry
+from backend.src.services.query_service import QueryService
+from backend.src.services.result_cache import ResultCache
+
+
+class FakeAdapter(DatabaseAdapter):
+    @property
+    def dialect(self) -> str:
+        return "postgres"
+
+    @property
+    def capabilities(self) -> AdapterCapabilities:
+        return AdapterCapabilities(False, False, False, False)
+
+    async def test_connection(self, connection_url: str) -> None:
+        _ = connection_url
+
+    async def fetch_metadata(self, connection_url: str) -> dict[str, object]:
+        return {"schemas": [], "relationships": []}
+
+    async def execute_query(
+        self,
+        connection_url: str,
+        sql: str,
+        timeout_seconds: int,
+        max_rows: int,
+        params: tuple[object, ...] = (),
+    ) -> dict[str, object]:
+        if "missing" in sql:
+            raise RuntimeError("relation does not exist")
+        return {"columns": [{"name": "id", "type": "int4"}], "rows": [[1], [2]]}
+
+    async def cancel_query(self, query_id: str) -> bool:
+        return False
+
+
+def _entry(connection_id: str, fingerprint: str, duration_ms: int, hours_ago: int = 0):
+    return QueryLogEntry(
+        connection_id=connection_id,
+        sql_text=f"SELECT {fingerprint}",
+        fingerprint=fingerprint,
+        started_at=datetime.now(timezone.utc) - timedelta(hours=hours_ago),
+        duration_ms=duration_ms,
+        row_count=1,
+        status="succeeded",
+    )
+
+
+async def test_latency_percentiles_per_fingerprint_and_hour() -> None:
+    log = QueryLog(slow_ms=500, flush_ms=10_000, batch_size=1000)
+    connection_id = str(uuid4())
+    for duration in range(10, 110, 10):
+        log.record(_entry(connection_id, "fast", duration))
+    log.record(_entry(connection_id, "slow", 900, hours_ago=2))
+    log.record(_entry(connection_id, "old", 50, hours_ago=30))
+    await log.close()
+
+    stats = await log.latency_stats(connection_id, hours=24, top=10)
+    assert stats.overall.count == 11
+    assert (stats.overall.p50_ms, stats.overall.p95_ms, stats.overall.max_ms) == (60, 900, 900)
+    assert stats.overall.slow_count == 1
+    assert [item.fingerprint for item in stats.fingerprints] == ["slow", "fast"]
+    fast = stats.fingerprints[1]
+    assert (fast.count, fast.p50_ms, fast.p99_ms, fast.total_ms) == (10, 50, 100, 550)
+    assert [hour.count for hour in stats.hours] == [1, 10]
+
+    slow = await log.slow_queries(connection_id, limit=10)
+    assert [item.duration_ms for item in slow.items] == [900]
+
+
+async def test_query_service_logs_each_execution() -> None:
+    log = QueryLog(slow_ms=10_000, flush_ms=10_000, batch_size=1000)
+    registry = AdapterRegistry()
+    registry.set_adapter("postgres", FakeAdapter())
+    connections = ConnectionService(registry)
+    connection = await connections.create_connection(
+        ConnectionCreate(name="Log", db_type="postgres", connection_url=f"postgresql://{uuid4()}")
+    )
+    service = QueryService(registry, connections, result_cache=ResultCache(), query_log=log)
+
+    await service.execute_query(connection.id, QueryRequest(sql_text="select id from t"))
+    await service.execute_query(connection.id, QueryRequest(sql_text="SELECT id  FROM t"))
+    try:
+        await service.execute_query(connection.id, QueryRequest(sql_text="select * from missing"))
+    except RuntimeError:
+        pass
+    await log.close()
+
+    stats = await log.latency_stats(connection.id, hours=1, top=10)
+    assert (stats.overall.count, stats.overall.error_count) == (3, 1)
+    assert sorted(item.count for item in stats.fingerprints) == [1, 2]
+
+
+async def test_query_service_logs_streamed_executions() -> None:
+    log = QueryLog(slow_ms=10_000, flush_ms=10_000, batch_size=1000)
+    registry = AdapterRegistry()
+    registry.set_adapter("postgres", FakeAdapter())
+    connections = ConnectionService(registry)
+    connection = await connections.create_connection(
+        ConnectionCreate(name="Log", db_type="postgres", connection_url=f"postgresql://{uuid4()}")
+    )
+    service = QueryService(registry, connections, result_cache=ResultCache(), query_log=log)
+
+    finished = await service.stream_query(connection.id, QueryRequest(sql_text="select id from t"))
+    assert [batch["rows"] async for batch in finished.batches] == [[[1], [2]]]
+    await finished.close()
+    failed = await service.stream_query(
+        connection.id, QueryRequest(sql_text="select * from missing")
+    )
+    try:
+        async for _ in failed.batches:
+            pass
+    except RuntimeError:
+        pass
+    await failed.close()
+    unread = await service.stream_query(connection.id, QueryRequest(sql_text="select id from u"))
+    await unread.close()
+    await log.close()
+
+    stats = await log.latency_stats(connection.id, hours=1, top=10)
+    assert (stats.overall.count, stats.overall.error_count) == (2, 1)
@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from backend.src.adapters.base import QueryCancelledError, QueryTimeoutError
+from backend.src.adapters.query_registry import QueryRegistry, run_cancellable
+
+
+async def test_run_cancellable_cancels_on_server_when_deadline_passes() -> None:
+    cancelled = asyncio.Event()
+
+    async def statement() -> int:
+        await cancelled.wait()
+        raise RuntimeError("canceling statement due to user request")
+
+    async def cancel() -> bool:
+        cancelled.set()
+        return True
+
+    with pytest.raises(QueryTimeoutError):
+        await run_cancellable(statement(), 0.01, cancel)
+    assert cancelled.is_set()
+
+
+async def test_run_cancellable_reports_requested_cancellation() -> None:
+    registry = QueryRegistry()
+    with registry.track("q1", "c1"):
+        with registry.attach("postgresql://db", 42) as query:
+            assert registry.get("q1") is query
+            assert query is not None and query.backend_id == 42
+
+            async def statement() -> int:
+                query.cancel_requested = True
+                raise RuntimeError("canceling statement due to user request")
+
+            async def cancel() -> bool:
+                return True
+
+            with pytest.raises(QueryCancelledError):
+                await run_cancellable(statement(), 5, cancel, query)
+        assert query.backend_id is None
+    assert registry.get("q1") is None
@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from backend.src.services.query_scheduler import QueryScheduler, SchedulerLimits
+from backend.src.utils.app_errors import AppError
+
+
+async def test_scheduler_queues_then_rejects_when_full() -> None:
+    scheduler = QueryScheduler()
+    limits = SchedulerLimits(max_concurrent=1, max_queued=1, queue_timeout_seconds=5)
+    release = asyncio.Event()
+
+    async def hold() -> None:
+        async with scheduler.slot("c1", limits):
+            await release.wait()
+
+    running = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    queued = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    assert scheduler.stats("c1", limits).queued == 1
+
+    with pytest.raises(AppError) as exc_info:
+        await scheduler.acquire("c1", limits)
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.details is not None
+    assert exc_info.value.details["retryAfterSeconds"] >= 1
+
+    release.set()
+    await asyncio.gather(running, queued)
+    stats = scheduler.stats("c1", limits)
+    assert stats.active == 0
+    assert stats.admitted == 2
+    assert stats.rejected == 1
+
+
+async def test_scheduler_times_out_waiting_queries() -> None:
+    scheduler = QueryScheduler()
+    limits = SchedulerLimits(max_concurrent=1, max_queued=5, queue_timeout_seconds=0.01)
+    await scheduler.acquire("c1", limits)
+    with pytest.raises(AppError) as exc_info:
+        await scheduler.acquire("c1", limits)
+    assert exc_info.value.code == "QUERY_QUEUE_TIMEOUT"
+    scheduler.release("c1", 0.1)
+    assert scheduler.stats("c1", limits).active == 0
@@ -0,0 +1,96 @@
+from uuid import uuid4
+
+import pytest
+
+from backend.src.adapters.base import AdapterCapabilities, DatabaseAdapter
+from backend.src.models.connections import ConnectionCreate
+from backend.src.models.query import QueryRequest
+from backend.src.services.adapter_registry import AdapterRegistry
+from backend.src.services.connection_service import ConnectionService
+from backend.src.services.query_log import QueryLog
+from backend.src.services.query_service import QueryService
+from backend.src.services.query_stats import QueryStats
+from backend.src.services.result_cache import ResultCache
+
+
+class FakeAdapter(DatabaseAdapter):
+    @property
+    def dialect(self) -> str:
+        return "mysql"
+
+    @property
+    def capabilities(self) -> AdapterCapabilities:
+        return AdapterCapabilities(False, False, False, False)
+
+    async def test_connection(self, connection_url: str) -> None:
+        _ = connection_url
+
+    async def fetch_metadata(self, connection_url: str) -> dict[str, object]:
+        return {"schemas": [], "relationships": []}
+
+    async def execute_query(
+        self,
+        connection_url: str,
+        sql: str,
+        timeout_seconds: int,
+        max_rows: int,
+        params: tuple[object, ...] = (),
+    ) -> dict[str, object]:
+        if "missing" in sql:
+            raise RuntimeError("table does not exist")
+        return {"columns": [{"name": "id", "type": "int"}], "rows": [[1], [2]]}
+
+    async def cancel_query(self, query_id: str) -> bool:
+        return False
+
+
+async def test_statistics_accumulate_per_fingerprint_across_flushes() -> None:
+    stats = QueryStats(flush_seconds=3600, max_entries=100)
+    registry = AdapterRegistry()
+    registry.set_adapter("mariadb", FakeAdapter())
+    connections = ConnectionService(registry)
+    connection = await connections.create_connection(
+        ConnectionCreate(name="Stats", db_type="mariadb", connection_url=f"mysql://{uuid4()}")
+    )
+    service = QueryService(
+        registry,
+        connections,
+        result_cache=ResultCache(),
+        query_log=QueryLog(flush_ms=3_600_000),
+        query_stats=stats,
+    )
+
+    for region in ("eu", "us", "apac"):
+        await service.execute_query(
+            connection.id, QueryRequest(sql_text=f"select id from t where region = '{region}'")
+        )
+    await stats.flush()
+    await service.execute_query(
+        connection.id,
+        QueryRequest(sql_text="SELECT id FROM t WHERE region = :r", params={"r": "eu"}),
+    )
+    await service.execute_query(connection.id, QueryRequest(sql_text="select id from t"))
+    try:
+        await service.execute_query(connection.id, QueryRequest(sql_text="select * from missing"))
+    except RuntimeError:
+        pass
+
+    top = await stats.top(connection.id, limit=10)
+    by_sql = {item.normalized_sql: item for item in top.items}
+    assert set(by_sql) == {
+        "SELECT id FROM t WHERE region = ? LIMIT ?",
+        "SELECT id FROM t LIMIT ?",
+        "SELECT * FROM missing LIMIT ?",
+    }
+    shape = by_sql["SELECT id FROM t WHERE region = ? LIMIT ?"]
+    assert (shape.calls, shape.row_count, shape.error_count) == (4, 8, 0)
+    # Both figures are rounded to microseconds, the mean from the unrounded total.
+    assert shape.mean_ms == pytest.approx(shape.total_ms / 4, abs=0.001)
+    assert by_sql["SELECT * FROM missing LIMIT ?"].error_count == 1
+    assert [item.total_ms for item in top.items] == sorted(
+        (item.total_ms for item in top.items), reverse=True
+    )
+
+    await stats.reset(connection.id)
+    assert (await stats.top(connection.id, limit=10)).items == []
+    await stats.close()
@@ -0,0 +1,105 @@
+from typing import Collection
+
+from backend.src.adapters.base import AdapterCapabilities, DatabaseAdapter
+from backend.src.services.result_cache import (
+    ResultCache,
+    ResultCacheKey,
+    ResultCachePolicy,
+    estimate_result_bytes,
+)
+
+POLICY = ResultCachePolicy(ttl_seconds=60, invalidate=True)
+
+
+class CountingAdapter(DatabaseAdapter):
+    def __init__(self) -> None:
+        self.counters = {"public.orders": "1"}
+
+    @property
+    def dialect(self) -> str:
+        return "postgres"
+
+    @property
+    def capabilities(self) -> AdapterCapabilities:
+        return AdapterCapabilities(False, False, False, False)
+
+    async def test_connection(self, connection_url: str) -> None:
+        _ = connection_url
+
+    async def fetch_metadata(self, connection_url: str) -> dict[str, object]:
+        return {"schemas": [], "relationships": []}
+
+    async def fetch_table_change_counters(
+        self, connection_url: str, tables: Collection[str]
+    ) -> dict[str, str]:
+        return {table: self.counters[table] for table in tables if table in self.counters}
+
+    async def execute_query(
+        self,
+        connection_url: str,
+        sql: str,
+        timeout_seconds: int,
+        max_rows: int,
+        params: tuple[object, ...] = (),
+    ) -> dict[str, object]:
+        return {"columns": [], "rows": []}
+
+    async def cancel_query(self, query_id: str) -> bool:
+        return False
+
+
+def _key(sql: str) -> ResultCacheKey:
+    return ResultCacheKey("c1", "postgresql://db", sql, 1000)
+
+
+def _result(rows: int) -> dict[str, object]:
+    rows_data = [[index, "x" * 50] for index in range(rows)]
+    return {"columns": [{"name": "id", "type": "int"}], "rows": rows_data}
+
+
+async def test_table_change_invalidates_entry() -> None:
+    adapter = CountingAdapter()
+    cache = ResultCache(max_bytes=1 << 20)
+    tables = frozenset({"public.orders"})
+    counters = await cache.change_counters(adapter, "postgresql://db", tables, POLICY)
+    cache.store(_key("SELECT 1"), POLICY, _result(3), 1000, [], tables, counters)
+
+    hit = await cache.lookup(adapter, _key("SELECT 1"), POLICY)
+    assert hit is not None and len(hit.rows) == 3
+
+    adapter.counters["public.orders"] = "2"
+    assert await cache.lookup(adapter, _key("SELECT 1"), POLICY) is None
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+async def test_lru_eviction_is_bounded_by_bytes() -> None:
+    adapter = CountingAdapter()
+    entry_bytes = estimate_result_bytes(_result(20)["rows"])  # type: ignore[arg-type]
+    cache = ResultCache(max_bytes=entry_bytes * 4 + entry_bytes // 2)
+    for index in range(4):
+        cache.store(_key(f"SELECT {index}"), POLICY, _result(20), 1000, [], frozenset(), None)
+    await cache.lookup(adapter, _key("SELECT 0"), POLICY)
+    cache.store(_key("SELECT 4"), POLICY, _result(20), 1000, [], frozenset(), None)
+
+    assert cache.evictions == 1
+    assert await cache.lookup(adapter, _key("SELECT 1"), POLICY) is None
+    assert await cache.lookup(adapter, _key("SELECT 0"), POLICY) is not None
+    assert cache.size_bytes <= entry_bytes * 4 + entry_bytes // 2
+
+    # Results over a quarter of the budget are never cached.
+    cache.store(_key("SELECT big"), POLICY, _result(200), 1000, [], frozenset(), None)
+    assert await cache.lookup(adapter, _key("SELECT big"), POLICY) is None
+
+
+async def test_expired_or_disabled_entries_miss() -> None:
+    adapter = CountingAdapter()
+    cache = ResultCache(max_bytes=1 << 20)
+    expiring = ResultCachePolicy(ttl_seconds=60, invalidate=False)
+    cache.store(_key("SELECT 1"), expiring, _result(1), 1000, [], frozenset(), None)
+    cache._entries[_key("SELECT 1")].expires_at = 0  # noqa: SLF001
+    assert await cache.lookup(adapter, _key("SELECT 1"), expiring) is None
+
+    off = ResultCachePolicy(ttl_seconds=0, invalidate=True)
+    cache.store(_key("SELECT 2"), off, _result(1), 1000, [], frozenset(), None)
+    assert len(cache) == 0
@@ -0,0 +1,101 @@
+import json
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import UUID
+
+import msgpack
+import pyarrow as pa
+import pytest
+
+from backend.src.api.result_encoding import (
+    ARROW_STREAM,
+    COLUMNAR_JSON,
+    JSON,
+    MSGPACK,
+    columnar_payload,
+    encode_result,
+    negotiate_result_encoding,
+    query_json,
+)
+from backend.src.models.query import QueryColumn, QueryResponse
+from backend.src.utils.app_errors import AppError
+
+
+def _result(rows: list[list[object]]) -> QueryResponse:
+    return QueryResponse(
+        columns=[QueryColumn(name="id", type="int4"), QueryColumn(name="day", type="date")],
+        rows=rows,
+        duration_ms=3,
+        limit_applied=1000,
+        request_id="req-1",
+    )
+
+
+@pytest.mark.parametrize(
+    ("accept", "expected"),
+    [
+        (None, JSON),
+        ("*/*", JSON),
+        ("application/msgpack", MSGPACK),
+        ("application/json;q=0.5, application/vnd.apache.arrow.stream", ARROW_STREAM),
+        ("text/html, application/vnd.dbquery.columnar+json;q=0.9, */*;q=0.1", COLUMNAR_JSON),
+    ],
+)
+def test_negotiate_result_encoding(accept: str | None, expected: str) -> None:
+    assert negotiate_result_encoding(accept) == expected
+
+
+def test_negotiate_rejects_unsupported_types() -> None:
+    with pytest.raises(AppError) as excinfo:
+        negotiate_result_encoding("text/csv, application/json;q=0")
+    assert excinfo.value.status_code == 406
+
+
+def test_columnar_payload_transposes_rows() -> None:
+    payload = columnar_payload(_result([[1, date(2024, 1, 2)], [2, None]]))
+    assert payload["data"] == [[1, 2], [date(2024, 1, 2), None]]
+    assert payload["rowCount"] == 2
+    assert columnar_payload(_result([]))["data"] == [[], []]
+
+
+def test_msgpack_encodes_values_like_json() -> None:
+    result = _result([[1, date(2024, 1, 2)]])
+    result.rows[0].append(Decimal("1.50"))
+    body = msgpack.unpackb(encode_result(result, MSGPACK).body)
+    assert body["data"] == [[1], ["2024-01-02"], ["1.50"]]
+
+
+def test_arrow_stream_keeps_names_and_types() -> None:
+    response = encode_result(_result([[1, date(2024, 1, 2)], [2, None]]), ARROW_STREAM)
+    table = pa.ipc.open_stream(response.body).read_all()
+    assert table.column_names == ["id", "day"]
+    assert table.column("day").type == pa.date32()
+    assert table.schema.field("id").metadata[b"dbquery.type"] == b"int4"
+    assert table.schema.metadata[b"requestId"] == b"req-1"
+
+
+def test_query_json_matches_validated_model_output() -> None:
+    values = {
+        "numeric": Decimal("1.50"),
+        "timestamptz": datetime(2024, 1, 2, 3, 4, 5, 6, tzinfo=timezone.utc),
+        "timestamp": datetime(2024, 1, 2),
+        "interval": timedelta(hours=1, seconds=3),
+        "uuid": UUID(int=5),
+        "bytea": b"abc",
+        "jsonb": {"a": [1, 2]},
+        "float8": float("nan"),
+        "int8": 2**63,
+    }
+    rows = [list(values.values()), [None] * len(values)]
+    result = QueryResponse.model_construct(
+        columns=[QueryColumn(name=f"c{index}", type=name) for index, name in enumerate(values)],
+        rows=rows,
+        duration_ms=3,
+        limit_applied=1000,
+        request_id="req-1",
+        warnings=[],
+        cached=False,
+    )
+    expected = QueryResponse.model_validate(result).model_dump_json(by_alias=True)
+    assert json.loads(query_json(result)) == json.loads(expected)
+    assert rows[0][0] == Decimal("1.50")
@@ -0,0 +1,48 @@
+from backend.src.adapters.schema_filter import SchemaFilter, glob_to_like
+
+SYSTEM = ("pg_catalog", "information_schema", "pg_temp_*")
+
+
+def test_glob_to_like_escapes_wildcards() -> None:
+    assert glob_to_like("sales_*") == "sales\\_%"
+    assert glob_to_like("a?%") == "a_\\%"
+
+
+def test_system_schemas_hidden_unless_included_by_name() -> None:
+    default = SchemaFilter()
+    assert default.matches("public", SYSTEM)
+    assert not default.matches("pg_catalog", SYSTEM)
+    assert not default.matches("pg_temp_3", SYSTEM)
+    assert SchemaFilter(include=("pg_catalog",)).matches("pg_catalog", SYSTEM)
+
+
+def test_include_and_exclude_globs() -> None:
+    schema_filter = SchemaFilter(include=("sales*", "hr"), exclude=("*_archive",))
+    assert schema_filter.matches("sales_eu", SYSTEM)
+    assert schema_filter.matches("hr", SYSTEM)
+    assert not schema_filter.matches("sales_archive", SYSTEM)
+    assert not schema_filter.matches("public", SYSTEM)
+
+
+def test_sql_predicate_binds_patterns() -> None:
+    predicate, params = SchemaFilter(include=("sales*",), exclude=("tmp",)).sql_predicate(
+        "n.nspname", ("pg_catalog",)
+    )
+    assert predicate == (
+        "n.nspname NOT LIKE :schema_0 AND n.nspname NOT LIKE :schema_1"
+        " AND (n.nspname LIKE :schema_2)"
+    )
+    assert params == {"schema_0": "pg\\_catalog", "schema_1": "tmp", "schema_2": "sales%"}
+    assert SchemaFilter().sql_predicate("schema_name") == ("1 = 1", {})
+
+
+def test_patterns_match_case_sensitively_in_python_and_sql() -> None:
+    schema_filter = SchemaFilter(include=("Sales*",), exclude=("tmp",))
+    assert schema_filter.matches("Sales_eu")
+    assert not schema_filter.matches("sales_eu")
+    assert SchemaFilter(exclude=("tmp",)).matches("TMP")
+
+    predicate, _ = schema_filter.sql_predicate("table_schema", like="LIKE BINARY")
+    assert predicate == (
+        "table_schema NOT LIKE BINARY :schema_0 AND (table_schema LIKE BINARY :schema_1)"
+    )
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from backend.src.adapters.base import QueryCancelledError
+from backend.src.services.single_flight import SingleFlight
+
+
+async def test_concurrent_callers_share_one_execution() -> None:
+    flights: SingleFlight[int] = SingleFlight()
+    release = asyncio.Event()
+    started = []
+
+    async def execute(execution_id: str) -> int:
+        started.append(execution_id)
+        await release.wait()
+        return 42
+
+    waiters = [
+        asyncio.create_task(flights.run("key", f"r{index}", "c1", execute)) for index in range(5)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    assert await asyncio.gather(*waiters) == [42] * 5
+    assert len(started) == 1
+    assert (flights.executions, flights.coalesced) == (1, 4)
+    assert len(flights) == 0
+
+
+async def test_execution_is_cancelled_only_after_every_caller_leaves() -> None:
+    flights: SingleFlight[int] = SingleFlight()
+    release = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def execute(execution_id: str) -> int:
+        try:
+            await release.wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return 7
+
+    first = asyncio.create_task(flights.run("key", "r1", "c1", execute))
+    second = asyncio.create_task(flights.run("key", "r2", "c1", execute))
+    third = asyncio.create_task(flights.run("key", "r3", "c1", execute))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    await asyncio.sleep(0)
+    assert flights.detach("r2") == 1
+    with pytest.raises(QueryCancelledError):
+        await second
+    await asyncio.sleep(0)
+    assert not cancelled.is_set()
+
+    release.set()
+    assert await third == 7
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+async def test_last_caller_leaving_cancels_execution() -> None:
+    flights: SingleFlight[int] = SingleFlight()
+    cancelled = asyncio.Event()
+
+    async def execute(execution_id: str) -> int:
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return 0
+
+    waiter = asyncio.create_task(flights.run("key", "r1", "c1", execute))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.sleep(0.01)
+    assert cancelled.is_set()
+    assert flights.get("r1") is None and len(flights) == 0
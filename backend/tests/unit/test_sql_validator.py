@@ -1,4 +1,12 @@
-from backend.src.services.sql_validator import validate_select_only
+import pytest
+
+from backend.src.services.sql_validator import (
+    bind_limit,
+    bind_parameters,
+    parse_select_only,
+    validate_select_only,
+)
+from backend.src.utils.app_errors import AppError
 
 
 def test_validate_select_only_rejects_insert() -> None:
@@ -14,3 +22,78 @@ def test_validate_select_only_adds_limit() -> None:
     sql, limit = validate_select_only("select * from foo", 1000, None)
     assert "LIMIT" in sql.upper()
     assert limit == 1000
+
+
+def test_parse_select_only_lists_referenced_tables() -> None:
+    validated = parse_select_only(
+        'with recent as (select * from Sales.Orders) select * from recent join "Users" u on true',
+        1000,
+        "postgres",
+    )
+    assert validated.tables == frozenset({"sales.orders", "Users"})
+
+
+def test_named_parameters_render_as_numbered_placeholders_on_postgres() -> None:
+    validated = parse_select_only(
+        "select * from foo where a = :x or b = :y or c = :x", 1000, "postgres"
+    )
+    assert validated.sql == "SELECT * FROM foo WHERE a = $1 OR b = $2 OR c = $1 LIMIT 1000"
+    assert bind_parameters(validated, {"y": 2, "x": 1}) == (1, 2)
+
+
+def test_parameters_render_as_format_placeholders_on_mysql() -> None:
+    validated = parse_select_only(
+        "select * from foo where a = :x and b like 'a%' and c = :x", 10, "mysql"
+    )
+    assert validated.sql == "SELECT * FROM foo WHERE a = %s AND b LIKE 'a%%' AND c = %s LIMIT 10"
+    assert bind_parameters(validated, {"x": 1}) == (1, 1)
+
+
+def test_positional_parameters_bind_by_number() -> None:
+    validated = parse_select_only("select $2, $1 from foo", 1000, "postgres")
+    assert bind_parameters(validated, ["a", "b"]) == ("b", "a")
+    with pytest.raises(AppError) as excinfo:
+        bind_parameters(validated, {"a": 1})
+    assert excinfo.value.code == "INVALID_PARAMETERS"
+
+
+def test_parameters_must_match_the_statement() -> None:
+    validated = parse_select_only("select :a from foo", 1000, "postgres")
+    with pytest.raises(AppError) as excinfo:
+        bind_parameters(validated, {"a": 1, "b": 2})
+    assert excinfo.value.details == {"missing": [], "unused": [":b"]}
+    with pytest.raises(AppError):
+        bind_parameters(parse_select_only("select 1", 1000, "postgres"), {"a": 1})
+
+
+def test_bound_limit_is_read_from_its_value() -> None:
+    validated = parse_select_only("select * from t where a = :a limit :n", 1000, "postgres")
+    assert bind_limit(validated, bind_parameters(validated, {"a": 1, "n": 5})).limit_applied == 5
+    positional = parse_select_only("select * from t limit $1", 1000, "postgres")
+    assert bind_limit(positional, (2000,)).limit_applied == 2000
+    with pytest.raises(AppError) as excinfo:
+        bind_limit(validated, bind_parameters(validated, {"a": 1, "n": "5"}))
+    assert excinfo.value.code == "INVALID_PARAMETERS"
+
+
+def test_anonymous_placeholders_are_rejected() -> None:
+    with pytest.raises(AppError) as excinfo:
+        parse_select_only("select * from foo where a = ?", 1000, "mysql")
+    assert excinfo.value.code == "INVALID_SQL"
+
+
+def test_fingerprint_ignores_values_and_in_list_length() -> None:
+    shapes = [
+        parse_select_only(sql, 1000, "postgres")
+        for sql in (
+            "select id from Orders where region = 'eu' and id in (1, 2, 3)",
+            "SELECT id FROM orders WHERE region = 'us' AND id IN (-7)  LIMIT 50",
+            "select id from orders where region = :region and id in (:a, :b)",
+        )
+    ]
+    assert shapes[0].normalized_sql == (
+        "SELECT id FROM orders WHERE region = ? AND id IN (?) LIMIT ?"
+    )
+    assert len({validated.fingerprint for validated in shapes}) == 1
+    other = parse_select_only("select id from orders where region = 'eu'", 1000, "postgres")
+    assert other.fingerprint != shapes[0].fingerprint
@@ -0,0 +1,31 @@
+from sqlalchemy.exc import DBAPIError
+
+from backend.src.adapters import mariadb_adapter, postgres_adapter
+
+
+class _PgError(Exception):
+    def __init__(self, sqlstate: str) -> None:
+        super().__init__("canceling statement due to statement timeout")
+        self.sqlstate = sqlstate
+
+
+def _wrap(orig: Exception) -> DBAPIError:
+    return DBAPIError("SELECT 1", None, orig)
+
+
+def test_postgres_statement_timeout_is_detected() -> None:
+    assert postgres_adapter._is_statement_timeout(_wrap(_PgError("57014")))
+    assert not postgres_adapter._is_statement_timeout(_wrap(_PgError("42P01")))
+
+
+def test_mariadb_statement_timeout_is_detected() -> None:
+    assert mariadb_adapter._is_statement_timeout(_wrap(Exception(1969, "max_statement_time")))
+    assert mariadb_adapter._is_statement_timeout(_wrap(Exception(3024, "max_execution_time")))
+    assert not mariadb_adapter._is_statement_timeout(_wrap(Exception(1146, "no such table")))
+
+
+def test_statement_timeout_detects_raw_driver_errors() -> None:
+    # The native fetch path surfaces driver exceptions without the DBAPIError wrapper.
+    assert postgres_adapter._is_statement_timeout(_PgError("57014"))
+    assert mariadb_adapter._is_statement_timeout(Exception(1969, "max_statement_time"))
+    assert not mariadb_adapter._is_statement_timeout(Exception(1146, "no such table"))
@@ -0,0 +1,29 @@
+import asyncio
+
+from backend.src.utils.timing import collect_timings, server_timing, timed
+
+
+async def test_phases_accumulate_across_tasks() -> None:
+    async def work() -> None:
+        with timed("execute"):
+            await asyncio.sleep(0.01)
+
+    with collect_timings() as timings:
+        with timed("validate"):
+            pass
+        await asyncio.gather(work(), work())
+
+    assert list(timings) == ["validate", "execute"]
+    assert timings["execute"] >= 20
+
+
+def test_phases_outside_a_collector_are_dropped() -> None:
+    with timed("execute"):
+        pass
+    with collect_timings() as timings:
+        pass
+    assert timings == {}
+
+
+def test_server_timing_header() -> None:
+    assert server_timing({"pool": 1.234, "execute": 20.0}) == "pool;dur=1.2, execute;dur=20.0"